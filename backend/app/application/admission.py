@@ -0,0 +1,207 @@
+"""Admission control: bounded concurrency with a prioritized, bounded wait queue."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from app.domain.exceptions import ServiceOverloadedError
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Admission priority classes; lower values are served first."""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+_priority: ContextVar[Optional[Priority]] = ContextVar("admission_priority", default=None)
+
+
+def current_priority() -> Optional[Priority]:
+    """Priority set for the current task by ``priority_scope``, if any."""
+    return _priority.get()
+
+
+@contextmanager
+def priority_scope(priority: Priority) -> Iterator[None]:
+    """Run the enclosed work (and tasks it creates) at ``priority``."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class AdmissionController:
+    """
+    Limit concurrent work and queue the excess by priority.
+
+    Up to ``max_concurrency`` callers run at once. Further callers wait in a
+    queue ordered by priority, then arrival. The queue holds at most
+    ``max_queue`` callers: when it is full, a newcomer displaces the newest
+    waiter of a lower priority class, or is rejected if there is none.
+    Waiters still queued after ``max_wait`` seconds are rejected too, so
+    latency stays bounded under overload instead of growing until everything
+    times out. Rejections raise ``ServiceOverloadedError`` with a Retry-After
+    estimate.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        max_queue: int = 100,
+        max_wait: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the controller.
+
+        Args:
+            max_concurrency: Callers allowed to run at once
+            max_queue: Callers allowed to wait for a slot
+            max_wait: Longest a caller may wait for a slot, in seconds
+            clock: Monotonic clock, injectable for tests
+        """
+        self._max_concurrency = max_concurrency
+        self._max_queue = max_queue
+        self._max_wait = max_wait
+        self._clock = clock
+
+        self._running = 0
+        # (priority, sequence, future) min-heap; cancelled entries are skipped lazily
+        self._queue: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._queued = 0
+        self._sequence = itertools.count()
+
+        self._service_time = 1.0  # EWMA of admitted work duration, for Retry-After
+        self._recent_waits: deque[float] = deque(maxlen=1000)
+        self._admitted = 0
+        self._rejected = 0
+        self._displaced = 0
+        self._timed_out = 0
+
+    @asynccontextmanager
+    async def admit(self, priority: Priority = Priority.NORMAL) -> AsyncIterator[None]:
+        """
+        Hold a concurrency slot for the enclosed work.
+
+        Raises:
+            ServiceOverloadedError: If the caller is rejected instead of admitted
+        """
+        await self._acquire(priority)
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self._service_time += 0.2 * (self._clock() - started - self._service_time)
+            self._release()
+
+    def stats(self) -> dict[str, Any]:
+        """Occupancy, queue depth and wait time statistics."""
+        waits = sorted(self._recent_waits)
+        queued_by_priority = {priority.name.lower(): 0 for priority in Priority}
+        for priority, _, future in self._queue:
+            if not future.done():
+                queued_by_priority[Priority(priority).name.lower()] += 1
+        return {
+            "running": self._running,
+            "max_concurrency": self._max_concurrency,
+            "queue_depth": self._queued,
+            "max_queue": self._max_queue,
+            "queue_depth_by_priority": queued_by_priority,
+            "queue_wait_p50_ms": _percentile(waits, 0.50) * 1000,
+            "queue_wait_p95_ms": _percentile(waits, 0.95) * 1000,
+            "queue_wait_max_ms": (waits[-1] if waits else 0.0) * 1000,
+            "admitted_total": self._admitted,
+            "rejected_total": self._rejected,
+            "displaced_total": self._displaced,
+            "timed_out_total": self._timed_out,
+        }
+
+    async def _acquire(self, priority: Priority) -> None:
+        if self._running < self._max_concurrency and not self._queued:
+            self._running += 1
+            self._admitted += 1
+            self._recent_waits.append(0.0)
+            return
+
+        if self._queued >= self._max_queue and not self._displace_lower_than(priority):
+            self._rejected += 1
+            raise self._overloaded("Server is at capacity")
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._sequence), future))
+        self._queued += 1
+        enqueued = self._clock()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self._max_wait)
+        except asyncio.TimeoutError:
+            if not future.done():
+                future.cancel()
+                self._queued -= 1
+                self._timed_out += 1
+                raise self._overloaded(f"Timed out after {self._max_wait:.0f}s in queue")
+            # Granted a slot just as the wait timed out
+        except asyncio.CancelledError:
+            if not future.done():
+                future.cancel()
+                self._queued -= 1
+            elif not future.cancelled() and future.exception() is None:
+                # Granted a slot but cancelled before using it: pass it on
+                self._release()
+            raise
+
+        # Raises if this waiter was displaced by a higher-priority caller
+        future.result()
+        self._recent_waits.append(self._clock() - enqueued)
+        self._admitted += 1
+
+    def _release(self) -> None:
+        while self._queue:
+            _, _, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            # The slot moves to the waiter; running count is unchanged
+            self._queued -= 1
+            future.set_result(None)
+            return
+        self._running -= 1
+
+    def _displace_lower_than(self, priority: Priority) -> bool:
+        """Reject the newest waiter of the lowest class below ``priority``, if any."""
+        victim = None
+        for entry in self._queue:
+            if entry[2].done() or entry[0] <= priority:
+                continue
+            if victim is None or (entry[0], entry[1]) > (victim[0], victim[1]):
+                victim = entry
+        if victim is None:
+            return False
+
+        victim[2].set_exception(self._overloaded("Displaced by higher-priority work"))
+        self._queued -= 1
+        self._displaced += 1
+        return True
+
+    def _overloaded(self, reason: str) -> ServiceOverloadedError:
+        # Time for the work ahead to drain through the available slots
+        retry_after = self._service_time * (self._queued + 1) / self._max_concurrency
+        logger.warning("Admission rejected: %s (retry after %.1fs)", reason, retry_after)
+        return ServiceOverloadedError(reason, retry_after=retry_after)
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
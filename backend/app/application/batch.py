@@ -0,0 +1,114 @@
+"""Concurrent execution of command batches through the dispatcher."""
+
+import asyncio
+import logging
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, ContextManager, Optional, Sequence
+
+from app.application.admission import Priority, priority_scope
+from app.application.deadline import deadline_scope
+from app.application.dispatch import CommandDispatcher
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BatchItemOutcome:
+    """Result or error of one command in a batch."""
+
+    index: int
+    result: Optional[Any] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchExecutor:
+    """
+    Dispatch a batch of commands concurrently with a concurrency cap.
+
+    Every command goes through the dispatcher, and so through its middleware
+    (result cache and admission control included), at ``priority`` so that
+    bulk work yields to interactive requests. A failing command does not
+    affect the others: its exception is captured in its outcome. With an
+    ``item_timeout``, each command gets its own deadline from the moment it
+    starts, as if it had been sent on its own.
+    """
+
+    def __init__(
+        self,
+        dispatcher: CommandDispatcher,
+        max_concurrency: int = 8,
+        priority: Priority = Priority.BACKGROUND,
+        prefetch: Optional[Callable[[Sequence[Any]], Awaitable[None]]] = None,
+        item_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the executor.
+
+        Args:
+            dispatcher: Dispatcher the commands are sent through
+            max_concurrency: Most commands of one batch in flight at a time
+            priority: Admission priority of batch items
+            prefetch: Called with all commands before any is dispatched, e.g. to
+                fetch their cached results in one round trip
+            item_timeout: Deadline of each command in seconds; None for no deadline
+                beyond the caller's
+        """
+        self._dispatcher = dispatcher
+        self._max_concurrency = max_concurrency
+        self._priority = priority
+        self._prefetch = prefetch
+        self._item_timeout = item_timeout
+
+    async def run(self, commands: Sequence[Any]) -> list[BatchItemOutcome]:
+        """Execute all commands and return their outcomes in input order."""
+        outcomes = [outcome async for outcome in self.as_completed(commands)]
+        return sorted(outcomes, key=lambda outcome: outcome.index)
+
+    async def as_completed(self, commands: Sequence[Any]) -> AsyncIterator[BatchItemOutcome]:
+        """
+        Execute all commands, yielding outcomes as soon as each one finishes.
+
+        Commands still running are cancelled if the consumer stops iterating
+        early (e.g. the client disconnected).
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def execute(index: int, command: Any) -> BatchItemOutcome:
+            async with semaphore:
+                item_deadline: ContextManager[None] = (
+                    deadline_scope(self._item_timeout)
+                    if self._item_timeout is not None
+                    else nullcontext()
+                )
+                try:
+                    with item_deadline:
+                        result: Any = await self._dispatcher.dispatch(command)
+                    return BatchItemOutcome(index, result=result)
+                except Exception as e:
+                    logger.warning(
+                        "Batch item %s (%s) failed: %s", index, type(command).__name__, e
+                    )
+                    return BatchItemOutcome(index, error=e)
+
+        logger.info(
+            "Executing batch of %s commands, max concurrency %s",
+            len(commands),
+            self._max_concurrency,
+        )
+        if self._prefetch is not None:
+            await self._prefetch(commands)
+
+        # Tasks copy the current context, priority included
+        with priority_scope(self._priority):
+            tasks = [asyncio.create_task(execute(i, command)) for i, command in enumerate(commands)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
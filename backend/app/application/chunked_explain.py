@@ -0,0 +1,223 @@
+"""Map-reduce and incremental explanation of code snippets."""
+
+import asyncio
+import logging
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.application.commands.explain_code_command import ExplainCodeCommand
+from app.application.content_key import ContentKeyBuilder
+from app.application.interfaces.ai_provider import AIProvider
+from app.application.interfaces.result_cache import ResultCache
+from app.domain.services.code_canonicalization_service import CodeCanonicalizationService
+from app.domain.services.code_chunking_service import PYTHON_LANGUAGES, CodeChunkingService
+from app.domain.value_objects.code_chunk import CodeChunk
+from app.domain.value_objects.code_explanation import CodeExplanation
+from app.domain.value_objects.code_snippet import CodeSnippet
+
+logger = logging.getLogger(__name__)
+
+
+class CachedExplanationPart(BaseModel):
+    """A chunk explanation or summary kept for reuse by later requests."""
+
+    explanation: str
+    provider: str
+    placeholder: bool = False
+
+    class Config:
+        frozen = True
+
+
+class ChunkedExplainer:
+    """
+    Explain a snippet part by part, then summarize.
+
+    Large snippets are split at function and class boundaries into chunks of
+    at most ``max_chunk_chars``, the chunks are explained concurrently, and a
+    final call writes an overview from the chunk explanations. The result is
+    the overview followed by each chunk's explanation, so its length is not
+    capped by a single completion's token limit and wall-clock time is close
+    to that of the slowest chunk plus the summary.
+
+    With a cache, chunk explanations and summaries are stored by the
+    canonical fingerprint of the chunk (its normalized AST for Python), and in
+    incremental mode Python snippets of at least ``incremental_min_chars`` are
+    explained one top-level function or class at a time. A resubmitted snippet
+    then only sends the units that changed to the provider; reformatting or
+    editing comments changes nothing.
+    """
+
+    def __init__(
+        self,
+        ai_provider: AIProvider,
+        threshold_chars: Optional[int] = 12000,
+        max_chunk_chars: int = 6000,
+        max_concurrency: int = 4,
+        cache: Optional[ResultCache] = None,
+        key_builder: Optional[ContentKeyBuilder] = None,
+        incremental: bool = False,
+        incremental_min_chars: int = 2000,
+        cache_ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the explainer.
+
+        Args:
+            ai_provider: The AI provider explaining chunks and writing the summary
+            threshold_chars: Smallest snippet explained in chunks; None to only
+                chunk in incremental mode
+            max_chunk_chars: Largest chunk to send in one call
+            max_concurrency: Chunk explanations of one snippet in flight at a time
+            cache: Stores chunk explanations and summaries for reuse
+            key_builder: Scopes cache keys to the model and prompt version;
+                required with a cache
+            incremental: Explain Python snippets unit by unit below the chunking
+                threshold too, reusing cached units; requires a cache
+            incremental_min_chars: Smallest Python snippet explained unit by unit
+                in incremental mode; smaller ones cost fewer calls in one piece
+            cache_ttl: Time to live of cached parts; the cache default when omitted
+        """
+        if cache is not None and key_builder is None:
+            raise ValueError("A key builder is required with a cache")
+        if incremental and cache is None:
+            raise ValueError("Incremental mode requires a cache")
+
+        self._ai_provider = ai_provider
+        self._threshold_chars = threshold_chars
+        self._max_chunk_chars = max_chunk_chars
+        self._max_concurrency = max_concurrency
+        self._cache = cache
+        self._key_builder = key_builder
+        self._incremental = incremental
+        self._incremental_min_chars = incremental_min_chars
+        self._cache_ttl = cache_ttl
+
+    def applies_to(self, code_snippet: CodeSnippet) -> bool:
+        """Whether the snippet is explained in chunks rather than in a single call."""
+        if self._is_incremental(code_snippet):
+            return True
+        return (
+            self._threshold_chars is not None
+            and code_snippet.character_count >= self._threshold_chars
+        )
+
+    async def explain(self, code_snippet: CodeSnippet) -> CodeExplanation:
+        """
+        Explain the snippet chunk by chunk.
+
+        Falls back to a single call when the snippet does not split into
+        several chunks.
+
+        Args:
+            code_snippet: The code snippet to explain
+
+        Returns:
+            The combined explanation
+
+        Raises:
+            AIProviderError: If any of the AI calls fails
+        """
+        # Packing would shift chunk boundaries after an edit and defeat reuse
+        per_unit = self._is_incremental(code_snippet)
+        chunks = [
+            chunk
+            for chunk in CodeChunkingService.split(
+                code_snippet.content,
+                code_snippet.language,
+                self._max_chunk_chars,
+                pack=not per_unit,
+            )
+            if chunk.content.strip()
+        ]
+        if len(chunks) < 2:
+            return await self._ai_provider.explain_code(code_snippet)
+
+        keys = [self._chunk_key(chunk, code_snippet.language) for chunk in chunks]
+        parts = await self._explain_chunks(chunks, keys, code_snippet.language)
+        sections = [(chunk, part.explanation) for chunk, part in zip(chunks, parts)]
+        summary = await self._summarize(code_snippet, sections, keys)
+
+        details = "\n\n".join(f"### {chunk.label}\n\n{text}" for chunk, text in sections)
+        return CodeExplanation(
+            snippet=code_snippet,
+            explanation=f"{summary.explanation}\n\n## Details by section\n\n{details}",
+            provider=summary.provider,
+            is_placeholder=summary.placeholder or any(part.placeholder for part in parts),
+        )
+
+    async def _explain_chunks(
+        self, chunks: list[CodeChunk], keys: list[Optional[str]], language: str | None
+    ) -> list[CachedExplanationPart]:
+        cached = await asyncio.gather(*(self._cache_get(key) for key in keys))
+        missing = [i for i, part in enumerate(cached) if part is None]
+        logger.info(
+            "Explaining %s chunks, %s reused from cache", len(chunks), len(chunks) - len(missing)
+        )
+
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def explain_chunk(index: int) -> None:
+            async with semaphore:
+                explanation = await self._ai_provider.explain_code(
+                    CodeSnippet(content=chunks[index].content, language=language)
+                )
+            part = CachedExplanationPart(
+                explanation=explanation.explanation,
+                provider=explanation.provider,
+                placeholder=explanation.is_placeholder,
+            )
+            cached[index] = part
+            await self._cache_set(keys[index], part)
+
+        tasks = [asyncio.create_task(explain_chunk(index)) for index in missing]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # One chunk failed (or the request was cancelled): the rest are wasted
+            for task in tasks:
+                task.cancel()
+        return [part for part in cached if part is not None]
+
+    async def _summarize(
+        self,
+        code_snippet: CodeSnippet,
+        sections: list[tuple[CodeChunk, str]],
+        chunk_keys: list[Optional[str]],
+    ) -> CachedExplanationPart:
+        key = None
+        if self._key_builder is not None:
+            key = self._key_builder.build_for(ExplainCodeCommand, "summary", chunk_keys)
+        summary = await self._cache_get(key)
+        if summary is None:
+            explanation = await self._ai_provider.summarize_explanations(code_snippet, sections)
+            summary = CachedExplanationPart(
+                explanation=explanation.explanation,
+                provider=explanation.provider,
+                placeholder=explanation.is_placeholder,
+            )
+            await self._cache_set(key, summary)
+        return summary
+
+    def _is_incremental(self, code_snippet: CodeSnippet) -> bool:
+        return (
+            self._incremental
+            and code_snippet.language in PYTHON_LANGUAGES
+            and code_snippet.character_count >= self._incremental_min_chars
+        )
+
+    def _chunk_key(self, chunk: CodeChunk, language: Optional[str]) -> Optional[str]:
+        if self._key_builder is None:
+            return None
+        fingerprint = CodeCanonicalizationService.fingerprint(chunk.content, language)
+        return self._key_builder.build_for(ExplainCodeCommand, "chunk", language, fingerprint)
+
+    async def _cache_get(self, key: Optional[str]) -> Optional[CachedExplanationPart]:
+        if self._cache is None or key is None:
+            return None
+        return await self._cache.get(key)
+
+    async def _cache_set(self, key: Optional[str], part: CachedExplanationPart) -> None:
+        if self._cache is not None and key is not None:
+            await self._cache.set(key, part, self._cache_ttl)
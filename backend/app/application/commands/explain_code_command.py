@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 
@@ -8,3 +8,10 @@ class ExplainCodeCommand:
 
     code: str
     language: Optional[str] = None
+    # Accept the result of a near-identical past snippet; how a result may be served,
+    # not what it is, so it stays out of the content key
+    accept_similar: bool = field(default=False, metadata={"content_key": False})
+    # Content key already computed by the caller (e.g. for an ETag), reused by middleware
+    content_key: Optional[str] = field(
+        default=None, compare=False, repr=False, metadata={"content_key": False}
+    )
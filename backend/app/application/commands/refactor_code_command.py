@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 
@@ -9,3 +9,7 @@ class RefactorCodeCommand:
     code: str
     language: Optional[str] = None
     goal: Optional[str] = None
+    # Content key already computed by the caller (e.g. for an ETag), reused by middleware
+    content_key: Optional[str] = field(
+        default=None, compare=False, repr=False, metadata={"content_key": False}
+    )
@@ -0,0 +1,125 @@
+"""Content-addressed keys for commands and their results."""
+
+import dataclasses
+import hashlib
+import json
+from typing import Any, Iterable, Mapping, Optional, Type
+
+from app.domain.services.code_canonicalization_service import CodeCanonicalizationService
+
+
+def content_key(*parts: Any) -> str:
+    """
+    Hash an ordered sequence of parts into an unambiguous hex digest.
+
+    Parts are JSON-encoded as a list before hashing, so field boundaries are
+    preserved: ``("ab", "c")`` and ``("a", "bc")`` produce different keys.
+    """
+    encoded = json.dumps(list(parts), ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def normalize_code(code: str) -> str:
+    """Normalize line endings, trailing whitespace and surrounding blank lines."""
+    lines = code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+
+class ContentKeyBuilder:
+    """
+    Builds content keys for commands.
+
+    A key covers the command type, a namespace such as the model name, the
+    prompt version of the command type, and every command field (with hints
+    trimmed) not marked ``metadata={"content_key": False}``.
+
+    For canonical command types, the code is keyed by its canonical
+    fingerprint, so reformatted copies of a snippet (whitespace, indentation,
+    comments) share a key. For other command types it is only normalized for
+    line endings and trailing whitespace, so any change to what would be sent
+    upstream yields a new key.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "",
+        command_versions: Optional[Mapping[Type[Any], str]] = None,
+        canonical_commands: Optional[Iterable[Type[Any]]] = None,
+    ) -> None:
+        """
+        Initialize the key builder.
+
+        Args:
+            namespace: Shared key prefix, typically the model name
+            command_versions: Prompt version per command type
+            canonical_commands: Command types keyed by the canonical fingerprint
+                of their code; all command types when omitted
+        """
+        self._namespace = namespace
+        self._command_versions = dict(command_versions or {})
+        self._canonical_commands = (
+            frozenset(canonical_commands) if canonical_commands is not None else None
+        )
+
+    def build(self, command: Any) -> str:
+        """
+        Build the content key for a command.
+
+        A key already set on the command's ``content_key`` field is returned
+        as is; it must have been built by this builder.
+
+        Args:
+            command: A dataclass command instance
+
+        Returns:
+            Hex digest identifying the command's content
+        """
+        precomputed = getattr(command, "content_key", None)
+        if precomputed is not None:
+            return str(precomputed)
+        values = {
+            field.name: self._normalize_field(field.name, getattr(command, field.name))
+            for field in dataclasses.fields(command)
+            if field.metadata.get("content_key", True)
+        }
+        if isinstance(values.get("code"), str) and self._is_canonical(type(command)):
+            values["code"] = CodeCanonicalizationService.fingerprint(
+                command.code, values.get("language")
+            )
+        return self.build_for(type(command), [[name, value] for name, value in values.items()])
+
+    def build_for(self, command_type: Type[Any], *parts: Any) -> str:
+        """
+        Build a content key for a partial result of a command type.
+
+        Scoped like command keys, by namespace and the command type's prompt
+        version, so partial results are dropped along with full ones when
+        either changes.
+
+        Args:
+            command_type: Command type the partial result belongs to
+            *parts: Values identifying the partial result
+
+        Returns:
+            Hex digest identifying the partial result
+        """
+        return content_key(
+            command_type.__name__,
+            self._namespace,
+            self._command_versions.get(command_type, ""),
+            *parts,
+        )
+
+    def _is_canonical(self, command_type: Type[Any]) -> bool:
+        return self._canonical_commands is None or command_type in self._canonical_commands
+
+    @staticmethod
+    def _normalize_field(name: str, value: Any) -> Any:
+        """Normalize a single command field for keying."""
+        if not isinstance(value, str):
+            return value
+        if name == "code":
+            return normalize_code(value)
+        if name == "language":
+            return value.strip().lower() or None
+        return value.strip() or None
@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, Any, Callable, Awaitable, Dict, Type
+from functools import partial
+from typing import TypeVar, Generic, Any, AsyncIterator, Callable, Awaitable, Dict, Type
 import logging
 import time
-import logging
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +18,14 @@ class Handler(ABC, Generic[TCommand, TResult]):
         pass
 
 
+class StreamingHandler(Handler[TCommand, TResult]):
+    """Handler that can also stream its result incrementally."""
+
+    @abstractmethod
+    def stream(self, command: TCommand) -> AsyncIterator[str]:
+        pass
+
+
 class Middleware(ABC):
     """Base middleware for cross-cutting concerns."""
 
@@ -27,6 +35,21 @@ class Middleware(ABC):
     ) -> Any:
         pass
 
+    def execute_stream(
+        self, command: Any, next_stream: Callable[[Any], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        """
+        Wrap a command dispatched in streaming mode.
+
+        Streams pass through untouched unless a middleware overrides this,
+        e.g. to hold a concurrency slot until the stream ends.
+        """
+        return next_stream(command)
+
+    def applies_to(self, command_type: Type[Any]) -> bool:
+        """Whether to include this middleware in the chain of ``command_type``."""
+        return True
+
 
 class LoggingMiddleware(Middleware):
     """Middleware for request/response logging."""
@@ -40,61 +63,19 @@ class LoggingMiddleware(Middleware):
         start_time = time.time()
         command_name = command.__class__.__name__
 
-        self.logger.info(f"Executing command: {command_name}")
+        self.logger.info("Executing command: %s", command_name)
 
         try:
             result = await next_handler(command)
             duration = (time.time() - start_time) * 1000
-            self.logger.info(f"Command {command_name} completed in {duration:.2f}ms")
+            self.logger.info("Command %s completed in %.2fms", command_name, duration)
             return result
         except Exception as e:
             duration = (time.time() - start_time) * 1000
-            self.logger.error(
-                f"Command {command_name} failed after {duration:.2f}ms: {str(e)}"
-            )
+            self.logger.error("Command %s failed after %.2fms: %s", command_name, duration, e)
             raise
 
 
-# class CommandDispatcher:
-#     """Enhanced dispatcher with middleware support."""
-
-#     def __init__(self):
-#         self._handlers: dict[type, Handler] = {}
-#         self._middlewares: list[Middleware] = []
-
-#     def register_handler(self, command_type: type, handler: Handler) -> None:
-#         self._handlers[command_type] = handler
-
-#     def add_middleware(self, middleware: Middleware) -> None:
-#         self._middlewares.append(middleware)
-
-#     async def dispatch(self, command: Any) -> Any:
-#         command_type = type(command)
-#         if command_type not in self._handlers:
-#             raise ValueError(f"No handler registered for {command_type.__name__}")
-
-#         handler = self._handlers[command_type]
-
-#         # Build middleware chain
-#         async def execute_handler(cmd: Any) -> Any:
-#             return await handler.handle(cmd)
-
-#         # Apply middlewares in reverse order
-#         next_handler = execute_handler
-#         for middleware in reversed(self._middlewares):
-#             current_middleware = middleware
-#             current_next = next_handler
-
-#             async def middleware_wrapper(
-#                 cmd: Any, mw=current_middleware, next_fn=current_next
-#             ) -> Any:
-#                 return await mw.execute(cmd, next_fn)
-
-#             next_handler = middleware_wrapper
-
-#         return await next_handler(command)
-
-
 class CommandDispatcher:
     """
     Command dispatcher for CQRS pattern.
@@ -103,6 +84,10 @@ class CommandDispatcher:
 
     def __init__(self) -> None:
         self._handlers: Dict[Type[Any], Handler] = {}
+        self._middlewares: list[Middleware] = []
+        # Composed middleware chain per command type, rebuilt on (re)registration
+        self._chains: Dict[Type[Any], Callable[[Any], Awaitable[Any]]] = {}
+        self._stream_chains: Dict[Type[Any], Callable[[Any], AsyncIterator[str]]] = {}
 
     def register_handler(
         self, command_type: Type[TCommand], handler: Handler[TCommand, TResult]
@@ -115,10 +100,11 @@ class CommandDispatcher:
             handler: The handler instance for this command type
         """
         if command_type in self._handlers:
-            logger.warning(f"Handler for {command_type.__name__} is being overridden")
+            logger.warning("Handler for %s is being overridden", command_type.__name__)
 
         self._handlers[command_type] = handler
-        logger.debug(f"Registered handler for {command_type.__name__}")
+        self._rebuild_chains(command_type, handler)
+        logger.debug("Registered handler for %s", command_type.__name__)
 
     # Add alias for backward compatibility
     def register(
@@ -127,6 +113,21 @@ class CommandDispatcher:
         """Alias for register_handler to maintain compatibility."""
         self.register_handler(command_type, handler)
 
+    def add_middleware(self, middleware: Middleware) -> None:
+        """
+        Add a middleware around every dispatched command.
+
+        Middlewares run in the order they were added: the first one added is
+        the outermost wrapper around the handler.
+
+        Args:
+            middleware: The middleware instance to add
+        """
+        self._middlewares.append(middleware)
+        for command_type, handler in self._handlers.items():
+            self._rebuild_chains(command_type, handler)
+        logger.debug("Added middleware %s", middleware.__class__.__name__)
+
     async def dispatch(self, command: TCommand) -> TResult:
         """
         Dispatch a command to its registered handler.
@@ -141,24 +142,79 @@ class CommandDispatcher:
             ValueError: If no handler is registered for the command type
         """
         command_type = type(command)
+        chain = self._chains.get(command_type)
 
-        if command_type not in self._handlers:
+        if chain is None:
             raise ValueError(
                 f"No handler registered for command type: {command_type.__name__}"
             )
 
-        handler = self._handlers[command_type]
-
-        logger.debug(f"Dispatching command: {command_type.__name__}")
+        logger.debug("Dispatching command: %s", command_type.__name__)
 
         try:
-            result = await handler.handle(command)
-            logger.debug(f"Successfully handled command: {command_type.__name__}")
+            result = await chain(command)
+            logger.debug("Successfully handled command: %s", command_type.__name__)
             return result
         except Exception as e:
-            logger.error(f"Error handling command {command_type.__name__}: {str(e)}")
+            logger.error("Error handling command %s: %s", command_type.__name__, e)
             raise
 
+    async def stream(self, command: Any) -> AsyncIterator[str]:
+        """
+        Dispatch a command to its registered handler in streaming mode.
+
+        The stream goes through the same middleware as ``dispatch``, each
+        wrapping it through ``Middleware.execute_stream``.
+
+        Args:
+            command: The command instance to execute
+
+        Yields:
+            Text fragments produced by the handler, in order
+
+        Raises:
+            ValueError: If no streaming handler is registered for the command type
+        """
+        command_type = type(command)
+        chain = self._stream_chains.get(command_type)
+
+        if chain is None:
+            raise ValueError(
+                f"No streaming handler registered for command type: {command_type.__name__}"
+            )
+
+        logger.debug("Streaming command: %s", command_type.__name__)
+
+        async for chunk in chain(command):
+            yield chunk
+
+    def _rebuild_chains(self, command_type: Type[Any], handler: Handler) -> None:
+        self._chains[command_type] = self._build_chain(command_type, handler)
+        if isinstance(handler, StreamingHandler):
+            self._stream_chains[command_type] = self._build_stream_chain(command_type, handler)
+        else:
+            self._stream_chains.pop(command_type, None)
+
+    def _build_chain(
+        self, command_type: Type[Any], handler: Handler
+    ) -> Callable[[Any], Awaitable[Any]]:
+        """Compose the handler with the middlewares that apply to ``command_type``."""
+        chain: Callable[[Any], Awaitable[Any]] = handler.handle
+        for middleware in reversed(self._middlewares):
+            if middleware.applies_to(command_type):
+                chain = partial(middleware.execute, next_handler=chain)
+        return chain
+
+    def _build_stream_chain(
+        self, command_type: Type[Any], handler: StreamingHandler[Any, Any]
+    ) -> Callable[[Any], AsyncIterator[str]]:
+        """Compose the handler's stream with the middlewares that apply to ``command_type``."""
+        chain: Callable[[Any], AsyncIterator[str]] = handler.stream
+        for middleware in reversed(self._middlewares):
+            if middleware.applies_to(command_type):
+                chain = partial(middleware.execute_stream, next_stream=chain)
+        return chain
+
     def is_registered(self, command_type: Type[Any]) -> bool:
         """Check if a handler is registered for the given command type."""
         return command_type in self._handlers
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -9,6 +11,8 @@ class ExplainResultDTO(BaseModel):
     character_count: int
     provider: str
     placeholder: bool = False
+    # Set when the explanation was reused from a near-identical snippet (0 to 1)
+    similarity: Optional[float] = None
 
     class Config:
         frozen = True
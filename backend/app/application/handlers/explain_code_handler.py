@@ -1,4 +1,7 @@
-from app.application.dispatch import Handler
+from typing import AsyncIterator, Optional
+
+from app.application.chunked_explain import ChunkedExplainer
+from app.application.dispatch import StreamingHandler
 from app.application.commands.explain_code_command import ExplainCodeCommand
 from app.application.dto.explain_result_dto import ExplainResultDTO
 from app.application.interfaces.ai_provider import AIProvider
@@ -9,17 +12,22 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class ExplainCodeHandler(Handler[ExplainCodeCommand, ExplainResultDTO]):
+class ExplainCodeHandler(StreamingHandler[ExplainCodeCommand, ExplainResultDTO]):
     """Handler for explaining code snippets."""
 
-    def __init__(self, ai_provider: AIProvider) -> None:
+    def __init__(
+        self, ai_provider: AIProvider, chunked_explainer: Optional[ChunkedExplainer] = None
+    ) -> None:
         """
         Initialize the handler with an AI provider.
 
         Args:
             ai_provider: The AI provider to use for explanations
+            chunked_explainer: Explains large snippets chunk by chunk; every
+                snippet is sent in a single call when omitted
         """
         self._ai_provider = ai_provider
+        self._chunked_explainer = chunked_explainer
 
     async def handle(self, command: ExplainCodeCommand) -> ExplainResultDTO:
         """
@@ -36,17 +44,18 @@ class ExplainCodeHandler(Handler[ExplainCodeCommand, ExplainResultDTO]):
             AIProviderError: If the AI service fails
         """
         try:
-            logger.info(
-                f"Explaining code using {self._ai_provider.provider_name} provider"
-            )
+            logger.info("Explaining code using %s provider", self._ai_provider.provider_name)
 
             # Create validated code snippet using domain service
             code_snippet = CodeValidationService.create_code_snippet(
                 command.code, command.language
             )
 
-            # Get explanation from AI provider
-            explanation = await self._ai_provider.explain_code(code_snippet)
+            # Get explanation from AI provider, in chunks for large snippets
+            if self._chunked_explainer and self._chunked_explainer.applies_to(code_snippet):
+                explanation = await self._chunked_explainer.explain(code_snippet)
+            else:
+                explanation = await self._ai_provider.explain_code(code_snippet)
 
             # Convert to DTO
             result = ExplainResultDTO(
@@ -58,7 +67,7 @@ class ExplainCodeHandler(Handler[ExplainCodeCommand, ExplainResultDTO]):
             )
 
             logger.info(
-                f"Successfully generated explanation using {explanation.provider} provider"
+                "Successfully generated explanation using %s provider", explanation.provider
             )
             return result
 
@@ -66,7 +75,39 @@ class ExplainCodeHandler(Handler[ExplainCodeCommand, ExplainResultDTO]):
             # Re-raise domain and AI provider errors as-is
             raise
         except Exception as e:
-            logger.error(f"Unexpected error in explain handler: {e}")
+            logger.error("Unexpected error in explain handler: %s", e)
             raise AIProviderError(
                 f"Failed to process explanation request: {str(e)}"
             ) from e
+
+    async def stream(self, command: ExplainCodeCommand) -> AsyncIterator[str]:
+        """
+        Handle the command in streaming mode.
+
+        Args:
+            command: The command containing the code to process
+
+        Yields:
+            Fragments of the explanation as the AI provider produces them
+
+        Raises:
+            ValidationError: If the command is invalid
+            AIProviderError: If the AI service fails
+        """
+        try:
+            code_snippet = CodeValidationService.create_code_snippet(
+                command.code, command.language
+            )
+
+            logger.info("Streaming explanation using %s provider", self._ai_provider.provider_name)
+
+            async for chunk in self._ai_provider.stream_explain_code(code_snippet):
+                yield chunk
+
+        except (ValidationError, AIProviderError):
+            raise
+        except Exception as e:
+            logger.error("Unexpected error in explain stream: %s", e)
+            raise AIProviderError(
+                f"Failed to stream explain response: {str(e)}"
+            ) from e
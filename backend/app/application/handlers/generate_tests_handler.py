@@ -1,4 +1,6 @@
-from app.application.dispatch import Handler
+from typing import AsyncIterator
+
+from app.application.dispatch import StreamingHandler
 from app.application.commands.generate_tests_command import GenerateTestsCommand
 from app.application.dto.test_scaffold_result_dto import TestScaffoldResultDTO
 from app.application.interfaces.ai_provider import AIProvider
@@ -9,7 +11,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class GenerateTestsHandler(Handler[GenerateTestsCommand, TestScaffoldResultDTO]):
+class GenerateTestsHandler(StreamingHandler[GenerateTestsCommand, TestScaffoldResultDTO]):
     """Handler for generating unit tests for code snippets."""
 
     def __init__(self, ai_provider: AIProvider) -> None:
@@ -36,9 +38,7 @@ class GenerateTestsHandler(Handler[GenerateTestsCommand, TestScaffoldResultDTO])
             AIProviderError: If the AI service fails
         """
         try:
-            logger.info(
-                f"Generating tests using {self._ai_provider.provider_name} provider"
-            )
+            logger.info("Generating tests using %s provider", self._ai_provider.provider_name)
 
             # Create validated code snippet using domain service
             code_snippet = CodeValidationService.create_code_snippet(
@@ -63,7 +63,7 @@ class GenerateTestsHandler(Handler[GenerateTestsCommand, TestScaffoldResultDTO])
             )
 
             logger.info(
-                f"Successfully generated test scaffold using {test_scaffold.provider} provider"
+                "Successfully generated test scaffold using %s provider", test_scaffold.provider
             )
             return result
 
@@ -71,7 +71,41 @@ class GenerateTestsHandler(Handler[GenerateTestsCommand, TestScaffoldResultDTO])
             # Re-raise domain and AI provider errors as-is
             raise
         except Exception as e:
-            logger.error(f"Unexpected error in test generation handler: {e}")
+            logger.error("Unexpected error in test generation handler: %s", e)
             raise AIProviderError(
                 f"Failed to process test generation request: {str(e)}"
             ) from e
+
+    async def stream(self, command: GenerateTestsCommand) -> AsyncIterator[str]:
+        """
+        Handle the command in streaming mode.
+
+        Args:
+            command: The command containing the code to process
+
+        Yields:
+            Fragments of the test code as the AI provider produces them
+
+        Raises:
+            ValidationError: If the command is invalid
+            AIProviderError: If the AI service fails
+        """
+        try:
+            code_snippet = CodeValidationService.create_code_snippet(
+                command.code, command.language
+            )
+
+            logger.info("Streaming tests using %s provider", self._ai_provider.provider_name)
+
+            async for chunk in self._ai_provider.stream_generate_tests(
+                code_snippet, command.test_framework
+            ):
+                yield chunk
+
+        except (ValidationError, AIProviderError):
+            raise
+        except Exception as e:
+            logger.error("Unexpected error in test generation stream: %s", e)
+            raise AIProviderError(
+                f"Failed to stream test generation response: {str(e)}"
+            ) from e
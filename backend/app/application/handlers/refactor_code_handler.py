@@ -1,4 +1,6 @@
-from app.application.dispatch import Handler
+from typing import AsyncIterator
+
+from app.application.dispatch import StreamingHandler
 from app.application.commands.refactor_code_command import RefactorCodeCommand
 from app.application.dto.refactor_result_dto import RefactorResultDTO
 from app.application.interfaces.ai_provider import AIProvider
@@ -9,7 +11,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class RefactorCodeHandler(Handler[RefactorCodeCommand, RefactorResultDTO]):
+class RefactorCodeHandler(StreamingHandler[RefactorCodeCommand, RefactorResultDTO]):
     """Handler for refactoring code snippets."""
 
     def __init__(self, ai_provider: AIProvider) -> None:
@@ -36,9 +38,7 @@ class RefactorCodeHandler(Handler[RefactorCodeCommand, RefactorResultDTO]):
             AIProviderError: If the AI service fails
         """
         try:
-            logger.info(
-                f"Refactoring code using {self._ai_provider.provider_name} provider"
-            )
+            logger.info("Refactoring code using %s provider", self._ai_provider.provider_name)
 
             # Create validated code snippet using domain service
             code_snippet = CodeValidationService.create_code_snippet(
@@ -59,16 +59,51 @@ class RefactorCodeHandler(Handler[RefactorCodeCommand, RefactorResultDTO]):
                 placeholder=refactor.is_placeholder,
             )
 
-            logger.info(
-                f"Successfully generated refactor using {refactor.provider} provider"
-            )
+            logger.info("Successfully generated refactor using %s provider", refactor.provider)
             return result
 
         except (ValidationError, AIProviderError):
             # Re-raise domain and AI provider errors as-is
             raise
         except Exception as e:
-            logger.error(f"Unexpected error in refactor handler: {e}")
+            logger.error("Unexpected error in refactor handler: %s", e)
             raise AIProviderError(
                 f"Failed to process refactor request: {str(e)}"
             ) from e
+
+    async def stream(self, command: RefactorCodeCommand) -> AsyncIterator[str]:
+        """
+        Handle the command in streaming mode.
+
+        Args:
+            command: The command containing the code to process
+
+        Yields:
+            Fragments of the refactoring response as the AI provider produces them
+
+        Raises:
+            ValidationError: If the command is invalid
+            AIProviderError: If the AI service fails
+        """
+        try:
+            code_snippet = CodeValidationService.create_code_snippet(
+                command.code, command.language
+            )
+
+            logger.info(
+                "Streaming refactoring suggestions using %s provider",
+                self._ai_provider.provider_name,
+            )
+
+            async for chunk in self._ai_provider.stream_refactor_code(
+                code_snippet, command.goal
+            ):
+                yield chunk
+
+        except (ValidationError, AIProviderError):
+            raise
+        except Exception as e:
+            logger.error("Unexpected error in refactor stream: %s", e)
+            raise AIProviderError(
+                f"Failed to stream refactor response: {str(e)}"
+            ) from e
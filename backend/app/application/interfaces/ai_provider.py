@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, AsyncIterator, Optional, Sequence
 
+from app.domain.value_objects.code_chunk import CodeChunk
 from app.domain.value_objects.code_snippet import CodeSnippet
 from app.domain.value_objects.code_explanation import CodeExplanation
 from app.domain.value_objects.code_refactor import CodeRefactor
@@ -65,6 +66,115 @@ class AIProvider(ABC):
         """
         pass
 
+    async def summarize_explanations(
+        self, code_snippet: CodeSnippet, sections: Sequence[tuple[CodeChunk, str]]
+    ) -> CodeExplanation:
+        """
+        Write an overview of a large snippet from explanations of its parts.
+
+        Used when a snippet is explained chunk by chunk; the overview is shown
+        above the per-chunk explanations. Providers without a summarizing
+        model fall back to an outline of the chunks.
+
+        Args:
+            code_snippet: The complete code snippet
+            sections: Each chunk with its explanation, in source order
+
+        Returns:
+            An explanation holding the overview
+
+        Raises:
+            AIProviderError: If the AI service fails
+        """
+        outline = "\n".join(f"- {chunk.label}" for chunk, _ in sections)
+        return CodeExplanation(
+            snippet=code_snippet,
+            explanation=(
+                f"## Overview\n\nThis code spans {code_snippet.line_count} lines, "
+                f"explained in {len(sections)} parts:\n\n{outline}"
+            ),
+            provider=self.provider_name,
+        )
+
+    async def stream_explain_code(self, code_snippet: CodeSnippet) -> AsyncIterator[str]:
+        """
+        Stream the explanation for the given code snippet as it is generated.
+
+        Providers without native streaming support fall back to yielding the
+        complete explanation as a single chunk.
+
+        Args:
+            code_snippet: The code snippet to explain
+
+        Yields:
+            Fragments of the explanation text, in order
+
+        Raises:
+            AIProviderError: If the AI service fails
+        """
+        explanation = await self.explain_code(code_snippet)
+        yield explanation.explanation
+
+    async def stream_refactor_code(
+        self, code_snippet: CodeSnippet, goal: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream refactoring suggestions for the given code snippet as they are generated.
+
+        Args:
+            code_snippet: The code snippet to refactor
+            goal: Optional specific refactoring goal
+
+        Yields:
+            Fragments of the refactoring response text, in order
+
+        Raises:
+            AIProviderError: If the AI service fails
+        """
+        refactor = await self.refactor_code(code_snippet, goal)
+        yield refactor.explanation
+
+    async def stream_generate_tests(
+        self, code_snippet: CodeSnippet, test_framework: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a unit test scaffold for the given code snippet as it is generated.
+
+        Args:
+            code_snippet: The code snippet to generate tests for
+            test_framework: Optional test framework preference
+
+        Yields:
+            Fragments of the generated test code, in order
+
+        Raises:
+            AIProviderError: If the AI service fails
+        """
+        test_scaffold = await self.generate_tests(code_snippet, test_framework)
+        yield test_scaffold.test_code
+
+    async def warm_up(self) -> None:
+        """
+        Prepare the provider for traffic (e.g. open upstream connections).
+
+        Called once at application startup. Failures should be logged, not
+        raised: a cold provider still works.
+        """
+        pass
+
+    async def close(self, drain_timeout: float = 0.0) -> None:
+        """
+        Release the provider's resources at application shutdown.
+
+        Args:
+            drain_timeout: Seconds to wait for in-flight requests to finish
+        """
+        pass
+
+    def stats(self) -> dict[str, Any]:
+        """Runtime statistics (connection pool usage, ...) for health checks."""
+        return {}
+
     @property
     @abstractmethod
     def provider_name(self) -> str:
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, Optional, List
+from typing import TypeVar, Generic, Optional, List, Mapping
 from uuid import UUID
 
+from app.application.interfaces.query_repository import StoredResult
+
 T = TypeVar("T")
 
 
@@ -27,3 +29,41 @@ class Repository(ABC, Generic[T]):
     async def delete(self, id: UUID) -> bool:
         """Delete entity by ID."""
         pass
+
+
+class ResultCommandRepository(ABC):
+    """Write side of the persistent result store."""
+
+    @abstractmethod
+    async def put(self, result: StoredResult) -> None:
+        """Store a result, replacing any stored under the same key but keeping its hits."""
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove a stored result if present."""
+        pass
+
+    @abstractmethod
+    async def record_hits(self, hits: Mapping[str, int]) -> None:
+        """
+        Add to the hit counts of stored results, marking them as just used.
+
+        Args:
+            hits: Hits per content key since the last call
+        """
+        pass
+
+    @abstractmethod
+    async def prune(self, max_entries: int) -> int:
+        """
+        Remove expired results, then the least recently used beyond ``max_entries``.
+
+        Returns:
+            Number of results removed
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release connections held by the repository."""
+        pass
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class DistributedLock(ABC):
+    """Interface for named locks shared by every replica."""
+
+    @abstractmethod
+    async def acquire(self, name: str) -> Optional[str]:
+        """
+        Take the lock, waiting while another holder has it.
+
+        The lock expires on its own after a while, so a holder that dies
+        does not block the others forever.
+
+        Args:
+            name: Name of the lock
+
+        Returns:
+            A token to release the lock with, or None if it could not be
+            taken within the wait limit
+        """
+        pass
+
+    @abstractmethod
+    async def release(self, name: str, token: str) -> None:
+        """
+        Release the lock if still held with ``token``.
+
+        Args:
+            name: Name of the lock
+            token: Token returned by ``acquire``
+        """
+        pass
@@ -0,0 +1,64 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from app.application.jobs import Job
+
+
+class JobBackend(ABC):
+    """Interface for job queues and job state stores."""
+
+    @abstractmethod
+    async def enqueue(self, job: Job) -> None:
+        """
+        Store a new job and queue it for a worker.
+
+        Raises:
+            ServiceOverloadedError: If the queue is full
+        """
+        pass
+
+    @abstractmethod
+    async def dequeue(self, timeout: float) -> Optional[Job]:
+        """
+        Take the next queued job.
+
+        Args:
+            timeout: Seconds to wait for a job
+
+        Returns:
+            The job, or None if none was queued within the timeout
+        """
+        pass
+
+    @abstractmethod
+    async def save(self, job: Job) -> None:
+        """Persist a job's new state, notifying waiters once it is finished."""
+        pass
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job, returning None if it is unknown or expired."""
+        pass
+
+    @abstractmethod
+    async def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        """
+        Wait for a job to finish.
+
+        Args:
+            job_id: Id of the job
+            timeout: Longest time to wait, in seconds
+
+        Returns:
+            The job once finished, or in its current state after the timeout;
+            None if it is unknown
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release connections held by the backend."""
+        pass
+
+    def stats(self) -> dict[str, Any]:
+        """Queue statistics for observability."""
+        return {}
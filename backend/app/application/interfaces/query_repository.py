@@ -1,3 +1,51 @@
 """
 Query repository interface for the application.
 """
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class StoredResult:
+    """A command result persisted under its content key."""
+
+    key: str
+    payload: bytes  # Encoded result, as written by the result cache
+    expires_at: float  # Unix time
+    hits: int = 0
+
+
+class ResultQueryRepository(ABC):
+    """Read side of the persistent result store."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[StoredResult]:
+        """
+        Look up a stored result.
+
+        Args:
+            key: Content key of the command
+
+        Returns:
+            The stored result, or None if unknown or expired
+        """
+        pass
+
+    @abstractmethod
+    async def hottest(self, limit: int) -> list[StoredResult]:
+        """
+        Unexpired results, most hit first.
+
+        Args:
+            limit: Most results to return
+
+        Returns:
+            Up to ``limit`` results in decreasing order of hits
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release connections held by the repository."""
+        pass
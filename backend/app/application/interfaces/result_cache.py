@@ -0,0 +1,70 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Sequence
+
+
+class ResultCache(ABC):
+    """Interface for caches of command results keyed by content key."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Content key of the command
+
+        Returns:
+            The cached result, or None on a miss or after expiry
+        """
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a result.
+
+        Args:
+            key: Content key of the command
+            value: The result to cache
+            ttl: Time to live in seconds; the cache default when omitted
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove a cached result if present."""
+        pass
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[Any]]:
+        """
+        Look up several cached results at once.
+
+        Caches behind a network override this to fetch all keys in one round trip.
+
+        Args:
+            keys: Content keys of the commands
+
+        Returns:
+            The cached result or None for each key, in order
+        """
+        return [await self.get(key) for key in keys]
+
+    async def warm_up(self, limit: int) -> int:
+        """
+        Load results kept from earlier runs, most used first.
+
+        Args:
+            limit: Most results to load
+
+        Returns:
+            Number of results loaded
+        """
+        return 0
+
+    async def close(self) -> None:
+        """Flush pending writes and release resources held by the cache."""
+        pass
+
+    def stats(self) -> dict[str, Any]:
+        """Cache statistics (hits, misses, size, ...) for observability."""
+        return {}
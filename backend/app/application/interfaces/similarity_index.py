@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(frozen=True)
+class SimilarMatch:
+    """A previously indexed snippet similar to a looked-up one."""
+
+    key: str  # Content key the matching snippet was indexed under
+    similarity: float  # Estimated Jaccard similarity, 0 to 1
+
+
+class SimilarityIndex(ABC):
+    """Interface for indexes finding previously seen snippets similar to a new one."""
+
+    @abstractmethod
+    def add(self, key: str, code: str, language: Optional[str] = None) -> None:
+        """
+        Index a snippet.
+
+        Args:
+            key: Content key of the snippet's result
+            code: The snippet's code
+            language: Normalized language hint, if any
+        """
+        pass
+
+    @abstractmethod
+    def find(
+        self, code: str, language: Optional[str] = None, min_similarity: float = 0.9
+    ) -> Optional[SimilarMatch]:
+        """
+        Find the indexed snippet most similar to ``code``.
+
+        Args:
+            code: The code to look up
+            language: Normalized language hint, if any
+            min_similarity: Lowest similarity worth returning
+
+        Returns:
+            The best match at or above ``min_similarity``, or None
+        """
+        pass
+
+    @abstractmethod
+    def remove(self, key: str) -> None:
+        """Remove a snippet from the index if present."""
+        pass
+
+    def stats(self) -> dict[str, Any]:
+        """Index statistics (entries, lookups, matches, ...) for observability."""
+        return {}
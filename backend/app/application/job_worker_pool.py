@@ -0,0 +1,190 @@
+"""In-process workers draining the job queue through the command dispatcher."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+from app.application.admission import Priority, priority_scope
+from app.application.dispatch import CommandDispatcher
+from app.application.interfaces.job_backend import JobBackend
+from app.application.jobs import Job, JobStatus
+from app.domain.exceptions import (
+    AIProviderError,
+    DomainError,
+    ServiceOverloadedError,
+    ValidationError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorkerPool:
+    """
+    Submit jobs and run them on a fixed number of worker tasks.
+
+    Request handling only enqueues, so request latency no longer depends on
+    model latency. With a shared backend (Redis), workers of every replica
+    drain the same queue and any replica can report a job's state.
+    """
+
+    def __init__(
+        self,
+        backend: JobBackend,
+        dispatcher: CommandDispatcher,
+        workers: int = 4,
+        poll_interval: float = 1.0,
+    ) -> None:
+        """
+        Initialize the worker pool.
+
+        Args:
+            backend: Queue and state store for jobs
+            dispatcher: Dispatcher the job commands are sent through
+            workers: Number of concurrent worker tasks
+            poll_interval: Seconds a worker blocks on an empty queue before
+                checking whether it should stop
+        """
+        self._backend = backend
+        self._dispatcher = dispatcher
+        self._workers = workers
+        self._poll_interval = poll_interval
+        self._tasks: list[asyncio.Task[None]] = []
+        self._busy: set[asyncio.Task[Any]] = set()
+        self._stopping = False
+        self._completed = 0
+        self._failed = 0
+
+    @property
+    def backend(self) -> JobBackend:
+        return self._backend
+
+    async def submit(self, action: str, params: dict[str, Any]) -> Job:
+        """
+        Queue a job.
+
+        Raises:
+            ServiceOverloadedError: If the queue is full
+        """
+        job = Job.create(action, params)
+        await self._backend.enqueue(job)
+        logger.info("Queued job %s (%s)", job.id, action)
+        return job
+
+    async def get(self, job_id: str, wait: float = 0.0) -> Optional[Job]:
+        """Look up a job, optionally waiting up to ``wait`` seconds for it to finish."""
+        if wait > 0:
+            return await self._backend.wait(job_id, wait)
+        return await self._backend.get(job_id)
+
+    async def start(self) -> None:
+        """Start the worker tasks."""
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"job-worker-{n}") for n in range(self._workers)
+        ]
+        logger.info("Started %s job workers", self._workers)
+
+    async def stop(self, drain_timeout: float = 0.0) -> None:
+        """
+        Stop the workers, letting running jobs finish for up to ``drain_timeout`` seconds.
+
+        Queued jobs stay in the backend for the next start (or another replica).
+        """
+        self._stopping = True
+        if not self._tasks:
+            return
+
+        # Idle workers are only waiting on the queue and can go right away
+        for task in self._tasks:
+            if task not in self._busy:
+                task.cancel()
+
+        busy = [task for task in self._tasks if task in self._busy]
+        if busy and drain_timeout > 0:
+            await asyncio.wait(busy, timeout=drain_timeout)
+        for task in busy:
+            if not task.done():
+                logger.warning("Cancelling a job still running at shutdown")
+                task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict[str, Any]:
+        """Worker and backend counters."""
+        return {
+            "workers": len(self._tasks),
+            "busy": len(self._busy),
+            "completed_total": self._completed,
+            "failed_total": self._failed,
+            **self._backend.stats(),
+        }
+
+    async def _work(self) -> None:
+        while not self._stopping:
+            try:
+                job = await self._backend.dequeue(timeout=self._poll_interval)
+            except Exception as e:
+                logger.error("Job queue unavailable: %s", e)
+                await asyncio.sleep(self._poll_interval)
+                continue
+
+            if job is not None:
+                task = asyncio.current_task()
+                assert task is not None  # Workers always run as tasks
+                self._busy.add(task)
+                try:
+                    await self._run(job)
+                finally:
+                    self._busy.discard(task)
+
+    async def _run(self, job: Job) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        await self._backend.save(job)
+
+        try:
+            result = await self._dispatch(job)
+            job.result = result.model_dump(mode="json")
+            job.status = JobStatus.SUCCEEDED
+            self._completed += 1
+        except Exception as e:
+            logger.warning("Job %s (%s) failed: %s", job.id, job.action, e)
+            job.error = _describe_error(e)
+            job.status = JobStatus.FAILED
+            self._failed += 1
+
+        job.finished_at = time.time()
+        await self._backend.save(job)
+        logger.info(
+            "Job %s %s in %.2fs",
+            job.id,
+            job.status.value,
+            job.finished_at - job.started_at,
+        )
+
+    async def _dispatch(self, job: Job) -> Any:
+        # Nobody is waiting on a connection, so jobs yield to interactive requests
+        # and wait out overload instead of failing
+        with priority_scope(Priority.BACKGROUND):
+            while True:
+                try:
+                    return await self._dispatcher.dispatch(job.to_command())
+                except ServiceOverloadedError as e:
+                    if self._stopping:
+                        raise
+                    delay = e.retry_after or self._poll_interval
+                    logger.info("Job %s not admitted, retrying in %.1fs", job.id, delay)
+                    await asyncio.sleep(delay)
+
+
+def _describe_error(error: Exception) -> dict[str, str]:
+    """Client-facing error type and message, without leaking internal details."""
+    if isinstance(error, ValidationError):
+        return {"type": "validation_error", "message": str(error)}
+    if isinstance(error, DomainError):
+        return {"type": "domain_error", "message": str(error)}
+    if isinstance(error, AIProviderError):
+        return {"type": "ai_provider_error", "message": "AI service temporarily unavailable"}
+    return {"type": "internal_error", "message": "An unexpected error occurred"}
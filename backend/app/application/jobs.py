@@ -0,0 +1,75 @@
+"""Asynchronous jobs wrapping commands whose results are collected later."""
+
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Any, Optional, Union
+
+from app.application.commands.explain_code_command import ExplainCodeCommand
+from app.application.commands.generate_tests_command import GenerateTestsCommand
+from app.application.commands.refactor_code_command import RefactorCodeCommand
+
+JobCommand = Union[ExplainCodeCommand, RefactorCodeCommand, GenerateTestsCommand]
+
+# Job actions and the commands they run; params are the command's fields
+JOB_COMMANDS: dict[str, type[JobCommand]] = {
+    "explain": ExplainCodeCommand,
+    "refactor": RefactorCodeCommand,
+    "tests": GenerateTestsCommand,
+}
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    @property
+    def finished(self) -> bool:
+        return self in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+@dataclass
+class Job:
+    """
+    A queued command and, once run, its result or error.
+
+    Jobs only hold JSON-serializable data so that any backend can store them.
+    """
+
+    id: str
+    action: str
+    params: dict[str, Any]
+    status: JobStatus = JobStatus.QUEUED
+    result: Optional[dict[str, Any]] = None
+    error: Optional[dict[str, str]] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @classmethod
+    def create(cls, action: str, params: dict[str, Any]) -> "Job":
+        """
+        Create a queued job for an action.
+
+        Raises:
+            ValueError: If the action is unknown
+        """
+        if action not in JOB_COMMANDS:
+            raise ValueError(f"Unknown job action '{action}'")
+        return cls(id=uuid.uuid4().hex, action=action, params=params)
+
+    def to_command(self) -> JobCommand:
+        """The command this job runs."""
+        return JOB_COMMANDS[self.action](**self.params)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "status": self.status.value}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Job":
+        return cls(**{**data, "status": JobStatus(data["status"])})
@@ -0,0 +1,51 @@
+"""Dispatcher middleware applying admission control to commands."""
+
+from typing import Any, AsyncIterator, Awaitable, Callable, Mapping, Optional, Type
+
+from app.application.admission import AdmissionController, Priority, current_priority
+from app.application.dispatch import Middleware
+
+
+class AdmissionMiddleware(Middleware):
+    """
+    Run commands only once admitted by an ``AdmissionController``.
+
+    The priority comes from an enclosing ``priority_scope`` when there is
+    one (batches and background jobs), otherwise from the command type.
+    A streamed command holds its slot until the stream ends.
+    """
+
+    def __init__(
+        self,
+        controller: AdmissionController,
+        command_priorities: Optional[Mapping[Type[Any], Priority]] = None,
+        default_priority: Priority = Priority.NORMAL,
+    ) -> None:
+        """
+        Initialize the admission middleware.
+
+        Args:
+            controller: Admission controller shared by all commands
+            command_priorities: Priority class per command type
+            default_priority: Priority of command types not listed
+        """
+        self._controller = controller
+        self._command_priorities = dict(command_priorities or {})
+        self._default_priority = default_priority
+
+    async def execute(self, command: Any, next_handler: Callable[[Any], Awaitable[Any]]) -> Any:
+        async with self._controller.admit(self._priority(command)):
+            return await next_handler(command)
+
+    async def execute_stream(
+        self, command: Any, next_stream: Callable[[Any], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        async with self._controller.admit(self._priority(command)):
+            async for chunk in next_stream(command):
+                yield chunk
+
+    def _priority(self, command: Any) -> Priority:
+        priority = current_priority()
+        if priority is None:
+            priority = self._command_priorities.get(type(command), self._default_priority)
+        return priority
@@ -0,0 +1,120 @@
+"""Dispatcher middleware serving repeated commands from a result cache."""
+
+import logging
+from typing import Any, Awaitable, Callable, Iterable, Optional, Sequence, Type
+
+from app.application.content_key import ContentKeyBuilder
+from app.application.dispatch import Middleware
+from app.application.dto.explain_result_dto import ExplainResultDTO
+from app.application.interfaces.distributed_lock import DistributedLock
+from app.application.interfaces.result_cache import ResultCache
+from app.domain.value_objects.code_snippet import CodeSnippet
+
+logger = logging.getLogger(__name__)
+
+
+class CachingMiddleware(Middleware):
+    """
+    Return cached results for commands whose content key was seen before.
+
+    Reformatted copies of a snippet can share a key, so fields of a cached
+    result that describe the request's own code are recomputed on a hit.
+
+    With a distributed lock, a miss takes the lock of its key before running
+    the command, so when replicas sharing the cache get the same command at
+    once, one computes it and the others wait and then read its result.
+    """
+
+    def __init__(
+        self,
+        cache: ResultCache,
+        key_builder: ContentKeyBuilder,
+        command_types: Optional[Iterable[Type[Any]]] = None,
+        ttl: Optional[float] = None,
+        lock: Optional[DistributedLock] = None,
+    ) -> None:
+        """
+        Initialize the caching middleware.
+
+        Args:
+            cache: Result cache backing the middleware
+            key_builder: Builds the content key of a command
+            command_types: Command types to cache; all commands when omitted
+            ttl: Time to live for stored results; the cache default when omitted
+            lock: Lock taken per content key on a miss; misses run unguarded when omitted
+        """
+        self._cache = cache
+        self._key_builder = key_builder
+        self._command_types = frozenset(command_types) if command_types else None
+        self._ttl = ttl
+        self._lock = lock
+
+    def applies_to(self, command_type: Type[Any]) -> bool:
+        return self._command_types is None or command_type in self._command_types
+
+    async def execute(self, command: Any, next_handler: Callable[[Any], Awaitable[Any]]) -> Any:
+        key = self._key_builder.build(command)
+        command_name = command.__class__.__name__
+
+        cached = await self._cache.get(key)
+        if cached is not None:
+            logger.info("Cache hit for %s", command_name)
+            return self._for_command(command, cached)
+
+        if self._lock is None:
+            return await self._compute(key, command, next_handler)
+
+        # On timeout, computing again beats failing the request
+        token = await self._lock.acquire(key)
+        try:
+            if token is not None:
+                # Whoever held the lock before may have just stored the result
+                cached = await self._cache.get(key)
+                if cached is not None:
+                    logger.info("Cache hit for %s after waiting for its lock", command_name)
+                    return self._for_command(command, cached)
+            return await self._compute(key, command, next_handler)
+        finally:
+            if token is not None:
+                await self._lock.release(key, token)
+
+    async def prefetch(self, commands: Sequence[Any]) -> None:
+        """
+        Look up the results of several commands at once.
+
+        Lets a cache behind a network fetch a whole batch in one round trip
+        and keep the results in memory for the commands' own lookups.
+
+        Args:
+            commands: Commands about to be dispatched
+        """
+        keys = [
+            self._key_builder.build(command)
+            for command in commands
+            if self.applies_to(type(command))
+        ]
+        if keys:
+            await self._cache.get_many(keys)
+
+    async def _compute(
+        self, key: str, command: Any, next_handler: Callable[[Any], Awaitable[Any]]
+    ) -> Any:
+        result = await next_handler(command)
+        await self._cache.set(key, result, self._ttl)
+        return result
+
+    @staticmethod
+    def _for_command(command: Any, cached: Any) -> Any:
+        """Recompute the fields of a cached result that describe the request's code."""
+        code = getattr(command, "code", None)
+        if not isinstance(cached, ExplainResultDTO) or not isinstance(code, str):
+            return cached
+        if not code.strip():
+            return cached
+        code_snippet = CodeSnippet(content=code)
+        return cached.model_copy(
+            update={
+                "line_count": code_snippet.line_count,
+                "character_count": code_snippet.character_count,
+            }
+        )
@@ -0,0 +1,62 @@
+"""Dispatcher middleware capping concurrent executions per command type."""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Mapping, Type
+
+from app.application.dispatch import Middleware
+
+
+class ConcurrencyMiddleware(Middleware):
+    """
+    Limit how many commands of a given type execute at once.
+
+    Unlike admission control, which bounds total work, this keeps one
+    expensive command type (e.g. test generation) from taking every slot.
+    Excess commands wait for their type's semaphore. A streamed command
+    counts until the stream ends.
+    """
+
+    def __init__(self, limits: Mapping[Type[Any], int]) -> None:
+        """
+        Initialize the concurrency middleware.
+
+        Args:
+            limits: Maximum concurrent executions per command type; types
+                not listed are not limited
+        """
+        self._limits = dict(limits)
+        self._semaphores = {
+            command_type: asyncio.Semaphore(limit) for command_type, limit in limits.items()
+        }
+        self._in_flight = {command_type: 0 for command_type in limits}
+
+    def applies_to(self, command_type: Type[Any]) -> bool:
+        return command_type in self._semaphores
+
+    async def execute(self, command: Any, next_handler: Callable[[Any], Awaitable[Any]]) -> Any:
+        command_type = type(command)
+        async with self._semaphores[command_type]:
+            self._in_flight[command_type] += 1
+            try:
+                return await next_handler(command)
+            finally:
+                self._in_flight[command_type] -= 1
+
+    async def execute_stream(
+        self, command: Any, next_stream: Callable[[Any], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        command_type = type(command)
+        async with self._semaphores[command_type]:
+            self._in_flight[command_type] += 1
+            try:
+                async for chunk in next_stream(command):
+                    yield chunk
+            finally:
+                self._in_flight[command_type] -= 1
+
+    def stats(self) -> dict[str, Any]:
+        """In-flight executions and limit per command type."""
+        return {
+            command_type.__name__: {"in_flight": in_flight, "limit": self._limits[command_type]}
+            for command_type, in_flight in self._in_flight.items()
+        }
@@ -0,0 +1,94 @@
+"""Dispatcher middleware reusing explanations of near-identical snippets."""
+
+import logging
+from typing import Any, Awaitable, Callable, Optional, Type
+
+from app.application.commands.explain_code_command import ExplainCodeCommand
+from app.application.content_key import ContentKeyBuilder
+from app.application.dispatch import Middleware
+from app.application.dto.explain_result_dto import ExplainResultDTO
+from app.application.interfaces.result_cache import ResultCache
+from app.application.interfaces.similarity_index import SimilarityIndex
+from app.domain.exceptions import ValidationError
+from app.domain.services.code_validation_service import CodeValidationService
+from app.domain.value_objects.code_snippet import CodeSnippet
+
+logger = logging.getLogger(__name__)
+
+
+class SimilarResultMiddleware(Middleware):
+    """
+    Serve explanations of near-identical past snippets to commands opting in.
+
+    Every explained snippet is added to a similarity index under its content
+    key. A command with ``accept_similar`` set is answered with the cached
+    result of the most similar indexed snippet, when one reaches
+    ``min_similarity`` and its result is still cached; the result carries the
+    similarity so clients can tell it apart from an exact one.
+
+    Must run outside the caching middleware, so approximate results are never
+    stored under the key of the snippet they were served for.
+    """
+
+    def __init__(
+        self,
+        cache: ResultCache,
+        index: SimilarityIndex,
+        key_builder: ContentKeyBuilder,
+        min_similarity: float = 0.75,
+    ) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            cache: Result cache holding the results of indexed snippets
+            index: Similarity index of explained snippets
+            key_builder: Builds the content key of a command
+            min_similarity: Lowest estimated similarity whose result is reused
+        """
+        self._cache = cache
+        self._index = index
+        self._key_builder = key_builder
+        self._min_similarity = min_similarity
+
+    def applies_to(self, command_type: Type[Any]) -> bool:
+        return command_type is ExplainCodeCommand
+
+    async def execute(self, command: Any, next_handler: Callable[[Any], Awaitable[Any]]) -> Any:
+        try:
+            code_snippet = CodeValidationService.create_code_snippet(command.code, command.language)
+        except ValidationError:
+            return await next_handler(command)
+
+        key = self._key_builder.build(command)
+        if command.accept_similar:
+            reused = await self._find_similar(key, code_snippet)
+            if reused is not None:
+                return reused
+
+        result = await next_handler(command)
+        self._index.add(key, code_snippet.content, code_snippet.language)
+        return result
+
+    async def _find_similar(
+        self, key: str, code_snippet: CodeSnippet
+    ) -> Optional[ExplainResultDTO]:
+        match = self._index.find(code_snippet.content, code_snippet.language, self._min_similarity)
+        # An exact match is left to the result cache
+        if match is None or match.key == key:
+            return None
+
+        cached = await self._cache.get(match.key)
+        if not isinstance(cached, ExplainResultDTO):
+            # Expired or evicted from the cache; the index entry is useless now
+            self._index.remove(match.key)
+            return None
+
+        logger.info("Reusing explanation of a snippet %.0f%% similar", match.similarity * 100)
+        return cached.model_copy(
+            update={
+                "line_count": code_snippet.line_count,
+                "character_count": code_snippet.character_count,
+                "similarity": match.similarity,
+            }
+        )
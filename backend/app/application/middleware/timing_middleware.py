@@ -0,0 +1,107 @@
+"""Dispatcher middleware recording per-command execution times."""
+
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from app.application.dispatch import Middleware
+
+logger = logging.getLogger(__name__)
+
+# Called with (command name, duration in seconds, whether the command failed)
+TimingObserver = Callable[[str, float, bool], None]
+
+
+class _CommandTimings:
+    def __init__(self, window: int) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.recent: deque[float] = deque(maxlen=window)
+
+    def record(self, duration: float, failed: bool) -> None:
+        self.count += 1
+        self.errors += failed
+        self.total_seconds += duration
+        self.recent.append(duration)
+
+    def stats(self) -> dict[str, Any]:
+        recent = sorted(self.recent)
+
+        def percentile(fraction: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(int(fraction * len(recent)), len(recent) - 1)] * 1000
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": self.total_seconds / self.count * 1000 if self.count else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+        }
+
+
+class TimingMiddleware(Middleware):
+    """
+    Time every dispatched command, per command type.
+
+    Keeps totals plus the durations of the last ``window`` executions of
+    each command type, from which recent percentiles are reported. A streamed
+    command is timed until its stream ends.
+    """
+
+    def __init__(
+        self,
+        window: int = 1000,
+        clock: Callable[[], float] = time.perf_counter,
+        observer: Optional[TimingObserver] = None,
+    ) -> None:
+        """
+        Initialize the timing middleware.
+
+        Args:
+            window: Recent executions per command type kept for percentiles
+            clock: High-resolution clock, injectable for tests
+            observer: Also receives every timing, e.g. to export it as a metric
+        """
+        self._clock = clock
+        self._observer = observer
+        self._timings: defaultdict[str, _CommandTimings] = defaultdict(
+            lambda: _CommandTimings(window)
+        )
+
+    async def execute(self, command: Any, next_handler: Callable[[Any], Awaitable[Any]]) -> Any:
+        started = self._clock()
+        failed = True
+        try:
+            result = await next_handler(command)
+            failed = False
+            return result
+        finally:
+            self._record(command.__class__.__name__, started, failed)
+
+    async def execute_stream(
+        self, command: Any, next_stream: Callable[[Any], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        started = self._clock()
+        failed = True
+        try:
+            async for chunk in next_stream(command):
+                yield chunk
+            failed = False
+        finally:
+            self._record(command.__class__.__name__, started, failed)
+
+    def _record(self, command_name: str, started: float, failed: bool) -> None:
+        duration = self._clock() - started
+        self._timings[command_name].record(duration, failed)
+        if self._observer is not None:
+            self._observer(command_name, duration, failed)
+        logger.debug("Command %s took %.2fms", command_name, duration * 1000)
+
+    def stats(self) -> dict[str, Any]:
+        """Execution count, errors and latency percentiles per command type."""
+        return {name: timings.stats() for name, timings in self._timings.items()}
@@ -0,0 +1,93 @@
+"""Coalescing of identical concurrent calls ("single flight")."""
+
+import asyncio
+import contextvars
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Dict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Flight:
+    task: "asyncio.Task[Any]"
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time and share its outcome.
+
+    Callers arriving while a call for the same key is in flight await the
+    same task instead of starting a new one. Each caller waits through
+    ``asyncio.shield``, so a caller being cancelled (e.g. its client
+    disconnected) does not cancel the shared call for the others. The shared
+    call is only cancelled once every caller waiting on it has gone away.
+
+    The shared call runs in an empty context rather than the first caller's,
+    so it is not bound by that caller's request deadline, correlation ID or
+    admission priority; each caller still stops waiting at its own deadline.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[str, _Flight] = {}
+        self._started = 0
+        self._coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """
+        Run ``fn`` for ``key``, or join the call already in flight for it.
+
+        Args:
+            key: Identity of the call; equal keys must mean interchangeable results
+            fn: Coroutine factory performing the call
+
+        Returns:
+            The shared call's result
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            task = asyncio.get_running_loop().create_task(fn(), context=contextvars.Context())
+            flight = _Flight(task=task)
+            self._flights[key] = flight
+
+            def forget(_: "asyncio.Task[Any]", shared: _Flight = flight) -> None:
+                self._forget(key, shared)
+
+            task.add_done_callback(forget)
+            self._started += 1
+        else:
+            self._coalesced += 1
+            logger.debug("Joining in-flight call")
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody is left waiting for the result; stop paying for it
+                flight.task.cancel()
+                self._forget(key, flight)
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running."""
+        return len(self._flights)
+
+    def stats(self) -> dict[str, int]:
+        """Counters of started and coalesced calls."""
+        return {
+            "in_flight": len(self._flights),
+            "started": self._started,
+            "coalesced": self._coalesced,
+        }
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -31,6 +31,30 @@ class AIProviderQuotaError(AIProviderError):
     pass
 
 
+class AIProviderRateLimitError(AIProviderQuotaError):
+    """Raised when a request would exceed the configured upstream rate budget."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+class AIProviderUnavailableError(AIProviderError):
+    """Raised without calling the AI provider while it is known to be unhealthy."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+class ServiceOverloadedError(Exception):
+    """Raised when the service sheds load instead of queueing more work."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
 class CodeTooLargeError(ValidationError):
     """Raised when code exceeds maximum allowed size."""
 
@@ -0,0 +1,199 @@
+"""Code canonicalization domain service."""
+
+import ast
+import hashlib
+import re
+from functools import lru_cache
+from typing import Optional
+
+# Languages by line comment syntax: ``#``, ``--``, ``//`` (with ``/* */``), or block only
+_HASH_COMMENT_LANGUAGES = frozenset(
+    "python py python3 ruby rb shell sh bash zsh perl r yaml yml toml powershell makefile "
+    "dockerfile elixir julia nim coffeescript".split()
+)
+_DASH_COMMENT_LANGUAGES = frozenset("sql haskell lua".split())
+_SLASH_COMMENT_LANGUAGES = frozenset(
+    "c cpp c++ csharp c# cs java javascript js jsx typescript ts tsx go golang rust rs swift "
+    "kotlin kt scala dart php groovy objective-c objc zig".split()
+)
+_BLOCK_COMMENT_LANGUAGES = frozenset("css scss less".split())
+# Line structure and indentation carry meaning in these
+_INDENTATION_LANGUAGES = frozenset(
+    "python py python3 yaml yml haskell coffeescript nim makefile".split()
+)
+_PYTHON_LANGUAGES = frozenset("python py python3".split())
+
+_STRING = "|".join(
+    [
+        r'"""[\s\S]*?"""',
+        r"'''[\s\S]*?'''",
+        r'"(?:\\.|[^"\\\n])*"',
+        r"'(?:\\.|[^'\\\n])*'",
+        r"`(?:\\.|[^`\\])*`",
+    ]
+)
+_COMMENTS = {
+    "hash": r"#[^\n]*",
+    "dash": r"--[^\n]*",
+    "slash": r"//[^\n]*|/\*[\s\S]*?\*/",
+    "block": r"/\*[\s\S]*?\*/",
+}
+# Words first: the most common token, and neither strings nor comments start with one
+_TOKEN = r"(?P<word>\w+)|(?P<string>{string})|(?P<comment>{comment})|(?P<symbol>\S)"
+_OPERATOR_CHARS = frozenset("+-*/%&|<>=!^~.:?")
+
+
+class CodeCanonicalizationService:
+    """Domain service for reducing code to a formatting-insensitive canonical form."""
+
+    @staticmethod
+    def canonical_form(code: str, language: Optional[str] = None) -> str:
+        """
+        Reduce code to a form that ignores formatting and comments.
+
+        Python (or code without a language hint that parses as Python) is
+        reduced to a dump of its AST without positions. Anything else is
+        reduced to its token stream: comments of the language are dropped,
+        string literals are kept verbatim and whitespace between tokens is
+        dropped where it cannot change tokenization. Indentation-sensitive
+        languages keep one line per source line, indented by nesting depth,
+        with runs of spaces within a line collapsed to one.
+
+        Args:
+            code: The code to canonicalize
+            language: Normalized language hint, if any
+
+        Returns:
+            The canonical form; equal for code differing only in whitespace,
+            indentation style, blank lines or comments
+        """
+        if language is None or language in _PYTHON_LANGUAGES:
+            dump = CodeCanonicalizationService.python_ast_dump(code)
+            if dump is not None:
+                return "ast:" + dump
+        return "tokens:" + _token_form(code, language)
+
+    @staticmethod
+    def fingerprint(code: str, language: Optional[str] = None) -> str:
+        """
+        Stable hex digest of the canonical form of code.
+
+        Args:
+            code: The code to fingerprint
+            language: Normalized language hint, if any
+
+        Returns:
+            SHA-256 hex digest of the canonical form
+        """
+        return _fingerprint(code, language)
+
+    @staticmethod
+    def tokens(code: str, language: Optional[str] = None) -> list[str]:
+        """
+        Split code into tokens, without comments or whitespace.
+
+        Args:
+            code: The code to tokenize
+            language: Normalized language hint, if any
+
+        Returns:
+            Words, string literals and single symbols, in source order
+        """
+        pattern = _token_pattern(_comment_style(language))
+        return [match.group() for match in pattern.finditer(code) if match.lastgroup != "comment"]
+
+    @staticmethod
+    def python_ast_dump(code: str) -> Optional[str]:
+        """
+        Dump of the Python AST of ``code``, without positions.
+
+        Args:
+            code: Python source to parse
+
+        Returns:
+            The dump, or None if the code is not valid Python or nests too deeply
+            to parse
+        """
+        try:
+            tree = ast.parse(code)
+            return ast.dump(tree, annotate_fields=False, include_attributes=False)
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            return None
+
+
+# Keys are built more than once per request (ETag, result cache), each parse of up to 50k chars
+@lru_cache(maxsize=64)
+def _fingerprint(code: str, language: Optional[str]) -> str:
+    canonical = CodeCanonicalizationService.canonical_form(code, language)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _token_pattern(comment_style: Optional[str]) -> "re.Pattern[str]":
+    comment = _COMMENTS.get(comment_style or "", r"(?!)")  # (?!) never matches
+    return re.compile(_TOKEN.format(string=_STRING, comment=comment))
+
+
+def _comment_style(language: Optional[str]) -> Optional[str]:
+    if language in _HASH_COMMENT_LANGUAGES:
+        return "hash"
+    if language in _DASH_COMMENT_LANGUAGES:
+        return "dash"
+    if language in _SLASH_COMMENT_LANGUAGES:
+        return "slash"
+    if language in _BLOCK_COMMENT_LANGUAGES:
+        return "block"
+    # Unknown syntax: ``//`` or ``#`` may not be comments, so keep everything
+    return None
+
+
+def _token_form(code: str, language: Optional[str]) -> str:
+    pattern = _token_pattern(_comment_style(language))
+    code = code.replace("\r\n", "\n").replace("\r", "\n")
+    if language not in _INDENTATION_LANGUAGES:
+        return _join_tokens(pattern, code)
+
+    lines = []
+    indents = [0]
+    for line in code.split("\n"):
+        # Spacing can be significant too (``- x`` is a YAML list item, ``-x`` a string)
+        tokens = _join_tokens(pattern, line, keep_spacing=True)
+        if not tokens:
+            continue
+        width = len(line[: len(line) - len(line.lstrip())].expandtabs(8))
+        while width < indents[-1]:
+            indents.pop()
+        if width > indents[-1]:
+            indents.append(width)
+        lines.append(f"{len(indents) - 1}|{tokens}")
+    return "\n".join(lines)
+
+
+def _join_tokens(pattern: "re.Pattern[str]", code: str, keep_spacing: bool = False) -> str:
+    parts: list[str] = []
+    previous: Optional[str] = None
+    previous_end = 0
+    for match in pattern.finditer(code):
+        if match.lastgroup == "comment":
+            continue
+        token = match.group()
+        separated = match.start() > previous_end
+        if previous is not None and (
+            separated if keep_spacing else _needs_space(previous, token, separated)
+        ):
+            parts.append(" ")
+        parts.append(token)
+        previous, previous_end = token, match.end()
+    return "".join(parts)
+
+
+def _needs_space(previous: str, token: str, separated: bool) -> bool:
+    """Whether a space must separate two tokens to keep them apart."""
+    if _is_word(previous[-1]) and _is_word(token[0]):
+        return True
+    # ``a - -b`` is not ``a--b``; ``) (`` and ``)(`` are the same
+    return separated and previous[-1] in _OPERATOR_CHARS and token[0] in _OPERATOR_CHARS
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == "_"
@@ -0,0 +1,192 @@
+"""Code chunking domain service."""
+
+import ast
+import re
+from typing import Optional, Sequence
+
+from app.domain.value_objects.code_chunk import CodeChunk
+
+# Definition keywords of common brace and indentation languages, for naming heuristic units
+_DEFINITION_PATTERN = re.compile(
+    r"\b(?:class|def|fn|func|function|interface|struct|enum|impl|trait|module|object)"
+    r"\s+([A-Za-z_$][\w$]*)"
+)
+PYTHON_LANGUAGES = ("python", "py", "python3")
+
+
+class CodeChunkingService:
+    """Domain service for splitting code into parts at definition boundaries."""
+
+    @staticmethod
+    def split_units(code: str, language: Optional[str] = None) -> list[CodeChunk]:
+        """
+        Split code into its top-level units.
+
+        Python code (or code without a language hint that parses as Python)
+        is split with the AST: every top-level function and class is a unit,
+        and each run of other statements is one more. Other languages are
+        split heuristically at unindented lines outside any brace block that
+        follow a blank line. Blank lines and comments before a unit belong to
+        it, so the units' contents concatenate back to ``code``.
+
+        Args:
+            code: The code to split
+            language: Normalized language hint, if any
+
+        Returns:
+            The units in source order
+        """
+        lines = code.splitlines(keepends=True)
+        if not lines:
+            return []
+
+        units = None
+        if language is None or language in PYTHON_LANGUAGES:
+            units = CodeChunkingService._python_units(code, lines)
+        if units is None:
+            units = CodeChunkingService._heuristic_units(lines)
+        return units
+
+    @staticmethod
+    def split(
+        code: str, language: Optional[str], max_chunk_chars: int, pack: bool = True
+    ) -> list[CodeChunk]:
+        """
+        Split code into chunks of at most ``max_chunk_chars`` characters.
+
+        Adjacent units are packed together while they fit; a unit larger than
+        the limit is cut between lines. Only a single line longer than the
+        limit yields a larger chunk.
+
+        Args:
+            code: The code to split
+            language: Normalized language hint, if any
+            max_chunk_chars: Largest chunk size to aim for
+            pack: Pack adjacent units into one chunk; without packing, an edit
+                to one unit leaves every other chunk unchanged
+
+        Returns:
+            The chunks in source order
+        """
+        chunks: list[CodeChunk] = []
+        pending: list[CodeChunk] = []
+        pending_chars = 0
+
+        for unit in CodeChunkingService.split_units(code, language):
+            for piece in _cut(unit, max_chunk_chars):
+                full = pending_chars + len(piece.content) > max_chunk_chars
+                if pending and (full or not pack):
+                    chunks.append(_merge(pending))
+                    pending, pending_chars = [], 0
+                pending.append(piece)
+                pending_chars += len(piece.content)
+
+        if pending:
+            chunks.append(_merge(pending))
+        return chunks
+
+    @staticmethod
+    def _python_units(code: str, lines: list[str]) -> Optional[list[CodeChunk]]:
+        """Units at top-level definitions, or None if the code cannot be parsed as Python."""
+        try:
+            tree = ast.parse(code)
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            # Deeply nested expressions exhaust the parser's stack
+            return None
+
+        # (last line, name) of each unit; consecutive plain statements share one
+        ends: list[tuple[int, Optional[str]]] = []
+        for node in tree.body:
+            end_line = node.end_lineno or node.lineno
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                ends.append((end_line, node.name))
+            elif ends and ends[-1][1] is None:
+                ends[-1] = (end_line, None)
+            else:
+                ends.append((end_line, None))
+
+        if not ends:
+            return [_chunk(lines, 1, len(lines), ())]
+
+        # Trailing blank lines and comments go to the last unit
+        ends[-1] = (len(lines), ends[-1][1])
+        units = []
+        start = 1
+        for end_line, name in ends:
+            units.append(_chunk(lines, start, end_line, (name,) if name else ()))
+            start = end_line + 1
+        return units
+
+    @staticmethod
+    def _heuristic_units(lines: list[str]) -> list[CodeChunk]:
+        """Units starting at unindented lines outside braces after a blank line."""
+        starts = [1]
+        depth = 0
+        previous_blank = False
+        for number, line in enumerate(lines, start=1):
+            blank = not line.strip()
+            if number > 1 and previous_blank and not blank and depth == 0 and not line[0].isspace():
+                starts.append(number)
+            depth = max(depth + line.count("{") - line.count("}"), 0)
+            previous_blank = blank
+
+        units = []
+        for start, end in zip(starts, [s - 1 for s in starts[1:]] + [len(lines)]):
+            match = _DEFINITION_PATTERN.search(_first_code_line(lines, start, end))
+            units.append(_chunk(lines, start, end, (match.group(1),) if match else ()))
+        return units
+
+
+def _chunk(lines: Sequence[str], start: int, end: int, names: tuple[str, ...]) -> CodeChunk:
+    return CodeChunk(
+        content="".join(lines[start - 1 : end]), start_line=start, end_line=end, names=names
+    )
+
+
+def _first_code_line(lines: Sequence[str], start: int, end: int) -> str:
+    for line in lines[start - 1 : end]:
+        stripped = line.strip()
+        if stripped and not stripped.startswith(("//", "#", "/*", "*")):
+            return line
+    return ""
+
+
+def _cut(unit: CodeChunk, max_chars: int) -> list[CodeChunk]:
+    """Cut a unit larger than ``max_chars`` between lines."""
+    if len(unit.content) <= max_chars:
+        return [unit]
+
+    lines = unit.content.splitlines(keepends=True)
+    pieces = []
+    start = 0
+    size = 0
+    for index, line in enumerate(lines):
+        if index > start and size + len(line) > max_chars:
+            pieces.append((start, index))
+            start, size = index, 0
+        size += len(line)
+    pieces.append((start, len(lines)))
+
+    return [
+        CodeChunk(
+            content="".join(lines[first:last]),
+            start_line=unit.start_line + first,
+            end_line=unit.start_line + last - 1,
+            names=unit.names,
+        )
+        for first, last in pieces
+    ]
+
+
+def _merge(chunks: Sequence[CodeChunk]) -> CodeChunk:
+    if len(chunks) == 1:
+        return chunks[0]
+    names: list[str] = []
+    for chunk in chunks:
+        names.extend(name for name in chunk.names if name not in names)
+    return CodeChunk(
+        content="".join(chunk.content for chunk in chunks),
+        start_line=chunks[0].start_line,
+        end_line=chunks[-1].end_line,
+        names=tuple(names),
+    )
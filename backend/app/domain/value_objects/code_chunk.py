@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CodeChunk:
+    """Domain entity representing a contiguous part of a larger code snippet."""
+
+    content: str
+    start_line: int  # 1-based, inclusive
+    end_line: int  # 1-based, inclusive
+    names: tuple[str, ...] = ()  # Functions and classes defined in the chunk
+
+    def __post_init__(self) -> None:
+        if self.start_line < 1 or self.end_line < self.start_line:
+            raise ValueError("Chunk line range is invalid")
+
+    @property
+    def label(self) -> str:
+        """Human-readable position of the chunk, e.g. ``Lines 10-42 (`Parser`)``."""
+        label = f"Lines {self.start_line}-{self.end_line}"
+        if self.names:
+            label += " (" + ", ".join(f"`{name}`" for name in self.names) + ")"
+        return label
@@ -0,0 +1,183 @@
+"""Circuit breaker failing fast while the upstream AI service is degraded."""
+
+import logging
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable
+
+from app.domain.exceptions import AIProviderUnavailableError
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """States of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Count-based sliding-window circuit breaker.
+
+    While closed, the outcome and latency of the last ``window_size`` calls
+    are recorded. Once at least ``minimum_calls`` are recorded and either the
+    failure rate or the slow-call rate reaches its threshold, the circuit
+    opens and calls fail immediately with ``AIProviderUnavailableError``.
+    After ``open_duration`` seconds it lets ``half_open_max_calls`` probe
+    calls through: if they all succeed it closes again, any failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: float = 20.0,
+        slow_call_rate_threshold: float = 0.8,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        open_duration: float = 30.0,
+        half_open_max_calls: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_rate_threshold: Failure ratio (0-1) that opens the circuit
+            slow_call_duration: Seconds above which a call counts as slow
+            slow_call_rate_threshold: Slow-call ratio (0-1) that opens the circuit
+            window_size: Number of recent calls considered
+            minimum_calls: Calls required before rates are evaluated
+            open_duration: Seconds to stay open before probing
+            half_open_max_calls: Probe calls allowed while half-open
+            clock: Monotonic clock, injectable for tests
+        """
+        self._failure_rate_threshold = failure_rate_threshold
+        self._slow_call_duration = slow_call_duration
+        self._slow_call_rate_threshold = slow_call_rate_threshold
+        self._minimum_calls = minimum_calls
+        self._open_duration = open_duration
+        self._half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        # (failed, slow) per recorded call
+        self._window: deque[tuple[bool, bool]] = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._half_open_permits = 0
+        self._half_open_successes = 0
+        self._rejected = 0
+        self._opened_count = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once the open period elapsed."""
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self._open_duration
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def before_call(self) -> None:
+        """
+        Admit a call or fail fast.
+
+        Raises:
+            AIProviderUnavailableError: If the circuit is open, or half-open
+                with all probe permits taken
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return
+
+        if state == CircuitState.HALF_OPEN and self._half_open_permits > 0:
+            self._half_open_permits -= 1
+            return
+
+        self._rejected += 1
+        raise AIProviderUnavailableError(
+            "AI provider circuit is open", retry_after=self._retry_after()
+        )
+
+    def record_success(self, duration: float) -> None:
+        """Record a call that got a response from the upstream."""
+        slow = duration >= self._slow_call_duration
+        if self._state == CircuitState.HALF_OPEN:
+            if slow:
+                self._trip("slow probe call")
+                return
+            self._half_open_successes += 1
+            if self._half_open_successes >= self._half_open_max_calls:
+                self._transition(CircuitState.CLOSED)
+            return
+
+        self._record(failed=False, slow=slow)
+
+    def record_failure(self, duration: float) -> None:
+        """Record a call that failed because the upstream is unhealthy."""
+        if self._state == CircuitState.HALF_OPEN:
+            self._trip("failed probe call")
+            return
+
+        self._record(failed=True, slow=duration >= self._slow_call_duration)
+
+    def release(self) -> None:
+        """Return a probe permit for a call that ended without an outcome (e.g. cancelled)."""
+        if self._state == CircuitState.HALF_OPEN:
+            self._half_open_permits = min(self._half_open_permits + 1, self._half_open_max_calls)
+
+    def stats(self) -> dict[str, Any]:
+        """State and window rates for health checks."""
+        failure_rate, slow_rate = self._rates()
+        return {
+            "state": self.state.value,
+            "failure_rate": failure_rate,
+            "slow_call_rate": slow_rate,
+            "window_calls": len(self._window),
+            "rejected_total": self._rejected,
+            "opened_total": self._opened_count,
+            "retry_after": self._retry_after() if self._state == CircuitState.OPEN else None,
+        }
+
+    def _record(self, failed: bool, slow: bool) -> None:
+        self._window.append((failed, slow))
+        if len(self._window) < self._minimum_calls:
+            return
+
+        failure_rate, slow_rate = self._rates()
+        if failure_rate >= self._failure_rate_threshold:
+            self._trip(f"failure rate {failure_rate:.0%}")
+        elif slow_rate >= self._slow_call_rate_threshold:
+            self._trip(f"slow call rate {slow_rate:.0%}")
+
+    def _rates(self) -> tuple[float, float]:
+        if not self._window:
+            return 0.0, 0.0
+        calls = len(self._window)
+        failures = sum(1 for failed, _ in self._window if failed)
+        slow = sum(1 for _, is_slow in self._window if is_slow)
+        return failures / calls, slow / calls
+
+    def _trip(self, reason: str) -> None:
+        logger.warning("Opening AI provider circuit: %s", reason)
+        self._opened_count += 1
+        self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState) -> None:
+        if state != self._state:
+            logger.info("AI provider circuit %s -> %s", self._state.value, state.value)
+        self._state = state
+        if state == CircuitState.OPEN:
+            self._opened_at = self._clock()
+        elif state == CircuitState.HALF_OPEN:
+            self._half_open_permits = self._half_open_max_calls
+            self._half_open_successes = 0
+        else:
+            self._window.clear()
+
+    def _retry_after(self) -> float:
+        return max(self._open_duration - (self._clock() - self._opened_at), 0.0)
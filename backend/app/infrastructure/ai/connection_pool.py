@@ -0,0 +1,125 @@
+"""HTTP connection pool configuration and monitoring for AI providers."""
+
+import asyncio
+import importlib.util
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """Whether the optional ``h2`` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class ConnectionPoolConfig:
+    """
+    Connection pool limits for the upstream HTTP client.
+
+    Attributes:
+        max_connections: Maximum concurrent connections; further requests queue
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry: Seconds an idle connection is kept before closing
+        http2: Negotiate HTTP/2 (multiplexes requests over fewer connections);
+            requires the ``h2`` package (``pip install httpx[http2]``)
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+    def limits(self) -> httpx.Limits:
+        """httpx pool limits for this configuration."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def use_http2(self) -> bool:
+        """Whether HTTP/2 is requested and can actually be used."""
+        if self.http2 and not http2_available():
+            logger.warning("HTTP/2 requested but the 'h2' package is missing, using HTTP/1.1")
+            return False
+        return self.http2
+
+
+class PoolMonitor:
+    """
+    Tracks requests in flight against a connection pool.
+
+    A request counts as saturated when it starts while every pool connection
+    is already busy, i.e. when it has to queue inside httpx for a connection.
+    """
+
+    def __init__(self, config: ConnectionPoolConfig) -> None:
+        self._config = config
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._total = 0
+        self._saturated = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently holding or waiting for a connection."""
+        return self._in_flight
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Count a request as in flight for the duration of the block."""
+        if self._in_flight >= self._config.max_connections:
+            self._saturated += 1
+        self._in_flight += 1
+        self._total += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.set()
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """
+        Wait until no request is in flight.
+
+        Returns:
+            True if the pool drained within ``timeout`` seconds
+        """
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def stats(self, client: Optional[httpx.AsyncClient] = None) -> dict[str, Any]:
+        """Pool usage counters, plus live connection counts when available."""
+        stats: dict[str, Any] = {
+            "max_connections": self._config.max_connections,
+            "max_keepalive_connections": self._config.max_keepalive_connections,
+            "http2": self._config.http2,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "queued": max(self._in_flight - self._config.max_connections, 0),
+            "requests_total": self._total,
+            "saturated_total": self._saturated,
+        }
+
+        # httpx does not expose pool state publicly; read httpcore's if reachable
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            stats["open_connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for c in connections if c.is_idle())
+
+        return stats
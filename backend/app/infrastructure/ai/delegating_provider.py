@@ -0,0 +1,81 @@
+"""Base class for AI providers that decorate another provider."""
+
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from app.application.interfaces.ai_provider import AIProvider
+from app.domain.value_objects.code_chunk import CodeChunk
+from app.domain.value_objects.code_explanation import CodeExplanation
+from app.domain.value_objects.code_refactor import CodeRefactor
+from app.domain.value_objects.code_snippet import CodeSnippet
+from app.domain.value_objects.test_scaffold import TestScaffold
+
+
+class DelegatingAIProvider(AIProvider):
+    """
+    AI provider forwarding every call to a wrapped provider.
+
+    Decorators (coalescing, routing, ...) subclass this and override only the
+    calls they change.
+    """
+
+    def __init__(self, inner: AIProvider) -> None:
+        """
+        Initialize the decorator.
+
+        Args:
+            inner: The provider to forward calls to
+        """
+        self._inner = inner
+
+    @property
+    def inner(self) -> AIProvider:
+        """The wrapped provider."""
+        return self._inner
+
+    @property
+    def provider_name(self) -> str:
+        """Name of the wrapped provider."""
+        return self._inner.provider_name
+
+    async def explain_code(self, code_snippet: CodeSnippet) -> CodeExplanation:
+        return await self._inner.explain_code(code_snippet)
+
+    async def refactor_code(
+        self, code_snippet: CodeSnippet, goal: Optional[str] = None
+    ) -> CodeRefactor:
+        return await self._inner.refactor_code(code_snippet, goal)
+
+    async def generate_tests(
+        self, code_snippet: CodeSnippet, test_framework: Optional[str] = None
+    ) -> TestScaffold:
+        return await self._inner.generate_tests(code_snippet, test_framework)
+
+    async def summarize_explanations(
+        self, code_snippet: CodeSnippet, sections: Sequence[tuple[CodeChunk, str]]
+    ) -> CodeExplanation:
+        return await self._inner.summarize_explanations(code_snippet, sections)
+
+    async def stream_explain_code(self, code_snippet: CodeSnippet) -> AsyncIterator[str]:
+        async for chunk in self._inner.stream_explain_code(code_snippet):
+            yield chunk
+
+    async def stream_refactor_code(
+        self, code_snippet: CodeSnippet, goal: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        async for chunk in self._inner.stream_refactor_code(code_snippet, goal):
+            yield chunk
+
+    async def stream_generate_tests(
+        self, code_snippet: CodeSnippet, test_framework: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        async for chunk in self._inner.stream_generate_tests(code_snippet, test_framework):
+            yield chunk
+
+    async def warm_up(self) -> None:
+        await self._inner.warm_up()
+
+    async def close(self, drain_timeout: float = 0.0) -> None:
+        await self._inner.close(drain_timeout)
+
+    def stats(self) -> dict[str, Any]:
+        return self._inner.stats()
@@ -0,0 +1,217 @@
+"""In-process fake AI provider for development, load testing and benchmarking."""
+
+import asyncio
+import random
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Sequence
+
+from app.application.interfaces.ai_provider import AIProvider
+from app.domain.exceptions import (
+    AIProviderError,
+    AIProviderRateLimitError,
+    AIProviderTimeoutError,
+)
+from app.domain.value_objects.code_chunk import CodeChunk
+from app.domain.value_objects.code_explanation import CodeExplanation
+from app.domain.value_objects.code_refactor import CodeRefactor
+from app.domain.value_objects.code_snippet import CodeSnippet
+from app.domain.value_objects.test_scaffold import TestScaffold
+from app.infrastructure.ai.fault_injection import (
+    RATE_LIMITED,
+    SERVER_ERROR,
+    TIMEOUT,
+    FaultInjector,
+)
+from app.infrastructure.ai.latency_models import FixedLatency, LatencyModel
+
+
+class FakeAIProvider(AIProvider):
+    """
+    Deterministic stand-in for a real AI provider, without network access.
+
+    Each call waits for a latency drawn from the configured distribution and
+    returns canned content derived from the snippet. Streaming calls wait the
+    sampled latency before the first token, then emit words at
+    ``tokens_per_second``. Rate limit errors (429), server errors (5xx) and
+    timeouts are injected at the configured rates. With a seed, the sequence
+    of latencies and faults is reproducible.
+
+    Faults are raised as the domain exceptions ``OpenAIProvider`` raises once
+    its own retries give up, so this fake exercises the layers above the
+    provider (routing, single flight, caching, admission). To exercise the
+    provider's retries, circuit breaker and rate budget too, serve
+    ``OpenAIProvider`` from a ``FakeOpenAITransport`` instead.
+    """
+
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        tokens_per_second: float = 50.0,
+        error_rate_429: float = 0.0,
+        error_rate_5xx: float = 0.0,
+        timeout_rate: float = 0.0,
+        timeout_seconds: float = 0.0,
+        seed: Optional[int] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        """
+        Initialize the fake provider.
+
+        Args:
+            latency: Time to first token (or full response) distribution; 0s when omitted
+            tokens_per_second: Streaming rate after the first token
+            error_rate_429: Fraction of calls failing with a rate limit error
+            error_rate_5xx: Fraction of calls failing with a server error
+            timeout_rate: Fraction of calls timing out
+            timeout_seconds: How long a timing-out call hangs before failing
+            seed: Random seed for reproducible latencies and faults
+            sleep: Sleep function, injectable for tests
+        """
+        self._latency = latency or FixedLatency(0.0)
+        self._tokens_per_second = tokens_per_second
+        self._timeout_seconds = timeout_seconds
+        self._rng = random.Random(seed)
+        self._faults = FaultInjector(self._rng, error_rate_429, error_rate_5xx, timeout_rate)
+        self._sleep = sleep
+        self._calls = 0
+
+    @property
+    def provider_name(self) -> str:
+        """Return the provider name."""
+        return "fake"
+
+    def stats(self) -> dict[str, Any]:
+        """Call and injected fault counters."""
+        return {"fake": {"calls": self._calls, "injected_faults": self._faults.counts()}}
+
+    async def explain_code(self, code_snippet: CodeSnippet) -> CodeExplanation:
+        """Return a canned explanation after a simulated delay."""
+        await self._simulate_call()
+        return CodeExplanation(
+            snippet=code_snippet,
+            explanation=self._explanation_text(code_snippet),
+            provider=self.provider_name,
+            is_placeholder=True,
+        )
+
+    async def refactor_code(
+        self, code_snippet: CodeSnippet, goal: Optional[str] = None
+    ) -> CodeRefactor:
+        """Return the snippet unchanged as a canned refactoring after a simulated delay."""
+        await self._simulate_call()
+        return CodeRefactor(
+            original_snippet=code_snippet,
+            refactored_code=code_snippet.content,
+            explanation=self._refactor_text(code_snippet, goal),
+            improvements=["Improved code structure", "Enhanced readability"],
+            provider=self.provider_name,
+            is_placeholder=True,
+        )
+
+    async def generate_tests(
+        self, code_snippet: CodeSnippet, test_framework: Optional[str] = None
+    ) -> TestScaffold:
+        """Return a canned test scaffold after a simulated delay."""
+        await self._simulate_call()
+        framework = test_framework or "pytest"
+        return TestScaffold(
+            original_snippet=code_snippet,
+            test_code=self._test_code(framework),
+            test_framework=framework,
+            test_cases=["test_basic_functionality", "test_edge_cases"],
+            setup_instructions=None,
+            provider=self.provider_name,
+            is_placeholder=True,
+        )
+
+    async def summarize_explanations(
+        self, code_snippet: CodeSnippet, sections: Sequence[tuple[CodeChunk, str]]
+    ) -> CodeExplanation:
+        """Return a canned overview of the chunks after a simulated delay."""
+        await self._simulate_call()
+        return CodeExplanation(
+            snippet=code_snippet,
+            explanation=(
+                f"## Overview\n\nThis {code_snippet.language or 'code'} snippet spans "
+                f"{code_snippet.line_count} lines, explained in {len(sections)} parts. "
+                "This is a placeholder summary generated by the fake AI provider."
+            ),
+            provider=self.provider_name,
+            is_placeholder=True,
+        )
+
+    async def stream_explain_code(self, code_snippet: CodeSnippet) -> AsyncIterator[str]:
+        """Stream a canned explanation at the configured token rate."""
+        async for chunk in self._stream(self._explanation_text(code_snippet)):
+            yield chunk
+
+    async def stream_refactor_code(
+        self, code_snippet: CodeSnippet, goal: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Stream a canned refactoring response at the configured token rate."""
+        async for chunk in self._stream(self._refactor_text(code_snippet, goal)):
+            yield chunk
+
+    async def stream_generate_tests(
+        self, code_snippet: CodeSnippet, test_framework: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Stream a canned test scaffold at the configured token rate."""
+        async for chunk in self._stream(self._test_code(test_framework or "pytest")):
+            yield chunk
+
+    async def _simulate_call(self) -> None:
+        """Wait a sampled latency, or fail with an injected fault."""
+        self._calls += 1
+        await self._maybe_fail()
+        await self._sleep(self._latency.sample(self._rng))
+
+    async def _stream(self, text: str) -> AsyncIterator[str]:
+        """Emit ``text`` word by word after the time to first token."""
+        await self._simulate_call()
+
+        words = text.split(" ")
+        delay = 1 / self._tokens_per_second if self._tokens_per_second > 0 else 0.0
+        for index, word in enumerate(words):
+            if index:
+                await self._sleep(delay)
+            yield word if index == len(words) - 1 else f"{word} "
+
+    async def _maybe_fail(self) -> None:
+        fault = self._faults.next_fault()
+
+        if fault == RATE_LIMITED:
+            raise AIProviderRateLimitError("Fake provider: injected 429")
+
+        if fault == SERVER_ERROR:
+            raise AIProviderError("Fake provider: injected server error 503")
+
+        if fault == TIMEOUT:
+            await self._sleep(self._timeout_seconds)
+            raise AIProviderTimeoutError(
+                f"Fake provider: injected timeout after {self._timeout_seconds} seconds"
+            )
+
+    @staticmethod
+    def _explanation_text(code_snippet: CodeSnippet) -> str:
+        language = code_snippet.language or "code"
+        return (
+            f"## Overview\n\nThis {language} snippet spans {code_snippet.line_count} "
+            f"lines and {code_snippet.character_count} characters.\n\n"
+            "## Details\n\nThis is a placeholder explanation generated by the fake "
+            "AI provider for development and load testing."
+        )
+
+    @staticmethod
+    def _refactor_text(code_snippet: CodeSnippet, goal: Optional[str]) -> str:
+        focus = f" with a focus on {goal}" if goal else ""
+        return (
+            f"## Analysis\n\nPlaceholder refactoring of {code_snippet.line_count} "
+            f"lines{focus}, generated by the fake AI provider."
+        )
+
+    @staticmethod
+    def _test_code(framework: str) -> str:
+        return (
+            f"# Placeholder {framework} tests generated by the fake AI provider\n\n"
+            "def test_basic_functionality():\n    assert True\n\n\n"
+            "def test_edge_cases():\n    assert True\n"
+        )
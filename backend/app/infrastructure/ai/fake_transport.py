@@ -0,0 +1,152 @@
+"""Fake OpenAI HTTP transport, to run ``OpenAIProvider`` without network access."""
+
+import asyncio
+import json
+import math
+import random
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+import httpx
+
+from app.infrastructure.ai.fault_injection import (
+    RATE_LIMITED,
+    SERVER_ERROR,
+    TIMEOUT,
+    FaultInjector,
+)
+from app.infrastructure.ai.latency_models import FixedLatency, LatencyModel
+from app.infrastructure.ai.rate_limiter import CHARS_PER_TOKEN
+
+PLACEHOLDER_CONTENT = (
+    "## Overview\n\nThis is a placeholder response generated by the fake OpenAI "
+    "transport for development and load testing.\n\n"
+    "```python\ndef placeholder():\n    return None\n```\n\n"
+    "- Improved code structure\n- Enhanced readability"
+)
+
+
+class FakeOpenAITransport(httpx.AsyncBaseTransport):
+    """
+    Serves the Chat Completions API in process, with simulated latency and faults.
+
+    Plugged under ``OpenAIProvider``, faults reach it as HTTP responses and
+    timeouts, so its retries, circuit breaker and rate budget handle them as
+    they would OpenAI's. Completions wait a latency drawn from the configured
+    distribution before their headers; streamed ones then send a word per
+    chunk at ``tokens_per_second``, followed by a usage chunk. Rate limit
+    errors (429), server errors (503) and read timeouts are injected at the
+    configured rates; with a seed they are reproducible.
+    """
+
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        tokens_per_second: float = 50.0,
+        error_rate_429: float = 0.0,
+        error_rate_5xx: float = 0.0,
+        timeout_rate: float = 0.0,
+        timeout_seconds: float = 0.0,
+        seed: Optional[int] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            latency: Time to response headers distribution; 0s when omitted
+            tokens_per_second: Streaming rate after the first chunk
+            error_rate_429: Fraction of completions rejected as rate limited
+            error_rate_5xx: Fraction of completions failing with a 503
+            timeout_rate: Fraction of completions timing out
+            timeout_seconds: How long a timing-out completion hangs, at most
+                the client's read timeout
+            seed: Random seed for reproducible latencies and faults
+            sleep: Sleep function, injectable for tests
+        """
+        self._latency = latency or FixedLatency(0.0)
+        self._tokens_per_second = tokens_per_second
+        self._timeout_seconds = timeout_seconds
+        self._rng = random.Random(seed)
+        self._faults = FaultInjector(self._rng, error_rate_429, error_rate_5xx, timeout_rate)
+        self._sleep = sleep
+        self._calls = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Completion and injected fault counters."""
+        return {"calls": self._calls, "injected_faults": self._faults.counts()}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/models"):
+            # Connection warm-up
+            return httpx.Response(200, json={"object": "list", "data": []})
+        if not request.url.path.endswith("/chat/completions"):
+            return httpx.Response(404, json={"error": {"message": "Unknown endpoint"}})
+
+        self._calls += 1
+        fault = self._faults.next_fault()
+        if fault == RATE_LIMITED:
+            return httpx.Response(
+                429,
+                json={"error": {"type": "requests", "code": "rate_limit_exceeded"}},
+            )
+        if fault == SERVER_ERROR:
+            return httpx.Response(503, json={"error": {"message": "Injected server error"}})
+        if fault == TIMEOUT:
+            read_timeout = request.extensions.get("timeout", {}).get("read")
+            hang = self._timeout_seconds
+            if read_timeout is not None:
+                hang = min(hang, read_timeout)
+            await self._sleep(hang)
+            raise httpx.ReadTimeout("Injected timeout", request=request)
+
+        payload = json.loads(request.content)
+        await self._sleep(self._latency.sample(self._rng))
+        usage = self._usage(payload)
+        if payload.get("stream"):
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                content=self._events(payload["model"], usage),
+            )
+        return httpx.Response(
+            200,
+            json={
+                "object": "chat.completion",
+                "model": payload["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": PLACEHOLDER_CONTENT},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            },
+        )
+
+    async def _events(self, model: str, usage: dict[str, int]) -> AsyncIterator[bytes]:
+        """Server-sent events of a streamed completion, word by word."""
+        words = PLACEHOLDER_CONTENT.split(" ")
+        delay = 1 / self._tokens_per_second if self._tokens_per_second > 0 else 0.0
+        for index, word in enumerate(words):
+            if index:
+                await self._sleep(delay)
+            content = word if index == len(words) - 1 else f"{word} "
+            yield _event({"model": model, "choices": [{"index": 0, "delta": {"content": content}}]})
+        yield _event({"model": model, "choices": [], "usage": usage})
+        yield b"data: [DONE]\n\n"
+
+    @staticmethod
+    def _usage(payload: dict[str, Any]) -> dict[str, int]:
+        prompt_chars = sum(len(message["content"]) for message in payload["messages"])
+        prompt_tokens = math.ceil(prompt_chars / CHARS_PER_TOKEN)
+        completion_tokens = len(PLACEHOLDER_CONTENT.split(" "))
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+
+def _event(chunk: dict[str, Any]) -> bytes:
+    return f"data: {json.dumps(chunk)}\n\n".encode()
@@ -0,0 +1,61 @@
+"""Random fault injection for simulated AI upstreams."""
+
+import random
+from typing import Optional
+
+RATE_LIMITED = "429"
+SERVER_ERROR = "5xx"
+TIMEOUT = "timeout"
+
+
+class FaultInjector:
+    """
+    Decides which calls to a simulated upstream fail, and how.
+
+    Each call draws one number from ``rng``, so with a seeded generator the
+    sequence of faults is reproducible alongside the latencies drawn from it.
+    """
+
+    def __init__(
+        self,
+        rng: random.Random,
+        error_rate_429: float = 0.0,
+        error_rate_5xx: float = 0.0,
+        timeout_rate: float = 0.0,
+    ) -> None:
+        """
+        Initialize the injector.
+
+        Args:
+            rng: Random generator the faults are drawn from
+            error_rate_429: Fraction of calls rejected as rate limited
+            error_rate_5xx: Fraction of calls failing with a server error
+            timeout_rate: Fraction of calls timing out
+
+        Raises:
+            ValueError: If the rates add up to more than 1
+        """
+        if error_rate_429 + error_rate_5xx + timeout_rate > 1:
+            raise ValueError("Injected fault rates cannot add up to more than 1")
+
+        self._rng = rng
+        self._rates = (
+            (RATE_LIMITED, error_rate_429),
+            (SERVER_ERROR, error_rate_5xx),
+            (TIMEOUT, timeout_rate),
+        )
+        self._counts = {fault: 0 for fault, _ in self._rates}
+
+    def next_fault(self) -> Optional[str]:
+        """Draw the fault of the next call: ``"429"``, ``"5xx"``, ``"timeout"`` or None."""
+        roll = self._rng.random()
+        for fault, rate in self._rates:
+            if roll < rate:
+                self._counts[fault] += 1
+                return fault
+            roll -= rate
+        return None
+
+    def counts(self) -> dict[str, int]:
+        """Faults injected so far, by kind."""
+        return dict(self._counts)
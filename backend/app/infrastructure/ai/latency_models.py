@@ -0,0 +1,106 @@
+"""Latency distributions for simulated AI providers."""
+
+import bisect
+import json
+import math
+import random
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Sequence
+
+
+class LatencyModel(ABC):
+    """Distribution of upstream response latencies."""
+
+    @abstractmethod
+    def sample(self, rng: random.Random) -> float:
+        """Draw a latency in seconds."""
+        pass
+
+
+class FixedLatency(LatencyModel):
+    """Always the same latency."""
+
+    def __init__(self, seconds: float) -> None:
+        self._seconds = seconds
+
+    def sample(self, rng: random.Random) -> float:
+        return self._seconds
+
+
+class LogNormalLatency(LatencyModel):
+    """
+    Log-normal latency, the usual shape of LLM completion times.
+
+    Args:
+        median: Median latency in seconds
+        sigma: Standard deviation of the underlying normal; larger means a heavier tail
+    """
+
+    def __init__(self, median: float, sigma: float) -> None:
+        self._mu = math.log(median)
+        self._sigma = sigma
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.lognormvariate(self._mu, self._sigma)
+
+
+class HistogramLatency(LatencyModel):
+    """
+    Latency replayed from a recorded histogram.
+
+    Buckets are ``(upper_bound_seconds, count)`` pairs sorted by bound; a
+    sample picks a bucket proportionally to its count and a uniform value
+    between the previous bound and its own.
+    """
+
+    def __init__(self, buckets: Sequence[tuple[float, int]]) -> None:
+        if not buckets:
+            raise ValueError("Latency histogram needs at least one bucket")
+
+        self._bounds = [float(bound) for bound, _ in sorted(buckets)]
+        self._cumulative: list[int] = []
+        total = 0
+        for _, count in sorted(buckets):
+            total += int(count)
+            self._cumulative.append(total)
+        if total <= 0:
+            raise ValueError("Latency histogram is empty")
+
+    @classmethod
+    def from_file(cls, path: str) -> "HistogramLatency":
+        """Load buckets from a JSON file: ``{"buckets": [[0.5, 10], [1.0, 42], ...]}``."""
+        data = json.loads(Path(path).read_text())
+        return cls([(bound, count) for bound, count in data["buckets"]])
+
+    def sample(self, rng: random.Random) -> float:
+        index = bisect.bisect_right(self._cumulative, rng.randrange(self._cumulative[-1]))
+        lower = self._bounds[index - 1] if index else 0.0
+        return rng.uniform(lower, self._bounds[index])
+
+
+def parse_latency_spec(spec: str) -> LatencyModel:
+    """
+    Build a latency model from a compact spec string.
+
+    Supported forms: ``fixed:<seconds>``, ``lognormal:<median>,<sigma>`` and
+    ``histogram:<path to JSON file>``.
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    kind, _, args = spec.partition(":")
+    kind = kind.strip().lower()
+
+    try:
+        if kind == "fixed":
+            return FixedLatency(float(args))
+        if kind == "lognormal":
+            median, sigma = (float(part) for part in args.split(","))
+            return LogNormalLatency(median, sigma)
+        if kind == "histogram":
+            return HistogramLatency.from_file(args.strip())
+    except (ValueError, OSError, KeyError) as e:
+        raise ValueError(f"Invalid latency spec '{spec}': {e}") from e
+
+    raise ValueError(f"Unknown latency distribution '{kind}'")
@@ -1,23 +1,52 @@
+import asyncio
 import httpx
+import json
 import logging
-from typing import Optional
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Sequence
 
+from app.application.deadline import remaining_time
 from app.application.interfaces.ai_provider import AIProvider
 from app.domain.exceptions import (
     AIProviderError,
     AIProviderTimeoutError,
     AIProviderQuotaError,
+    AIProviderRateLimitError,
 )
+from app.domain.value_objects.code_chunk import CodeChunk
 from app.domain.value_objects.code_snippet import CodeSnippet
 from app.domain.value_objects.code_explanation import CodeExplanation
 from app.domain.value_objects.code_refactor import CodeRefactor
 from app.domain.value_objects.test_scaffold import TestScaffold
+from app.infrastructure.ai.circuit_breaker import CircuitBreaker
+from app.infrastructure.ai.connection_pool import ConnectionPoolConfig, PoolMonitor
 from app.infrastructure.ai.prompts.explain_prompts import ExplainPrompts
+from app.infrastructure.ai.rate_limiter import RateGovernor
 from app.infrastructure.ai.prompts.refactor_prompts import RefactorPrompts
 from app.infrastructure.ai.prompts.test_generation_prompts import TestGenerationPrompts
+from app.infrastructure.ai.retry_policy import RetryPolicy, is_quota_exhausted, parse_retry_after
+from app.infrastructure.metrics.registry import MetricsRegistry
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
+
+def _is_upstream_failure(error: Exception) -> bool:
+    """Whether a failed call indicates an unhealthy upstream (vs. a bad request)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def _outcome(error: Exception) -> str:
+    """Metric label for a failed upstream call: the status code or failure kind."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return str(error.response.status_code)
+    if isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    return "error"
+
 
 class OpenAIProvider(AIProvider):
     """OpenAI implementation of the AI provider interface."""
@@ -28,6 +57,16 @@ class OpenAIProvider(AIProvider):
         model: str = "gpt-4o-mini",
         timeout: int = 30,
         max_retries: int = 3,
+        retry_policy: Optional[RetryPolicy] = None,
+        pool_config: Optional[ConnectionPoolConfig] = None,
+        warmup_connections: int = 1,
+        rate_governor: Optional[RateGovernor] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        base_url: Optional[str] = None,
+        max_tokens: int = 2000,
+        route: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
     ) -> None:
         """
         Initialize OpenAI provider.
@@ -37,6 +76,19 @@ class OpenAIProvider(AIProvider):
             model: Model to use for completions
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
+            retry_policy: Retry policy for upstream calls; defaults to
+                exponential backoff with ``max_retries`` retries
+            pool_config: HTTP connection pool limits and protocol
+            warmup_connections: Connections to open during ``warm_up``
+            rate_governor: Client-side RPM/TPM budget; unlimited when omitted
+            circuit_breaker: Fast-fails calls while OpenAI is degraded
+            metrics: Registry for upstream latency and token metrics
+            base_url: API root of an OpenAI-compatible endpoint; OpenAI's own when omitted
+            max_tokens: Completion length limit per request
+            route: Name labelling this upstream's metrics when several are
+                routed to; the model name when omitted
+            transport: HTTP transport replacing the network, e.g. a
+                ``FakeOpenAITransport`` for load tests
         """
         if not api_key:
             raise ValueError("OpenAI API key is required")
@@ -45,28 +97,117 @@ class OpenAIProvider(AIProvider):
         self._model = model
         self._timeout = timeout
         self._max_retries = max_retries
-        self._base_url = "https://api.openai.com/v1"
+        self._retry_policy = retry_policy or RetryPolicy(max_retries=max_retries)
+        self._rate_governor = rate_governor or RateGovernor()
+        self._circuit_breaker = circuit_breaker or CircuitBreaker()
+        self._base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self._max_tokens = max_tokens
+        self._route = route or model
         self._prompts = ExplainPrompts()
         self._refactor_prompts = RefactorPrompts()
         self._test_prompts = TestGenerationPrompts()
 
         # Initialize HTTP client with connection pooling
+        self._pool_config = pool_config or ConnectionPoolConfig()
+        self._pool_monitor = PoolMonitor(self._pool_config)
+        self._warmup_connections = warmup_connections
+        self._transport = transport
         self._client: Optional[httpx.AsyncClient] = None
+        self._closing = False
+
+        metrics = metrics or MetricsRegistry()
+        self._upstream_duration = metrics.histogram(
+            "ai_upstream_request_duration_seconds",
+            "Latency of upstream AI requests until response headers",
+            ["provider", "route", "outcome"],
+        )
+        self._time_to_first_token = metrics.histogram(
+            "ai_time_to_first_token_seconds",
+            "Latency from opening a completion stream to its first content token",
+            ["provider", "route"],
+        )
+        self._tokens = metrics.counter(
+            "ai_tokens_total",
+            "Tokens consumed as reported by the upstream usage block",
+            ["model", "type"],
+        )
+        metrics.callback(
+            "ai_upstream_requests_in_flight",
+            "Upstream AI requests currently in flight",
+            lambda: float(self._pool_monitor.in_flight),
+            labels={"route": self._route},
+        )
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client with connection pooling."""
+        if self._closing:
+            raise AIProviderError("OpenAI provider is shutting down")
+
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient(
                 timeout=httpx.Timeout(self._timeout),
-                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+                limits=self._pool_config.limits(),
+                http2=self._pool_config.use_http2(),
+                transport=self._transport,
             )
         return self._client
 
-    async def close(self) -> None:
-        """Close the HTTP client."""
+    async def warm_up(self) -> None:
+        """
+        Open pooled connections ahead of the first request.
+
+        Pays DNS resolution and the TLS handshake at startup by issuing cheap
+        ``GET /models`` requests; the connections stay in the keep-alive pool.
+        """
+        client = await self._get_client()
+
+        async def open_connection() -> None:
+            response = await client.get(
+                f"{self._base_url}/models", headers=self._request_headers()
+            )
+            response.raise_for_status()
+
+        results = await asyncio.gather(
+            *(open_connection() for _ in range(self._warmup_connections)),
+            return_exceptions=True,
+        )
+        failures = [r for r in results if isinstance(r, Exception)]
+        if failures:
+            logger.warning("OpenAI connection warm-up failed: %s", failures[0])
+        else:
+            logger.info("Warmed up %s OpenAI connection(s)", len(results))
+
+    async def close(self, drain_timeout: float = 0.0) -> None:
+        """
+        Close the HTTP client, optionally draining in-flight requests first.
+
+        Args:
+            drain_timeout: Seconds to wait for in-flight requests to finish
+        """
+        self._closing = True
+        if drain_timeout > 0 and self._pool_monitor.in_flight:
+            logger.info("Draining %s in-flight OpenAI request(s)", self._pool_monitor.in_flight)
+            if not await self._pool_monitor.wait_idle(drain_timeout):
+                logger.warning(
+                    "%s OpenAI request(s) still in flight after %ss, closing anyway",
+                    self._pool_monitor.in_flight,
+                    drain_timeout,
+                )
+
         if self._client and not self._client.is_closed:
             await self._client.aclose()
 
+        # A later request lazily opens a fresh client
+        self._closing = False
+
+    def stats(self) -> dict[str, Any]:
+        """Connection pool usage, rate budget and circuit breaker state."""
+        return {
+            "connection_pool": self._pool_monitor.stats(self._client),
+            "rate_limit": self._rate_governor.stats(),
+            "circuit_breaker": self._circuit_breaker.stats(),
+        }
+
     @property
     def provider_name(self) -> str:
         """Return the provider name."""
@@ -89,7 +230,7 @@ class OpenAIProvider(AIProvider):
         """
         try:
             logger.info(
-                f"Requesting explanation from OpenAI for {len(code_snippet.content)} characters"
+                "Requesting explanation from OpenAI for %s characters", len(code_snippet.content)
             )
 
             # Prepare the prompt using centralized prompts
@@ -118,26 +259,19 @@ class OpenAIProvider(AIProvider):
             )
 
         except httpx.TimeoutException as e:
-            logger.error(f"OpenAI request timed out: {e}")
+            logger.error("OpenAI request timed out: %s", e)
             raise AIProviderTimeoutError(
                 f"Request timed out after {self._timeout} seconds"
             )
 
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                logger.error("OpenAI quota exceeded")
-                raise AIProviderQuotaError("OpenAI API quota exceeded")
-            elif e.response.status_code >= 500:
-                logger.error(f"OpenAI server error: {e.response.status_code}")
-                raise AIProviderError(f"OpenAI server error: {e.response.status_code}")
-            else:
-                logger.error(
-                    f"OpenAI API error: {e.response.status_code} - {e.response.text}"
-                )
-                raise AIProviderError(f"OpenAI API error: {e.response.status_code}")
+            raise self._map_status_error(e)
+
+        except AIProviderError:
+            raise
 
         except Exception as e:
-            logger.error(f"Unexpected error calling OpenAI: {e}")
+            logger.error("Unexpected error calling OpenAI: %s", e)
             raise AIProviderError(f"Failed to get explanation from OpenAI: {str(e)}")
 
     async def refactor_code(
@@ -160,7 +294,8 @@ class OpenAIProvider(AIProvider):
         """
         try:
             logger.info(
-                f"Requesting refactoring suggestions from OpenAI for {len(code_snippet.content)} characters"
+                "Requesting refactoring suggestions from OpenAI for %s characters",
+                len(code_snippet.content),
             )
 
             # Prepare the prompts
@@ -198,26 +333,19 @@ class OpenAIProvider(AIProvider):
             )
 
         except httpx.TimeoutException as e:
-            logger.error(f"OpenAI refactor request timed out: {e}")
+            logger.error("OpenAI refactor request timed out: %s", e)
             raise AIProviderTimeoutError(
                 f"Request timed out after {self._timeout} seconds"
             )
 
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                logger.error("OpenAI quota exceeded")
-                raise AIProviderQuotaError("OpenAI API quota exceeded")
-            elif e.response.status_code >= 500:
-                logger.error(f"OpenAI server error: {e.response.status_code}")
-                raise AIProviderError(f"OpenAI server error: {e.response.status_code}")
-            else:
-                logger.error(
-                    f"OpenAI API error: {e.response.status_code} - {e.response.text}"
-                )
-                raise AIProviderError(f"OpenAI API error: {e.response.status_code}")
+            raise self._map_status_error(e)
+
+        except AIProviderError:
+            raise
 
         except Exception as e:
-            logger.error(f"Unexpected error calling OpenAI for refactoring: {e}")
+            logger.error("Unexpected error calling OpenAI for refactoring: %s", e)
             raise AIProviderError(
                 f"Failed to get refactoring suggestions from OpenAI: {str(e)}"
             )
@@ -317,7 +445,8 @@ class OpenAIProvider(AIProvider):
         """
         try:
             logger.info(
-                f"Requesting test generation from OpenAI for {len(code_snippet.content)} characters"
+                "Requesting test generation from OpenAI for %s characters",
+                len(code_snippet.content),
             )
 
             # Prepare the prompts
@@ -354,53 +483,400 @@ class OpenAIProvider(AIProvider):
             )
 
         except httpx.TimeoutException as e:
-            logger.error(f"OpenAI test generation request timed out: {e}")
+            logger.error("OpenAI test generation request timed out: %s", e)
             raise AIProviderTimeoutError(
                 f"Request timed out after {self._timeout} seconds"
             )
 
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                logger.error("OpenAI quota exceeded")
-                raise AIProviderQuotaError("OpenAI API quota exceeded")
-            elif e.response.status_code >= 500:
-                logger.error(f"OpenAI server error: {e.response.status_code}")
-                raise AIProviderError(f"OpenAI server error: {e.response.status_code}")
-            else:
-                logger.error(
-                    f"OpenAI API error: {e.response.status_code} - {e.response.text}"
-                )
-                raise AIProviderError(f"OpenAI API error: {e.response.status_code}")
+            raise self._map_status_error(e)
+
+        except AIProviderError:
+            raise
 
         except Exception as e:
-            logger.error(f"Unexpected error calling OpenAI for test generation: {e}")
+            logger.error("Unexpected error calling OpenAI for test generation: %s", e)
             raise AIProviderError(f"Failed to generate tests from OpenAI: {str(e)}")
 
-    async def _make_completion_request(
-        self, system_prompt: str, user_prompt: str
-    ) -> dict:
-        """Make a completion request to OpenAI Chat Completions API."""
-        headers = {
-            "Authorization": f"Bearer {self._api_key}",
-            "Content-Type": "application/json",
-        }
+    async def summarize_explanations(
+        self, code_snippet: CodeSnippet, sections: Sequence[tuple[CodeChunk, str]]
+    ) -> CodeExplanation:
+        """
+        Write an overview of a large snippet from its chunk explanations using OpenAI.
+
+        Args:
+            code_snippet: The complete code snippet
+            sections: Each chunk with its explanation, in source order
+
+        Returns:
+            An explanation holding the overview
+
+        Raises:
+            AIProviderError: If the API call fails
+            AIProviderTimeoutError: If the request times out
+            AIProviderQuotaError: If quota is exceeded
+        """
+        try:
+            logger.info("Requesting summary from OpenAI for %s sections", len(sections))
+
+            response_data = await self._make_completion_request(
+                self._prompts.get_summary_system_prompt(),
+                self._prompts.get_summary_user_prompt(code_snippet, sections),
+            )
+            summary_content = response_data["choices"][0]["message"]["content"]
+
+            if not summary_content:
+                raise AIProviderError("Empty response from OpenAI")
+
+            return CodeExplanation(
+                snippet=code_snippet,
+                explanation=summary_content,
+                provider=self.provider_name,
+                is_placeholder=False,
+            )
+
+        except httpx.TimeoutException as e:
+            logger.error("OpenAI request timed out: %s", e)
+            raise AIProviderTimeoutError(
+                f"Request timed out after {self._timeout} seconds"
+            )
+
+        except httpx.HTTPStatusError as e:
+            raise self._map_status_error(e)
+
+        except AIProviderError:
+            raise
+
+        except Exception as e:
+            logger.error("Unexpected error calling OpenAI: %s", e)
+            raise AIProviderError(f"Failed to get summary from OpenAI: {str(e)}")
+
+    async def stream_explain_code(self, code_snippet: CodeSnippet) -> AsyncIterator[str]:
+        """
+        Stream an explanation for the given code snippet from OpenAI.
+
+        Args:
+            code_snippet: The code snippet to explain
+
+        Yields:
+            Explanation text fragments as OpenAI generates them
+
+        Raises:
+            AIProviderError: If the API call fails
+            AIProviderTimeoutError: If the request times out
+            AIProviderQuotaError: If quota is exceeded
+        """
+        logger.info(
+            "Streaming explanation from OpenAI for %s characters", len(code_snippet.content)
+        )
 
-        payload = {
+        system_prompt = self._prompts.get_system_prompt()
+        user_prompt = self._prompts.get_user_prompt(code_snippet)
+
+        async for chunk in self._stream_completion_request(system_prompt, user_prompt):
+            yield chunk
+
+    async def stream_refactor_code(
+        self, code_snippet: CodeSnippet, goal: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream refactoring suggestions for the given code snippet from OpenAI.
+
+        Args:
+            code_snippet: The code snippet to refactor
+            goal: Optional specific refactoring goal
+
+        Yields:
+            Refactoring response fragments as OpenAI generates them
+
+        Raises:
+            AIProviderError: If the API call fails
+            AIProviderTimeoutError: If the request times out
+            AIProviderQuotaError: If quota is exceeded
+        """
+        logger.info(
+            "Streaming refactoring suggestions from OpenAI for %s characters",
+            len(code_snippet.content),
+        )
+
+        system_prompt = self._refactor_prompts.get_system_prompt()
+        user_prompt = self._refactor_prompts.get_user_prompt(code_snippet.content, goal)
+
+        async for chunk in self._stream_completion_request(system_prompt, user_prompt):
+            yield chunk
+
+    async def stream_generate_tests(
+        self, code_snippet: CodeSnippet, test_framework: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a unit test scaffold for the given code snippet from OpenAI.
+
+        Args:
+            code_snippet: The code snippet to generate tests for
+            test_framework: Optional test framework preference
+
+        Yields:
+            Test code fragments as OpenAI generates them
+
+        Raises:
+            AIProviderError: If the API call fails
+            AIProviderTimeoutError: If the request times out
+            AIProviderQuotaError: If quota is exceeded
+        """
+        logger.info(
+            "Streaming test generation from OpenAI for %s characters", len(code_snippet.content)
+        )
+
+        system_prompt = self._test_prompts.get_system_prompt()
+        user_prompt = self._test_prompts.get_user_prompt(
+            code_snippet.content, code_snippet.language, test_framework
+        )
+
+        async for chunk in self._stream_completion_request(system_prompt, user_prompt):
+            yield chunk
+
+    def _build_completion_payload(
+        self, system_prompt: str, user_prompt: str, stream: bool
+    ) -> dict[str, Any]:
+        """Build the Chat Completions request body."""
+        payload: dict[str, Any] = {
             "model": self._model,
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
             "temperature": 0.3,  # Deterministic-ish for explanations
-            "max_tokens": 2000,
-            "stream": False,
+            "max_tokens": self._max_tokens,
+            "stream": stream,
+        }
+        if stream:
+            # Usage arrives in a final chunk with no choices
+            payload["stream_options"] = {"include_usage": True}
+        return payload
+
+    def _request_headers(self) -> dict[str, str]:
+        """Build the headers for an OpenAI API request."""
+        return {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json",
         }
 
+    def _estimate_tokens(self, payload: dict[str, Any]) -> int:
+        """Estimate the tokens a completion request will consume."""
+        prompt_chars = sum(len(message["content"]) for message in payload["messages"])
+        return self._rate_governor.estimate_tokens(prompt_chars, payload["max_tokens"])
+
+    def _attempt_timeout(self, remaining: float) -> httpx.Timeout:
+        """
+        Per-attempt timeout, clipped to what is left of the retry and request deadlines.
+
+        Raises:
+            AIProviderTimeoutError: If no time is left
+        """
+        timeout = min(float(self._timeout), remaining)
+        request_remaining = remaining_time()
+        if request_remaining is not None:
+            timeout = min(timeout, request_remaining)
+        if timeout <= 0:
+            raise AIProviderTimeoutError("Request deadline exceeded before calling OpenAI")
+        return httpx.Timeout(timeout)
+
+    async def _make_completion_request(
+        self, system_prompt: str, user_prompt: str
+    ) -> dict[str, Any]:
+        """Make a completion request to OpenAI Chat Completions API, with retries."""
+        payload = self._build_completion_payload(system_prompt, user_prompt, stream=False)
+        estimated_tokens = self._estimate_tokens(payload)
+        client = await self._get_client()
+
+        async def attempt(remaining: float) -> dict[str, Any]:
+            reserved_tokens = await self._rate_governor.acquire(estimated_tokens)
+            timeout = self._attempt_timeout(remaining)
+            with self._pool_monitor.track():
+                response = await self._send_guarded(
+                    lambda: client.post(
+                        f"{self._base_url}/chat/completions",
+                        headers=self._request_headers(),
+                        json=payload,
+                        timeout=timeout,
+                    )
+                )
+            data: dict[str, Any] = response.json()
+
+            usage = data.get("usage") or {}
+            if "total_tokens" in usage:
+                self._rate_governor.reconcile(reserved_tokens, usage["total_tokens"])
+            self._record_usage(usage)
+            return data
+
+        return await self._retry_policy.run(attempt, budget=remaining_time())
+
+    async def _open_stream(self, payload: dict[str, Any]) -> tuple[httpx.Response, int]:
+        """
+        Open a streaming completion response, retrying until headers arrive.
+
+        Returns:
+            The response and the tokens reserved for it, to reconcile once the
+            stream reports its usage
+        """
         client = await self._get_client()
-        response = await client.post(
-            f"{self._base_url}/chat/completions",
-            headers=headers,
-            json=payload,
+        estimated_tokens = self._estimate_tokens(payload)
+
+        async def attempt(remaining: float) -> tuple[httpx.Response, int]:
+            reserved_tokens = await self._rate_governor.acquire(estimated_tokens)
+            request = client.build_request(
+                "POST",
+                f"{self._base_url}/chat/completions",
+                headers=self._request_headers(),
+                json=payload,
+                timeout=self._attempt_timeout(remaining),
+            )
+
+            async def send() -> httpx.Response:
+                response = await client.send(request, stream=True)
+                if response.is_error:
+                    await response.aread()
+                    await response.aclose()
+                return response
+
+            return await self._send_guarded(send), reserved_tokens
+
+        return await self._retry_policy.run(attempt, budget=remaining_time())
+
+    async def _send_guarded(
+        self, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """
+        Send one upstream request through the circuit breaker.
+
+        Raises:
+            AIProviderUnavailableError: If the circuit is open
+            httpx.HTTPStatusError: If the response has an error status
+        """
+        self._circuit_breaker.before_call()
+        started = time.monotonic()
+        try:
+            response = await send()
+            response.raise_for_status()
+        except Exception as e:
+            duration = time.monotonic() - started
+            self._upstream_duration.observe(
+                duration, provider=self.provider_name, route=self._route, outcome=_outcome(e)
+            )
+            if _is_upstream_failure(e):
+                self._circuit_breaker.record_failure(duration)
+            else:
+                self._circuit_breaker.record_success(duration)
+            raise
+        except BaseException:
+            # Cancelled: no verdict on upstream health
+            self._circuit_breaker.release()
+            raise
+
+        duration = time.monotonic() - started
+        self._upstream_duration.observe(
+            duration,
+            provider=self.provider_name,
+            route=self._route,
+            outcome=str(response.status_code),
         )
-        response.raise_for_status()
-        return response.json()
+        self._circuit_breaker.record_success(duration)
+        return response
+
+    async def _stream_completion_request(
+        self, system_prompt: str, user_prompt: str
+    ) -> AsyncIterator[str]:
+        """
+        Make a streaming completion request and yield content deltas.
+
+        OpenAI sends server-sent events where each ``data:`` line carries a
+        JSON chunk; the stream is terminated by ``data: [DONE]``. Only opening
+        the stream is retried: once tokens have been yielded a failure is final.
+
+        Raises:
+            AIProviderError: If the API call fails or the stream is malformed
+            AIProviderTimeoutError: If the request times out
+            AIProviderQuotaError: If quota is exceeded
+        """
+        payload = self._build_completion_payload(system_prompt, user_prompt, stream=True)
+        started = time.monotonic()
+        first_token = True
+
+        try:
+            with self._pool_monitor.track():
+                response, reserved_tokens = await self._open_stream(payload)
+                try:
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+
+                        data = line[len("data:") :].strip()
+                        if data == "[DONE]":
+                            break
+
+                        chunk = json.loads(data)
+                        usage = chunk.get("usage")
+                        if usage:
+                            if "total_tokens" in usage:
+                                self._rate_governor.reconcile(
+                                    reserved_tokens, usage["total_tokens"]
+                                )
+                            self._record_usage(usage)
+
+                        choices = chunk.get("choices") or []
+                        if not choices:
+                            continue
+
+                        content = choices[0].get("delta", {}).get("content")
+                        if content:
+                            if first_token:
+                                first_token = False
+                                self._time_to_first_token.observe(
+                                    time.monotonic() - started,
+                                    provider=self.provider_name,
+                                    route=self._route,
+                                )
+                            yield content
+                finally:
+                    await response.aclose()
+
+        except httpx.TimeoutException as e:
+            logger.error("OpenAI streaming request timed out: %s", e)
+            raise AIProviderTimeoutError(
+                f"Request timed out after {self._timeout} seconds"
+            )
+
+        except httpx.HTTPStatusError as e:
+            raise self._map_status_error(e)
+
+        except json.JSONDecodeError as e:
+            logger.error("Malformed chunk in OpenAI stream: %s", e)
+            raise AIProviderError("Malformed streaming response from OpenAI")
+
+        except httpx.HTTPError as e:
+            logger.error("OpenAI streaming request failed: %s", e)
+            raise AIProviderError(f"Failed to stream response from OpenAI: {str(e)}")
+
+    def _record_usage(self, usage: dict[str, Any]) -> None:
+        """Count the prompt and completion tokens of an upstream usage block."""
+        for token_type in ("prompt", "completion"):
+            count = usage.get(f"{token_type}_tokens")
+            if count:
+                self._tokens.inc(count, model=self._model, type=token_type)
+
+    def _map_status_error(self, e: httpx.HTTPStatusError) -> AIProviderError:
+        """Translate an OpenAI HTTP error status into an AI provider exception."""
+        if e.response.status_code == 429:
+            if is_quota_exhausted(e.response):
+                logger.error("OpenAI quota exceeded")
+                return AIProviderQuotaError("OpenAI API quota exceeded")
+            # Retries gave up because the requested wait did not fit the deadline
+            retry_after = parse_retry_after(e.response.headers)
+            logger.error("OpenAI rate limit exceeded (retry after %ss)", retry_after)
+            return AIProviderRateLimitError("OpenAI rate limit exceeded", retry_after=retry_after)
+        elif e.response.status_code >= 500:
+            logger.error("OpenAI server error: %s", e.response.status_code)
+            return AIProviderError(f"OpenAI server error: {e.response.status_code}")
+        else:
+            logger.error("OpenAI API error: %s - %s", e.response.status_code, e.response.text)
+            return AIProviderError(f"OpenAI API error: {e.response.status_code}")
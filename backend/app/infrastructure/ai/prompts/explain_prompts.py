@@ -1,6 +1,9 @@
+from typing import Sequence
+
+from app.domain.value_objects.code_chunk import CodeChunk
 from app.domain.value_objects.code_snippet import CodeSnippet
 
-PROMPT_VERSION = "1.0.0"
+PROMPT_VERSION = "1.1.0"
 
 
 class ExplainPrompts:
@@ -35,6 +38,36 @@ Format your response with clear sections using markdown headers."""
 
 Provide a clear explanation of what this code does, how it works, and any notable patterns or concepts it demonstrates."""
 
+    def get_summary_system_prompt(self) -> str:
+        """Get the system prompt for summarizing explanations of a large snippet's parts."""
+        return """You are an expert code analysis assistant. A large piece of code was split into parts, and each part has already been explained in detail.
+
+Guidelines:
+1. Write an overview of the code as a whole, based on the explanations of its parts
+2. Describe the overall purpose, the main components and how they interact
+3. Point out patterns or issues that span several parts
+4. Do not repeat the details of each part; they are shown below your overview
+5. Use markdown formatting for better readability
+
+Start your response with a "## Overview" header."""
+
+    def get_summary_user_prompt(
+        self, code_snippet: CodeSnippet, sections: Sequence[tuple[CodeChunk, str]]
+    ) -> str:
+        """Get the user prompt with the explanations of each part to summarize."""
+        language_hint = (
+            f" (Language: {code_snippet.language})" if code_snippet.language else ""
+        )
+        parts = "\n\n".join(
+            f"### {chunk.label}\n\n{explanation}" for chunk, explanation in sections
+        )
+
+        return f"""This code{language_hint} spans {code_snippet.line_count} lines. Here are the explanations of its {len(sections)} parts:
+
+{parts}
+
+Provide an overview of what the code as a whole does and how its parts fit together."""
+
     def get_version(self) -> str:
         """Get the current prompt version."""
         return PROMPT_VERSION
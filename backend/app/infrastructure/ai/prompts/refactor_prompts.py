@@ -1,5 +1,7 @@
 """Prompts for code refactoring using OpenAI."""
 
+PROMPT_VERSION = "1.0.0"
+
 
 class RefactorPrompts:
     """Centralized prompts for code refactoring."""
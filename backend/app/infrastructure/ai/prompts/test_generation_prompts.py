@@ -1,6 +1,9 @@
 """Prompts for test generation using OpenAI."""
 
 
+PROMPT_VERSION = "1.0.0"
+
+
 class TestGenerationPrompts:
     """Centralized prompts for test generation."""
 
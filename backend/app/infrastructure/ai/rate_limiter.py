@@ -0,0 +1,190 @@
+"""Client-side rate governor for upstream requests-per-minute and tokens-per-minute budgets."""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from app.domain.exceptions import AIProviderRateLimitError
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English prose and code with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+
+class TokenBucket:
+    """
+    Token bucket refilling continuously up to its capacity.
+
+    The level may go negative when actual usage turns out higher than what
+    was reserved; the debt is paid back by refill before new reservations.
+    """
+
+    def __init__(
+        self, capacity: float, refill_per_second: float, clock: Callable[[], float]
+    ) -> None:
+        self.capacity = capacity
+        self._refill_per_second = refill_per_second
+        self._clock = clock
+        self._level = capacity
+        self._updated_at = clock()
+
+    @property
+    def level(self) -> float:
+        """Currently available amount."""
+        self._refill()
+        return self._level
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` is available (0 if it is available now)."""
+        self._refill()
+        missing = min(amount, self.capacity) - self._level
+        return max(missing / self._refill_per_second, 0.0)
+
+    def consume(self, amount: float) -> None:
+        """Take ``amount`` from the bucket (callers check ``wait_time`` first)."""
+        self._refill()
+        self._level -= amount
+
+    def adjust(self, delta: float) -> None:
+        """Give back (positive) or charge extra (negative) after the fact."""
+        self._refill()
+        self._level = min(self._level + delta, self.capacity)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._level = min(self._level + elapsed * self._refill_per_second, self.capacity)
+
+
+class RateGovernor:
+    """
+    Smooths upstream traffic to stay within RPM and TPM budgets.
+
+    Each request reserves one request slot and its estimated token count.
+    When the budget is exhausted, requests queue in arrival order until it
+    refills, up to ``max_wait`` seconds; beyond that they are rejected with
+    ``AIProviderRateLimitError`` instead of being sent to collect a 429.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_wait: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        """
+        Initialize the governor.
+
+        Args:
+            requests_per_minute: Request budget; unlimited when None
+            tokens_per_minute: Token budget; unlimited when None
+            max_wait: Longest a request may queue for budget, in seconds
+            clock: Monotonic clock, injectable for tests
+            sleep: Sleep function, injectable for tests
+        """
+        self._requests = (
+            TokenBucket(requests_per_minute, requests_per_minute / 60, clock)
+            if requests_per_minute
+            else None
+        )
+        self._tokens = (
+            TokenBucket(tokens_per_minute, tokens_per_minute / 60, clock)
+            if tokens_per_minute
+            else None
+        )
+        self._max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+        self._delayed = 0
+        self._rejected = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any budget is configured."""
+        return self._requests is not None or self._tokens is not None
+
+    @staticmethod
+    def estimate_tokens(prompt_chars: int, max_tokens: int) -> int:
+        """Estimate a request's token usage from prompt size and completion limit."""
+        return math.ceil(prompt_chars / CHARS_PER_TOKEN) + max_tokens
+
+    async def acquire(self, tokens: int) -> int:
+        """
+        Reserve budget for one request, waiting for it if necessary.
+
+        Args:
+            tokens: Estimated tokens the request will use
+
+        Returns:
+            The number of tokens actually reserved, to pass to ``reconcile``
+
+        Raises:
+            AIProviderRateLimitError: If the budget will not be available within max_wait
+        """
+        if not self.enabled:
+            return tokens
+
+        started = self._clock()
+        delayed = False
+        self._waiting += 1
+        try:
+            # The lock makes waiters queue in arrival order
+            async with self._lock:
+                while True:
+                    wait = self._wait_time(tokens)
+                    if wait <= 0:
+                        return self._consume(tokens)
+
+                    if self._clock() - started + wait > self._max_wait:
+                        self._rejected += 1
+                        logger.warning("Rate budget unavailable for %.1fs, rejecting request", wait)
+                        raise AIProviderRateLimitError(
+                            "Local rate limit budget exhausted", retry_after=wait
+                        )
+
+                    if not delayed:
+                        delayed = True
+                        self._delayed += 1
+                    await self._sleep(wait)
+        finally:
+            self._waiting -= 1
+
+    def reconcile(self, reserved_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket once a response reports actual usage."""
+        if self._tokens is not None:
+            self._tokens.adjust(reserved_tokens - actual_tokens)
+
+    def stats(self) -> dict[str, Any]:
+        """Remaining budgets and queueing counters."""
+        return {
+            "requests_available": self._requests.level if self._requests else None,
+            "tokens_available": self._tokens.level if self._tokens else None,
+            "waiting": self._waiting,
+            "delayed_total": self._delayed,
+            "rejected_total": self._rejected,
+        }
+
+    def _wait_time(self, tokens: int) -> float:
+        waits = [0.0]
+        if self._requests is not None:
+            waits.append(self._requests.wait_time(1))
+        if self._tokens is not None:
+            waits.append(self._tokens.wait_time(tokens))
+        return max(waits)
+
+    def _consume(self, tokens: int) -> int:
+        if self._requests is not None:
+            self._requests.consume(1)
+        if self._tokens is not None:
+            # Oversized requests may only drain the bucket, not exceed it
+            tokens = min(tokens, int(self._tokens.capacity))
+            self._tokens.consume(tokens)
+        return tokens
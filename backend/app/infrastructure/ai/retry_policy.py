@@ -0,0 +1,204 @@
+"""Retry policy for upstream AI provider calls."""
+
+import asyncio
+import logging
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Status codes that indicate the request was not processed, or may be safely repeated
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+# Transport failures where the request never reached (or never left) the client
+RETRYABLE_EXCEPTIONS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+    httpx.RemoteProtocolError,
+)
+
+# Headers carrying a server-side hint on when to retry, in order of preference
+RATE_LIMIT_RESET_HEADERS = ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """
+    Parse an OpenAI style reset duration such as ``"1s"``, ``"6m0s"`` or ``"120ms"``.
+
+    Returns:
+        The duration in seconds, or None if the value is not a duration
+    """
+    value = value.strip()
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def parse_retry_after(headers: httpx.Headers) -> Optional[float]:
+    """
+    Extract the server-requested retry delay from response headers.
+
+    Honours ``retry-after-ms``, ``retry-after`` (seconds or HTTP date) and the
+    OpenAI rate-limit reset headers, taking the longest reset if both are present.
+
+    Returns:
+        The delay in seconds, or None if the server gave no hint
+    """
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(float(retry_after_ms) / 1000, 0.0)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+            except (TypeError, ValueError):
+                pass
+
+    resets = [
+        parsed
+        for name in RATE_LIMIT_RESET_HEADERS
+        if (raw := headers.get(name)) and (parsed := parse_duration(raw)) is not None
+    ]
+    return max(resets) if resets else None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Decide whether a failed upstream call may be safely retried."""
+    if isinstance(error, httpx.HTTPStatusError):
+        response = error.response
+        if response.status_code not in RETRYABLE_STATUS_CODES:
+            return False
+        if response.status_code == 429 and is_quota_exhausted(response):
+            # Billing quota exhaustion does not recover by waiting
+            return False
+        return True
+
+    return isinstance(error, RETRYABLE_EXCEPTIONS)
+
+
+def is_quota_exhausted(response: httpx.Response) -> bool:
+    """Check whether a 429 response signals a hard quota rather than a rate limit."""
+    try:
+        error = response.json().get("error") or {}
+    except (ValueError, AttributeError, httpx.ResponseNotRead):
+        return False
+    return isinstance(error, dict) and error.get("code") == "insufficient_quota"
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, bounded by a total deadline.
+
+    A server-requested delay is waited out in full. When it does not fit in
+    what is left of the deadline, the policy gives up at once rather than
+    retrying early into the same limit, and the caller can pass the hint on.
+
+    Attributes:
+        max_retries: Maximum number of retries after the first attempt
+        base_delay: Backoff base in seconds for the first retry
+        max_delay: Upper bound for any single backoff delay
+        deadline: Total time budget in seconds across all attempts and waits
+    """
+
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+    deadline: float = 90.0
+    sleep: Callable[[float], Awaitable[None]] = field(default=asyncio.sleep, repr=False)
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+    rng: random.Random = field(default_factory=random.Random, repr=False)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter backoff delay for the given (zero-based) retry attempt."""
+        ceiling = min(self.max_delay, self.base_delay * (2**attempt))
+        return self.rng.uniform(0, ceiling)
+
+    def retry_delay(self, attempt: int, error: Exception) -> float:
+        """Delay before the next attempt, preferring the server's own hint."""
+        if isinstance(error, httpx.HTTPStatusError):
+            hinted = parse_retry_after(error.response.headers)
+            if hinted is not None:
+                return hinted
+        return self.backoff_delay(attempt)
+
+    async def run(
+        self, operation: Callable[[float], Awaitable[T]], budget: Optional[float] = None
+    ) -> T:
+        """
+        Run an operation, retrying retryable failures until the policy gives up.
+
+        Args:
+            operation: Coroutine factory receiving the remaining time budget in seconds
+            budget: Time left for the caller (e.g. its request deadline), in
+                seconds; the policy's own deadline applies when it is shorter
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            Exception: The last failure, once it is not retryable, retries are
+                exhausted, or the next wait would overrun the deadline
+        """
+        deadline = self.deadline if budget is None else min(self.deadline, budget)
+        started = self.clock()
+        attempt = 0
+
+        while True:
+            remaining = deadline - (self.clock() - started)
+            try:
+                return await operation(remaining)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+
+                delay = self.retry_delay(attempt, e)
+                remaining = deadline - (self.clock() - started)
+                if delay >= remaining:
+                    logger.warning(
+                        "Giving up after %s attempts: retry in %.2fs would exceed the "
+                        "%.0fs deadline",
+                        attempt + 1,
+                        delay,
+                        deadline,
+                    )
+                    raise
+
+                attempt += 1
+                logger.warning(
+                    "Upstream call failed (%s), retry %s/%s in %.2fs",
+                    _describe(e),
+                    attempt,
+                    self.max_retries,
+                    delay,
+                )
+                await self.sleep(delay)
+
+
+def _describe(error: Exception) -> str:
+    """Short description of a failure for retry logs."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"HTTP {error.response.status_code}"
+    return type(error).__name__
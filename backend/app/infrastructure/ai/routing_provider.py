@@ -0,0 +1,334 @@
+"""AI provider routing calls across several upstreams, with hedged requests."""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Sequence, TypeVar
+
+from app.application.interfaces.ai_provider import AIProvider
+from app.domain.exceptions import ValidationError
+from app.domain.value_objects.code_chunk import CodeChunk
+from app.domain.value_objects.code_explanation import CodeExplanation
+from app.domain.value_objects.code_refactor import CodeRefactor
+from app.domain.value_objects.code_snippet import CodeSnippet
+from app.domain.value_objects.test_scaffold import TestScaffold
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class Route:
+    """
+    One upstream a ``RoutingAIProvider`` can send calls to.
+
+    Attributes:
+        name: Label for logs and stats (e.g. the model or endpoint)
+        provider: Provider performing the calls
+        weight: Relative share of traffic while all routes are equally healthy
+    """
+
+    name: str
+    provider: AIProvider
+    weight: float = 1.0
+
+
+class _RouteHealth:
+    """Error rate and latency observed on one route."""
+
+    def __init__(self, window: int, alpha: float) -> None:
+        self.alpha = alpha
+        self.error_rate = 0.0
+        self.latency: Optional[float] = None  # EWMA of successful call durations
+        self.recent: deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record(self, duration: float, failed: bool) -> None:
+        self.calls += 1
+        self.errors += failed
+        self.error_rate += self.alpha * (failed - self.error_rate)
+        if not failed:
+            self.recent.append(duration)
+            if self.latency is None:
+                self.latency = duration
+            else:
+                self.latency += self.alpha * (duration - self.latency)
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self.recent)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class RoutingAIProvider(AIProvider):
+    """
+    Spread calls over several routes and hedge the slow ones.
+
+    Each call goes to a route picked at random, weighted by the configured
+    weight scaled down by the route's recent error rate and latency, so
+    traffic drifts away from a degraded upstream and comes back once it
+    recovers (every route keeps a small share to keep being measured).
+
+    If the first attempt has not answered within the ``hedge_percentile``
+    latency of its route, a second attempt is sent to another route (or the
+    same one when there is only one); the first answer wins and the other
+    attempt is cancelled. An attempt that fails outright is retried on
+    another route right away. Hedges are capped at ``max_hedge_ratio`` of calls so a
+    slow-down across the board cannot double the upstream load.
+
+    Streaming calls are routed but not hedged: a stream cannot be switched
+    once its first tokens were sent to the client.
+    """
+
+    def __init__(
+        self,
+        routes: Sequence[Route],
+        hedge_percentile: float = 0.95,
+        min_hedge_delay: float = 0.1,
+        max_hedge_ratio: float = 0.1,
+        min_samples: int = 20,
+        window: int = 200,
+        rng: Optional[random.Random] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the router.
+
+        Args:
+            routes: Upstreams to route between
+            hedge_percentile: Latency percentile of the route after which a
+                hedge is sent
+            min_hedge_delay: Shortest wait before hedging, in seconds
+            max_hedge_ratio: Most hedges per call, over the provider's lifetime;
+                0 disables hedging
+            min_samples: Latency samples a route needs before it is hedged
+            window: Recent latencies per route kept for the percentile
+            rng: Random source for route picks, injectable for tests
+            clock: Monotonic clock, injectable for tests
+        """
+        if not routes:
+            raise ValueError("At least one route is required")
+
+        self._routes = list(routes)
+        self._health = {route.name: _RouteHealth(window, alpha=0.1) for route in self._routes}
+        self._hedge_percentile = hedge_percentile
+        self._min_hedge_delay = min_hedge_delay
+        self._max_hedge_ratio = max_hedge_ratio
+        self._min_samples = min_samples
+        self._rng = rng or random.Random()
+        self._clock = clock
+        self._calls = 0
+        self._hedges = 0
+
+    @property
+    def provider_name(self) -> str:
+        """Return the provider name."""
+        return "routing"
+
+    @property
+    def routes(self) -> list[Route]:
+        return list(self._routes)
+
+    async def explain_code(self, code_snippet: CodeSnippet) -> CodeExplanation:
+        return await self._call(lambda provider: provider.explain_code(code_snippet))
+
+    async def refactor_code(
+        self, code_snippet: CodeSnippet, goal: Optional[str] = None
+    ) -> CodeRefactor:
+        return await self._call(lambda provider: provider.refactor_code(code_snippet, goal))
+
+    async def generate_tests(
+        self, code_snippet: CodeSnippet, test_framework: Optional[str] = None
+    ) -> TestScaffold:
+        return await self._call(
+            lambda provider: provider.generate_tests(code_snippet, test_framework)
+        )
+
+    async def summarize_explanations(
+        self, code_snippet: CodeSnippet, sections: Sequence[tuple[CodeChunk, str]]
+    ) -> CodeExplanation:
+        return await self._call(
+            lambda provider: provider.summarize_explanations(code_snippet, sections)
+        )
+
+    async def stream_explain_code(self, code_snippet: CodeSnippet) -> AsyncIterator[str]:
+        async for chunk in self._stream(
+            lambda provider: provider.stream_explain_code(code_snippet)
+        ):
+            yield chunk
+
+    async def stream_refactor_code(
+        self, code_snippet: CodeSnippet, goal: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        async for chunk in self._stream(
+            lambda provider: provider.stream_refactor_code(code_snippet, goal)
+        ):
+            yield chunk
+
+    async def stream_generate_tests(
+        self, code_snippet: CodeSnippet, test_framework: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        async for chunk in self._stream(
+            lambda provider: provider.stream_generate_tests(code_snippet, test_framework)
+        ):
+            yield chunk
+
+    async def warm_up(self) -> None:
+        await asyncio.gather(*(route.provider.warm_up() for route in self._routes))
+
+    async def close(self, drain_timeout: float = 0.0) -> None:
+        await asyncio.gather(*(route.provider.close(drain_timeout) for route in self._routes))
+
+    def stats(self) -> dict[str, Any]:
+        """Traffic share, health and hedging counters per route."""
+        weights = self._effective_weights(self._routes)
+        total = sum(weights)
+        routes = {}
+        for route, weight in zip(self._routes, weights):
+            health = self._health[route.name]
+            routes[route.name] = {
+                "share": weight / total,
+                "calls": health.calls,
+                "errors": health.errors,
+                "error_rate": health.error_rate,
+                "latency_ewma_ms": (health.latency or 0.0) * 1000,
+                "hedges": health.hedges,
+                "hedge_wins": health.hedge_wins,
+                "upstream": route.provider.stats(),
+            }
+        return {"routing": {"calls": self._calls, "hedges": self._hedges, "routes": routes}}
+
+    async def _call(self, operation: Callable[[AIProvider], Awaitable[T]]) -> T:
+        self._calls += 1
+        primary = self._pick(self._routes)
+        attempts: dict[asyncio.Task[T], Route] = {self._start(primary, operation): primary}
+        hedged = False
+        last_error: Optional[Exception] = None
+
+        try:
+            while attempts:
+                timeout = None if hedged else self._hedge_delay(primary)
+                done, _ = await asyncio.wait(
+                    attempts, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    route = attempts.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if route is not primary:
+                            self._health[route.name].hedge_wins += 1
+                        return task.result()
+                    if not isinstance(error, Exception):
+                        raise error
+                    last_error = error
+                    if isinstance(error, ValidationError):
+                        # Every route would reject it the same way
+                        raise error
+
+                # Hedge on a slow attempt, fail over on a failed one
+                if not hedged and self._may_hedge(failed=not attempts):
+                    hedged = True
+                    hedge = self._pick([r for r in self._routes if r is not primary] or [primary])
+                    self._hedges += 1
+                    self._health[hedge.name].hedges += 1
+                    logger.info(
+                        "%s attempt on route %s, sending another to %s",
+                        "Failed" if not attempts else "Slow",
+                        primary.name,
+                        hedge.name,
+                    )
+                    attempts[self._start(hedge, operation)] = hedge
+                elif not done and timeout is not None:
+                    hedged = True  # Not allowed to hedge; just wait for the attempt
+
+            assert last_error is not None
+            raise last_error
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    async def _stream(
+        self, operation: Callable[[AIProvider], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        self._calls += 1
+        route = self._pick(self._routes)
+        health = self._health[route.name]
+        started = self._clock()
+        # Measured to the first chunk, comparable to a full non-streaming call
+        measured = False
+        try:
+            async for chunk in operation(route.provider):
+                if not measured:
+                    measured = True
+                    health.record(self._clock() - started, failed=False)
+                yield chunk
+        except Exception:
+            if not measured:
+                health.record(self._clock() - started, failed=True)
+            raise
+        if not measured:
+            health.record(self._clock() - started, failed=False)
+
+    def _start(
+        self, route: Route, operation: Callable[[AIProvider], Awaitable[T]]
+    ) -> "asyncio.Task[T]":
+        started = self._clock()
+
+        async def attempt() -> T:
+            failed: Optional[bool] = True
+            try:
+                result = await operation(route.provider)
+                failed = False
+                return result
+            except asyncio.CancelledError:
+                # The other attempt won; no verdict on this route
+                failed = None
+                raise
+            finally:
+                if failed is not None:
+                    self._health[route.name].record(self._clock() - started, failed)
+
+        task = asyncio.create_task(attempt())
+        # A losing attempt may fail after the winner returned; nobody awaits it
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    def _pick(self, routes: Sequence[Route]) -> Route:
+        if len(routes) == 1:
+            return routes[0]
+        return self._rng.choices(routes, weights=self._effective_weights(routes))[0]
+
+    def _effective_weights(self, routes: Sequence[Route]) -> list[float]:
+        """Configured weights scaled by success rate and relative speed."""
+        latencies = [self._health[r.name].latency for r in routes]
+        known = [latency for latency in latencies if latency is not None]
+        # Unmeasured routes count as average so they get traffic and get measured
+        typical = sum(known) / len(known) if known else 1.0
+        weights = []
+        for route, latency in zip(routes, latencies):
+            health = self._health[route.name]
+            success = max(1.0 - health.error_rate, 0.05)
+            speed = typical / max(latency if latency is not None else typical, 1e-3)
+            weights.append(route.weight * success**2 * speed)
+        # Keep every route probed with at least 2% of the traffic
+        floor = 0.02 * sum(weights)
+        return [max(weight, floor) for weight in weights]
+
+    def _hedge_delay(self, route: Route) -> Optional[float]:
+        health = self._health[route.name]
+        if self._max_hedge_ratio <= 0 or len(health.recent) < self._min_samples:
+            return None
+        return max(health.percentile(self._hedge_percentile), self._min_hedge_delay)
+
+    def _may_hedge(self, failed: bool) -> bool:
+        if failed:
+            # Failing over is always allowed when there is somewhere else to go
+            return len(self._routes) > 1
+        return self._hedges < self._max_hedge_ratio * self._calls
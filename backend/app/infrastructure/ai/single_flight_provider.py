@@ -0,0 +1,65 @@
+"""AI provider decorator coalescing identical in-flight requests."""
+
+from typing import Any, Optional
+
+from app.application.content_key import content_key
+from app.application.interfaces.ai_provider import AIProvider
+from app.application.single_flight import SingleFlight
+from app.domain.value_objects.code_explanation import CodeExplanation
+from app.domain.value_objects.code_refactor import CodeRefactor
+from app.domain.value_objects.code_snippet import CodeSnippet
+from app.domain.value_objects.test_scaffold import TestScaffold
+from app.infrastructure.ai.delegating_provider import DelegatingAIProvider
+
+
+class SingleFlightAIProvider(DelegatingAIProvider):
+    """
+    Share one upstream call between identical concurrent requests.
+
+    While a request for a given operation, snippet and option is in flight,
+    identical requests await its result instead of calling the wrapped
+    provider again. Streaming calls are forwarded unchanged.
+    """
+
+    def __init__(self, inner: AIProvider, single_flight: Optional[SingleFlight] = None) -> None:
+        """
+        Initialize the decorator.
+
+        Args:
+            inner: The provider performing the actual calls
+            single_flight: Coalescing group; a private one when omitted
+        """
+        super().__init__(inner)
+        self._single_flight = single_flight or SingleFlight()
+
+    @property
+    def single_flight(self) -> SingleFlight:
+        """The coalescing group, exposed for observability."""
+        return self._single_flight
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._inner.stats(), "single_flight": self._single_flight.stats()}
+
+    async def explain_code(self, code_snippet: CodeSnippet) -> CodeExplanation:
+        key = self._key("explain", code_snippet)
+        return await self._single_flight.do(key, lambda: self._inner.explain_code(code_snippet))
+
+    async def refactor_code(
+        self, code_snippet: CodeSnippet, goal: Optional[str] = None
+    ) -> CodeRefactor:
+        key = self._key("refactor", code_snippet, goal)
+        return await self._single_flight.do(
+            key, lambda: self._inner.refactor_code(code_snippet, goal)
+        )
+
+    async def generate_tests(
+        self, code_snippet: CodeSnippet, test_framework: Optional[str] = None
+    ) -> TestScaffold:
+        key = self._key("tests", code_snippet, test_framework)
+        return await self._single_flight.do(
+            key, lambda: self._inner.generate_tests(code_snippet, test_framework)
+        )
+
+    @staticmethod
+    def _key(operation: str, code_snippet: CodeSnippet, option: Optional[str] = None) -> str:
+        return content_key(operation, code_snippet.content, code_snippet.language, option)
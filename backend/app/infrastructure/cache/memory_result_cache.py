@@ -0,0 +1,145 @@
+"""In-process result cache with TTL expiry and a byte budget."""
+
+import logging
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel
+
+from app.application.interfaces.result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory held by a cached value, in bytes."""
+    if isinstance(value, BaseModel):
+        return len(value.model_dump_json().encode("utf-8"))
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float
+
+
+class MemoryResultCache(ResultCache):
+    """
+    LRU result cache bounded by the total size of its values.
+
+    Entries expire after their TTL; when storing a value would exceed the byte
+    budget, the least recently used entries are evicted first. Values larger
+    than the whole budget are not cached.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: float = 3600.0,
+        sizer: Callable[[Any], int] = estimate_size,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget for cached values, in bytes
+            default_ttl: Time to live in seconds for entries stored without a TTL
+            sizer: Function estimating the size of a value in bytes
+            clock: Monotonic clock, injectable for tests
+        """
+        self._max_bytes = max_bytes
+        self._default_ttl = default_ttl
+        self._sizer = sizer
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, refreshing its recency."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        if entry.expires_at <= self._clock():
+            self._remove(key)
+            self._expirations += 1
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry.value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting least recently used entries to fit the budget."""
+        size = self._sizer(value)
+        if key in self._entries:
+            self._remove(key)
+
+        if size > self._max_bytes:
+            logger.debug("Not caching %s byte result: exceeds cache budget", size)
+            return
+
+        self._evict_until_fits(size)
+
+        expires_at = self._clock() + (self._default_ttl if ttl is None else ttl)
+        self._entries[key] = _Entry(value=value, size=size, expires_at=expires_at)
+        self._bytes += size
+
+    async def delete(self, key: str) -> None:
+        """Remove a key if present."""
+        if key in self._entries:
+            self._remove(key)
+
+    async def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and current memory usage."""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": self._hits / lookups if lookups else 0.0,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+        }
+
+    def _evict_until_fits(self, incoming: int) -> None:
+        """Drop expired entries, then LRU entries, until ``incoming`` bytes fit."""
+        if self._bytes + incoming <= self._max_bytes:
+            return
+
+        now = self._clock()
+        for key in [k for k, e in self._entries.items() if e.expires_at <= now]:
+            self._remove(key)
+            self._expirations += 1
+
+        while self._entries and self._bytes + incoming > self._max_bytes:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self._evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
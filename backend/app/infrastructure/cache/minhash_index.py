@@ -0,0 +1,228 @@
+"""In-process MinHash/LSH index of previously processed snippets."""
+
+from array import array
+from collections import Counter, OrderedDict
+from typing import Any, Optional, Sequence, Union
+
+from app.application.interfaces.similarity_index import SimilarityIndex, SimilarMatch
+from app.domain.services.code_canonicalization_service import CodeCanonicalizationService
+
+_MASK64 = (1 << 64) - 1
+_MASK32 = (1 << 32) - 1
+_EMPTY = _MASK32  # Larger than any 32-bit bin value after the bin bits are dropped
+_DENSIFY_STEP = 0x9E3779B1  # Keeps borrowed bin values distinct from their source
+
+# Keywords of common languages, kept as they are when identifiers are renamed
+_KEYWORDS = frozenset(
+    "and as assert async await break case catch class const continue def default del delete "
+    "do elif else enum except export extends false False final finally fn for from func "
+    "function if impl import in interface is lambda let match module new nil none None not "
+    "null or package pass private protected pub public raise return self static struct super "
+    "switch this throw throws true True try type typeof var void while with yield".split()
+)
+
+# Most buckets hold a single key, stored bare to save a list per bucket
+_Bucket = Union[str, list[str]]
+
+
+class MinHashIndex(SimilarityIndex):
+    """
+    LRU-bounded MinHash index with locality-sensitive hashing.
+
+    Each snippet is reduced to a set of features: the token shingles of
+    its structure, with every identifier (other than keywords and attribute
+    names) replaced by its order of first appearance, plus its identifiers
+    themselves. A copy with a renamed variable keeps its structure and most
+    of its vocabulary, so it stays highly similar. The set is summarized by
+    a one-permutation MinHash signature (one hash per feature, so inserts
+    cost a single pass over the code) whose agreement rate estimates the
+    Jaccard similarity of two sets.
+
+    Signatures are split into bands; snippets sharing any band land in the
+    same bucket, so a lookup only compares against a handful of candidates
+    whatever the index size (buckets keep their newest ``max_bucket_size``
+    snippets, and only the candidates sharing the most bands are compared in
+    full). The least recently added or matched snippets are evicted beyond
+    ``max_entries`` (roughly 1 KB each).
+
+    Hashes use Python's per-process string hashing; like the index itself,
+    they are never persisted.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 50000,
+        num_hashes: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+        max_bucket_size: int = 32,
+        max_compared: int = 8,
+    ) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            max_entries: Snippets kept before the least recently used are evicted
+            num_hashes: MinHash signature length
+            bands: LSH bands the signature is split into; more bands find
+                less similar candidates at the cost of more comparisons
+            shingle_size: Tokens per shingle
+            max_bucket_size: Snippets kept per bucket, newest first; bounds the
+                comparisons per lookup when many snippets share boilerplate
+            max_compared: Candidates whose full signatures are compared per lookup
+        """
+        if num_hashes % bands:
+            raise ValueError("num_hashes must be a multiple of bands")
+
+        self._max_entries = max_entries
+        self._num_hashes = num_hashes
+        self._rows = num_hashes // bands
+        self._shingle_size = shingle_size
+        self._max_bucket_size = max_bucket_size
+        self._max_compared = max_compared
+        self._entries: OrderedDict[str, "array[int]"] = OrderedDict()
+        self._buckets: list[dict[int, _Bucket]] = [{} for _ in range(bands)]
+        self._lookups = 0
+        self._matches = 0
+        self._evictions = 0
+
+    def add(self, key: str, code: str, language: Optional[str] = None) -> None:
+        """Index a snippet, evicting the least recently used beyond the size bound."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+
+        signature = self._signature(code, language)
+        if signature is None:
+            return
+
+        self._entries[key] = signature
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets.get(band_key)
+            if bucket is None:
+                buckets[band_key] = key
+            elif isinstance(bucket, str):
+                buckets[band_key] = [bucket, key]
+            else:
+                bucket.append(key)
+                if len(bucket) > self._max_bucket_size:
+                    del bucket[0]
+
+        while len(self._entries) > self._max_entries:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def find(
+        self, code: str, language: Optional[str] = None, min_similarity: float = 0.9
+    ) -> Optional[SimilarMatch]:
+        """Return the most similar indexed snippet sharing at least one band."""
+        self._lookups += 1
+        signature = self._signature(code, language)
+        if signature is None:
+            return None
+
+        # Snippets sharing more bands are likelier to be similar; compare those
+        shared_bands: Counter[str] = Counter()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets.get(band_key)
+            if isinstance(bucket, str):
+                shared_bands[bucket] += 1
+            elif bucket is not None:
+                shared_bands.update(bucket)
+
+        best: Optional[SimilarMatch] = None
+        for key, _ in shared_bands.most_common(self._max_compared):
+            agreeing = sum(a == b for a, b in zip(signature, self._entries[key]))
+            similarity = agreeing / self._num_hashes
+            if similarity >= min_similarity and (best is None or similarity > best.similarity):
+                best = SimilarMatch(key=key, similarity=similarity)
+
+        if best is not None:
+            self._matches += 1
+            self._entries.move_to_end(best.key)
+        return best
+
+    def remove(self, key: str) -> None:
+        """Remove a snippet if present."""
+        if key in self._entries:
+            self._remove(key)
+
+    def stats(self) -> dict[str, Any]:
+        """Entry count, lookups and matches."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "lookups": self._lookups,
+            "matches": self._matches,
+            "evictions": self._evictions,
+        }
+
+    def _signature(self, code: str, language: Optional[str]) -> Optional["array[int]"]:
+        tokens = CodeCanonicalizationService.tokens(code, language)
+        if not tokens:
+            return None
+
+        bins = self._num_hashes
+        signature = [_EMPTY] * bins
+        for shingle_hash in self._shingle_hashes(tokens):
+            shingle_hash &= _MASK64
+            index = shingle_hash % bins
+            value = (shingle_hash // bins) & _MASK32
+            if value < signature[index]:
+                signature[index] = value
+
+        # Densify: an empty bin borrows from the next filled one, so small
+        # snippets still get comparable signatures
+        for index in range(bins):
+            if signature[index] == _EMPTY:
+                for distance in range(1, bins):
+                    borrowed = signature[(index + distance) % bins]
+                    if borrowed != _EMPTY:
+                        signature[index] = (borrowed + distance * _DENSIFY_STEP) % _EMPTY
+                        break
+        return array("I", signature)
+
+    def _shingle_hashes(self, tokens: Sequence[str]) -> set[int]:
+        structure = _rename_identifiers(tokens)
+        size = min(self._shingle_size, len(structure))
+        hashes = set(map(hash, zip(*(structure[offset:] for offset in range(size)))))
+        # Shingles are tuples, so a bare word never collides with one
+        hashes.update(hash(token) for token in tokens if _is_identifier(token))
+        return hashes
+
+    def _band_keys(self, signature: "array[int]") -> tuple[int, ...]:
+        rows = self._rows
+        return tuple(
+            hash(tuple(signature[start : start + rows]))
+            for start in range(0, self._num_hashes, rows)
+        )
+
+    def _remove(self, key: str) -> None:
+        signature = self._entries.pop(key)
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets.get(band_key)
+            if bucket == key:
+                del buckets[band_key]
+            elif isinstance(bucket, list) and key in bucket:
+                bucket.remove(key)
+                if len(bucket) == 1:
+                    buckets[band_key] = bucket[0]
+            # Otherwise pushed out of a full bucket earlier
+
+
+def _rename_identifiers(tokens: Sequence[str]) -> list[str]:
+    """Replace each distinct identifier by its order of first appearance."""
+    names: dict[str, str] = {}
+    renamed = []
+    previous = ""
+    for token in tokens:
+        # Attribute and method names are usually an API's, not the author's choice
+        if previous != "." and _is_identifier(token):
+            token = names.setdefault(token, f"${len(names)}")
+        renamed.append(token)
+        previous = token
+    return renamed
+
+
+def _is_identifier(token: str) -> bool:
+    return (token[0].isalpha() or token[0] == "_") and token not in _KEYWORDS
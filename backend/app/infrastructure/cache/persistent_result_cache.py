@@ -0,0 +1,186 @@
+"""Result cache backed by a persistent store, surviving restarts."""
+
+import logging
+import time
+from collections import Counter
+from typing import Any, Callable, Iterable, Optional, Type
+
+from pydantic import BaseModel
+
+from app.application.interfaces.command_repository import ResultCommandRepository
+from app.application.interfaces.query_repository import ResultQueryRepository, StoredResult
+from app.application.interfaces.result_cache import ResultCache
+from app.infrastructure.cache.result_codec import ResultCodec
+
+logger = logging.getLogger(__name__)
+
+
+class PersistentResultCache(ResultCache):
+    """
+    In-memory result cache in front of a persistent result store.
+
+    Results are written through to the store as zlib-compressed JSON tagged
+    with their type, and looked up there on a memory miss (and then kept in
+    memory again). Only results of the registered pydantic types are
+    persisted; others are cached in memory only. Hits are counted and written
+    to the store in batches, so after a restart ``warm_up`` can load the most
+    used results back into memory before traffic arrives. Store failures are
+    logged and treated as misses: without the store the cache degrades to
+    memory only.
+    """
+
+    def __init__(
+        self,
+        memory: ResultCache,
+        queries: ResultQueryRepository,
+        commands: ResultCommandRepository,
+        value_types: Iterable[Type[BaseModel]],
+        default_ttl: float = 3600.0,
+        max_entries: int = 100000,
+        compression_level: int = 6,
+        hit_flush_threshold: int = 100,
+        prune_interval: int = 1000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            memory: Cache holding results in memory
+            queries: Reads results from the store
+            commands: Writes results to the store
+            value_types: Result types that are persisted, by class name
+            default_ttl: Time to live in seconds for results stored without a TTL
+            max_entries: Results kept in the store; least recently used go first
+            compression_level: zlib level of stored payloads (1 fastest, 9 smallest)
+            hit_flush_threshold: Hits counted in memory before being written out
+            prune_interval: Writes between removals of expired and excess results
+            clock: Wall clock for expiry times that outlive the process, injectable for tests
+        """
+        self._memory = memory
+        self._queries = queries
+        self._commands = commands
+        self._codec = ResultCodec(value_types, compression_level)
+        self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._hit_flush_threshold = hit_flush_threshold
+        self._prune_interval = prune_interval
+        self._clock = clock
+        self._pending_hits: Counter[str] = Counter()
+        self._store_hits = 0
+        self._store_writes = 0
+        self._store_errors = 0
+        self._warmed = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the result from memory, or from the store on a memory miss."""
+        value = await self._memory.get(key)
+        if value is None:
+            try:
+                stored = await self._queries.get(key)
+                if stored is None:
+                    return None
+                value = self._codec.decode(stored.payload)
+                if value is None:
+                    await self._commands.delete(key)
+                    return None
+            except Exception as e:
+                self._store_failed("lookup", e)
+                return None
+            self._store_hits += 1
+            await self._memory.set(key, value, stored.expires_at - self._clock())
+
+        await self._record_hit(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a result in memory and, if of a persisted type, in the store."""
+        ttl = self._default_ttl if ttl is None else ttl
+        await self._memory.set(key, value, ttl)
+
+        payload = self._codec.encode(value)
+        if payload is None:
+            return
+        try:
+            await self._commands.put(
+                StoredResult(key=key, payload=payload, expires_at=self._clock() + ttl)
+            )
+            self._store_writes += 1
+            if self._store_writes % self._prune_interval == 0:
+                await self._commands.prune(self._max_entries)
+        except Exception as e:
+            self._store_failed("write", e)
+
+    async def delete(self, key: str) -> None:
+        """Remove a result from memory and the store."""
+        self._pending_hits.pop(key, None)
+        await self._memory.delete(key)
+        try:
+            await self._commands.delete(key)
+        except Exception as e:
+            self._store_failed("delete", e)
+
+    async def warm_up(self, limit: int) -> int:
+        """Prune the store, then load its most hit results into memory."""
+        try:
+            removed = await self._commands.prune(self._max_entries)
+            hottest = await self._queries.hottest(limit)
+        except Exception as e:
+            self._store_failed("warm-up", e)
+            return 0
+
+        now = self._clock()
+        loaded = 0
+        # Coldest first, so the hottest are the most recently used should memory run out
+        for stored in reversed(hottest):
+            value = self._codec.decode(stored.payload)
+            if value is not None:
+                await self._memory.set(stored.key, value, stored.expires_at - now)
+                loaded += 1
+
+        self._warmed += loaded
+        logger.info("Loaded %s stored results into memory (%s pruned)", loaded, removed)
+        return loaded
+
+    async def close(self) -> None:
+        """Write out pending hit counts and close the store."""
+        await self._flush_hits()
+        try:
+            await self._commands.close()
+            await self._queries.close()
+        except Exception as e:
+            self._store_failed("close", e)
+
+    def stats(self) -> dict[str, Any]:
+        """Memory cache statistics, counting store hits as hits."""
+        stats = dict(self._memory.stats())
+        hits = stats.get("hits", 0) + self._store_hits
+        misses = stats.get("misses", 0) - self._store_hits
+        stats.update(
+            hits=hits,
+            misses=misses,
+            hit_ratio=hits / (hits + misses) if hits + misses else 0.0,
+            store_hits=self._store_hits,
+            store_writes=self._store_writes,
+            store_errors=self._store_errors,
+            warmed=self._warmed,
+        )
+        return stats
+
+    async def _record_hit(self, key: str) -> None:
+        self._pending_hits[key] += 1
+        if self._pending_hits.total() >= self._hit_flush_threshold:
+            await self._flush_hits()
+
+    async def _flush_hits(self) -> None:
+        if self._pending_hits:
+            hits, self._pending_hits = self._pending_hits, Counter()
+            try:
+                await self._commands.record_hits(hits)
+            except Exception as e:
+                # Only warm-up order suffers from lost hit counts
+                self._store_failed("hit count write", e)
+
+    def _store_failed(self, operation: str, error: Exception) -> None:
+        self._store_errors += 1
+        logger.warning("Result store %s failed: %s", operation, error)
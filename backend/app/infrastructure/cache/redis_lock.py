@@ -0,0 +1,95 @@
+"""Redis lock shared by all replicas."""
+
+import asyncio
+import logging
+import secrets
+import time
+from typing import Any, Optional
+
+from app.application.deadline import remaining_time
+from app.application.interfaces.distributed_lock import DistributedLock
+
+logger = logging.getLogger(__name__)
+
+# Delete the lock only if it still holds our token, so an expired lock that another
+# replica has taken since is not released by mistake
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLock(DistributedLock):
+    """
+    Single-instance Redis lock (``SET NX PX`` with a random token).
+
+    Waiters poll with exponential backoff, for at most ``max_wait`` seconds
+    and never past the current request's deadline. The lock expires after
+    ``ttl`` seconds even if never released, so it must outlast the work it
+    guards; it deduplicates work rather than guaranteeing mutual exclusion,
+    which is all a cache fill needs.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        prefix: str = "locks",
+        ttl: float = 120.0,
+        max_wait: float = 60.0,
+        poll_interval: float = 0.05,
+        max_poll_interval: float = 1.0,
+    ) -> None:
+        """
+        Initialize the lock.
+
+        Args:
+            client: ``redis.asyncio`` client
+            prefix: Prefix of lock keys
+            ttl: Seconds after which a lock expires if not released
+            max_wait: Longest time ``acquire`` waits for a held lock; the request
+                deadline cuts it shorter
+            poll_interval: First wait between attempts, doubled after each
+            max_poll_interval: Longest wait between attempts
+        """
+        self._redis = client
+        self._prefix = prefix
+        self._ttl = ttl
+        self._max_wait = max_wait
+        self._poll_interval = poll_interval
+        self._max_poll_interval = max_poll_interval
+
+    async def acquire(self, name: str) -> Optional[str]:
+        token = secrets.token_hex(16)
+        key = self._key(name)
+        max_wait = self._max_wait
+        request_remaining = remaining_time()
+        if request_remaining is not None:
+            max_wait = max(min(max_wait, request_remaining), 0.0)
+        deadline = time.monotonic() + max_wait
+        interval = self._poll_interval
+        while True:
+            try:
+                if await self._redis.set(key, token, nx=True, px=int(self._ttl * 1000)):
+                    return token
+            except Exception as e:
+                # Duplicate work is better than failing requests while Redis is down
+                logger.warning("Could not take lock %s: %s", name, e)
+                return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning("Gave up waiting for lock %s after %.1fs", name, max_wait)
+                return None
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, self._max_poll_interval)
+
+    async def release(self, name: str, token: str) -> None:
+        try:
+            await self._redis.eval(_RELEASE_SCRIPT, 1, self._key(name), token)
+        except Exception as e:
+            # The lock expires on its own
+            logger.warning("Could not release lock %s: %s", name, e)
+
+    def _key(self, name: str) -> str:
+        return f"{self._prefix}:{name}"
@@ -0,0 +1,142 @@
+"""Redis result cache shared by all replicas."""
+
+import logging
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Sequence, Type
+
+from pydantic import BaseModel
+
+from app.application.interfaces.result_cache import ResultCache
+from app.infrastructure.cache.result_codec import ResultCodec
+from app.infrastructure.jobs.redis_job_backend import redis_available
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+
+def create_redis_client(url: str, max_connections: int = 50) -> "Redis":
+    """
+    Create a ``redis.asyncio`` client over a bounded connection pool.
+
+    Args:
+        url: Redis connection URL
+        max_connections: Most connections the pool opens; callers beyond it wait
+
+    Returns:
+        A client returning raw bytes
+    """
+    if not redis_available():
+        raise RuntimeError("The redis result cache requires the redis package (pip install redis)")
+    import redis.asyncio as redis
+
+    pool = redis.BlockingConnectionPool.from_url(url, max_connections=max_connections)
+    return redis.Redis(connection_pool=pool)
+
+
+class RedisResultCache(ResultCache):
+    """
+    Result cache in Redis, storing compressed, type-tagged JSON.
+
+    Entries expire through Redis TTLs. Lookups of several keys are pipelined
+    into one round trip, and ``get_many_with_ttl`` also returns the time each
+    entry has left, so copies kept elsewhere can expire with it. Only results
+    of the registered pydantic types are stored.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        value_types: Iterable[Type[BaseModel]],
+        prefix: str = "results",
+        default_ttl: float = 3600.0,
+        compression_level: int = 6,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            client: ``redis.asyncio`` client returning raw bytes
+            value_types: Result types that are stored, by class name
+            prefix: Prefix of all keys
+            default_ttl: Time to live in seconds for results stored without a TTL
+            compression_level: zlib level of stored values (1 fastest, 9 smallest)
+        """
+        self._redis = client
+        self._codec = ResultCodec(value_types, compression_level)
+        self._prefix = prefix
+        self._default_ttl = default_ttl
+        self._hits = 0
+        self._misses = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached result for a key."""
+        (entry,) = await self.get_many_with_ttl([key])
+        return entry[0] if entry is not None else None
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[Any]]:
+        """Return the cached results for several keys in one round trip."""
+        return [
+            entry[0] if entry is not None else None for entry in await self.get_many_with_ttl(keys)
+        ]
+
+    async def get_many_with_ttl(self, keys: Sequence[str]) -> list[Optional[tuple[Any, float]]]:
+        """
+        Look up several keys in one round trip, with the time each has left.
+
+        Args:
+            keys: Content keys of the commands
+
+        Returns:
+            For each key, the result and its remaining time to live in seconds,
+            or None on a miss
+        """
+        if not keys:
+            return []
+
+        pipeline = self._redis.pipeline(transaction=False)
+        for key in keys:
+            pipeline.get(self._key(key))
+            pipeline.pttl(self._key(key))
+        replies = await pipeline.execute()
+
+        entries: list[Optional[tuple[Any, float]]] = []
+        for payload, ttl_ms in zip(replies[::2], replies[1::2]):
+            value = self._codec.decode(payload) if payload is not None else None
+            if value is None:
+                self._misses += 1
+                entries.append(None)
+                continue
+            self._hits += 1
+            # -1: no expiry (set outside this cache); -2: expired between the two commands
+            ttl = ttl_ms / 1000 if ttl_ms >= 0 else self._default_ttl
+            entries.append((value, ttl))
+        return entries
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a result, if of a registered type."""
+        payload = self._codec.encode(value)
+        if payload is None:
+            return
+        ttl = self._default_ttl if ttl is None else ttl
+        await self._redis.set(self._key(key), payload, px=max(int(ttl * 1000), 1))
+
+    async def delete(self, key: str) -> None:
+        """Remove a key if present."""
+        await self._redis.delete(self._key(key))
+
+    async def close(self) -> None:
+        """Close the client and its connection pool."""
+        await self._redis.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        """Hit and miss counters of this replica."""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": self._hits / lookups if lookups else 0.0,
+        }
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}:{key}"
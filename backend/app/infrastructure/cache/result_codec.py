@@ -0,0 +1,53 @@
+"""Compact serialization of command results for caches outside the process."""
+
+import logging
+import zlib
+from typing import Any, Iterable, Optional, Type
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCodec:
+    """
+    Encodes results of registered pydantic types as compressed, type-tagged JSON.
+
+    A payload is the zlib-compressed class name and JSON document of the
+    result, separated by a newline. Results of other types are not encoded,
+    and payloads naming a type this build does not know decode to None.
+    """
+
+    def __init__(self, value_types: Iterable[Type[BaseModel]], compression_level: int = 6) -> None:
+        """
+        Initialize the codec.
+
+        Args:
+            value_types: Result types that can be encoded, by class name
+            compression_level: zlib level of payloads (1 fastest, 9 smallest)
+        """
+        self._value_types = {value_type.__name__: value_type for value_type in value_types}
+        self._compression_level = compression_level
+
+    def encode(self, value: Any) -> Optional[bytes]:
+        """Encode a result, or return None if its type is not registered."""
+        type_name = type(value).__name__
+        if self._value_types.get(type_name) is not type(value):
+            logger.debug("Not encoding result of unregistered type %s", type_name)
+            return None
+        document = f"{type_name}\n{value.model_dump_json()}".encode("utf-8")
+        return zlib.compress(document, self._compression_level)
+
+    def decode(self, payload: bytes) -> Optional[BaseModel]:
+        """Decode a payload, or return None if it cannot be read."""
+        try:
+            type_name, _, data = zlib.decompress(payload).decode("utf-8").partition("\n")
+            value_type = self._value_types.get(type_name)
+            if value_type is None:
+                raise ValueError(f"unregistered result type {type_name}")
+            return value_type.model_validate_json(data)
+        except (zlib.error, ValueError) as e:
+            # Written by a build with other result types (decoding and validation
+            # errors are ValueErrors too)
+            logger.warning("Discarding unreadable stored result: %s", e)
+            return None
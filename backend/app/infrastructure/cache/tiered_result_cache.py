@@ -0,0 +1,166 @@
+"""Two-tier result cache: in-process L1 in front of a shared Redis L2."""
+
+import asyncio
+import logging
+import secrets
+from typing import Any, Optional, Sequence
+
+from app.application.interfaces.result_cache import ResultCache
+from app.infrastructure.cache.redis_result_cache import RedisResultCache
+
+logger = logging.getLogger(__name__)
+
+
+class TieredResultCache(ResultCache):
+    """
+    Result cache checking an in-process L1, then a Redis L2 shared by all replicas.
+
+    L2 hits are copied into L1 with the time they have left in L2, so a
+    result never outlives its shared copy. Writes go to both tiers, and
+    writes and deletes are announced on a pub/sub channel so other replicas
+    drop their L1 copy of the key. Redis failures are logged and treated as
+    misses: without L2 the cache degrades to per-replica L1.
+    """
+
+    def __init__(
+        self,
+        l1: ResultCache,
+        l2: RedisResultCache,
+        client: Any,
+        channel: str = "results:invalidate",
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            l1: In-process cache
+            l2: Shared Redis cache
+            client: ``redis.asyncio`` client for invalidation messages
+            channel: Pub/sub channel of invalidation messages
+            reconnect_delay: Seconds before resubscribing after a lost connection
+        """
+        self._l1 = l1
+        self._l2 = l2
+        self._redis = client
+        self._channel = channel
+        self._reconnect_delay = reconnect_delay
+        # Tags our own messages, which need no handling
+        self._instance_id = secrets.token_hex(8)
+        self._listener: Optional[asyncio.Task[None]] = None
+        self._l2_hits = 0
+        self._l2_errors = 0
+        self._invalidations = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the result from L1, or from L2 on an L1 miss."""
+        (value,) = await self.get_many([key])
+        return value
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[Any]]:
+        """Return results from L1, fetching all L1 misses from L2 in one round trip."""
+        self._ensure_listening()
+        values = [await self._l1.get(key) for key in keys]
+        missing = [index for index, value in enumerate(values) if value is None]
+        if not missing:
+            return values
+
+        try:
+            entries = await self._l2.get_many_with_ttl([keys[index] for index in missing])
+        except Exception as e:
+            self._l2_errors += 1
+            logger.warning("Result cache L2 lookup failed: %s", e)
+            return values
+
+        for index, entry in zip(missing, entries):
+            if entry is not None:
+                value, ttl = entry
+                await self._l1.set(keys[index], value, ttl)
+                values[index] = value
+                self._l2_hits += 1
+        return values
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a result in both tiers and drop other replicas' L1 copies."""
+        self._ensure_listening()
+        await self._l1.set(key, value, ttl)
+        try:
+            await self._l2.set(key, value, ttl)
+            await self._publish_invalidation(key)
+        except Exception as e:
+            self._l2_errors += 1
+            logger.warning("Result cache L2 write failed: %s", e)
+
+    async def delete(self, key: str) -> None:
+        """Remove a result from both tiers and from other replicas' L1."""
+        await self._l1.delete(key)
+        try:
+            await self._l2.delete(key)
+            await self._publish_invalidation(key)
+        except Exception as e:
+            self._l2_errors += 1
+            logger.warning("Result cache L2 delete failed: %s", e)
+
+    async def warm_up(self, limit: int) -> int:
+        """Start listening for invalidations and warm up L1."""
+        self._ensure_listening()
+        return await self._l1.warm_up(limit)
+
+    async def close(self) -> None:
+        """Stop listening for invalidations and close both tiers."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._l1.close()
+        await self._l2.close()
+
+    def stats(self) -> dict[str, Any]:
+        """L1 statistics, counting L2 hits as hits, plus L2 counters."""
+        stats = dict(self._l1.stats())
+        hits = stats.get("hits", 0) + self._l2_hits
+        misses = stats.get("misses", 0) - self._l2_hits
+        stats.update(
+            hits=hits,
+            misses=misses,
+            hit_ratio=hits / (hits + misses) if hits + misses else 0.0,
+            l2_hits=self._l2_hits,
+            l2_errors=self._l2_errors,
+            invalidations=self._invalidations,
+        )
+        return stats
+
+    async def _publish_invalidation(self, key: str) -> None:
+        await self._redis.publish(self._channel, f"{self._instance_id} {key}")
+
+    def _ensure_listening(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        """Drop L1 copies of keys other replicas wrote or deleted."""
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(self._channel)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = message["data"]
+                    sender, _, key = (data.decode() if isinstance(data, bytes) else data).partition(
+                        " "
+                    )
+                    if sender != self._instance_id:
+                        await self._l1.delete(key)
+                        self._invalidations += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Writes missed while disconnected may leave stale L1 copies until they expire
+                logger.warning("Result cache invalidation listener failed, resubscribing: %s", e)
+                await asyncio.sleep(self._reconnect_delay)
+            finally:
+                await pubsub.aclose()
@@ -0,0 +1,93 @@
+"""In-process job backend for single-replica deployments and tests."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from app.application.interfaces.job_backend import JobBackend
+from app.application.jobs import Job
+from app.domain.exceptions import ServiceOverloadedError
+
+
+class MemoryJobBackend(JobBackend):
+    """
+    Bounded in-memory job queue and state store.
+
+    Finished jobs are kept for ``result_ttl`` seconds. Jobs do not survive a
+    restart and are only visible to the process that created them.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 1000,
+        result_ttl: float = 3600.0,
+        retry_after: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            max_queue_size: Most jobs waiting for a worker before submissions are rejected
+            result_ttl: Seconds finished jobs are kept
+            retry_after: Retry-After hint given to clients when the queue is full
+            clock: Wall clock matching the jobs' timestamps, injectable for tests
+        """
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue_size)
+        self._jobs: dict[str, dict[str, Any]] = {}
+        self._finished: dict[str, asyncio.Event] = {}
+        # (finished_at, job_id) in finishing order, for cheap expiry
+        self._expiry: deque[tuple[float, str]] = deque()
+        self._result_ttl = result_ttl
+        self._retry_after = retry_after
+        self._clock = clock
+
+    async def enqueue(self, job: Job) -> None:
+        self._purge_expired()
+        try:
+            self._queue.put_nowait(job.id)
+        except asyncio.QueueFull:
+            raise ServiceOverloadedError("Job queue is full", retry_after=self._retry_after)
+
+        self._jobs[job.id] = job.to_dict()
+        self._finished[job.id] = asyncio.Event()
+
+    async def dequeue(self, timeout: float) -> Optional[Job]:
+        try:
+            job_id = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return await self.get(job_id)
+
+    async def save(self, job: Job) -> None:
+        # Stored as dicts so callers never share mutable state with the store
+        self._jobs[job.id] = job.to_dict()
+        if job.status.finished and job.id in self._finished:
+            self._expiry.append((job.finished_at or self._clock(), job.id))
+            self._finished[job.id].set()
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        data = self._jobs.get(job_id)
+        return Job.from_dict(data) if data is not None else None
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        finished = self._finished.get(job_id)
+        if finished is None:
+            return None
+
+        try:
+            await asyncio.wait_for(finished.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return await self.get(job_id)
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": "memory", "queued": self._queue.qsize(), "jobs": len(self._jobs)}
+
+    def _purge_expired(self) -> None:
+        cutoff = self._clock() - self._result_ttl
+        while self._expiry and self._expiry[0][0] < cutoff:
+            _, job_id = self._expiry.popleft()
+            self._jobs.pop(job_id, None)
+            self._finished.pop(job_id, None)
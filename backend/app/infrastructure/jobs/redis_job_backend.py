@@ -0,0 +1,148 @@
+"""Redis job backend shared by all replicas."""
+
+import importlib.util
+import json
+import logging
+import math
+import time
+from typing import Any, Optional
+
+from app.application.interfaces.job_backend import JobBackend
+from app.application.jobs import Job
+from app.domain.exceptions import ServiceOverloadedError
+
+logger = logging.getLogger(__name__)
+
+# Store the job and queue it only if the queue has room, atomically
+_ENQUEUE_SCRIPT = """
+if redis.call('LLEN', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+redis.call('LPUSH', KEYS[1], ARGV[4])
+return 1
+"""
+
+
+def redis_available() -> bool:
+    """Whether the optional ``redis`` package is installed."""
+    return importlib.util.find_spec("redis") is not None
+
+
+class RedisJobBackend(JobBackend):
+    """
+    Job queue in a Redis list, with job state in expiring JSON keys.
+
+    Workers of every replica pop from the same list, and completion is
+    announced on a per-job pub/sub channel so long-polling clients on any
+    replica wake up immediately. A job whose worker died mid-run stays
+    ``running`` until its key expires.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        prefix: str = "jobs",
+        max_queue_size: int = 1000,
+        result_ttl: int = 3600,
+        retry_after: float = 5.0,
+        client: Optional[Any] = None,
+    ) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            url: Redis connection URL
+            prefix: Prefix of all keys and channels
+            max_queue_size: Most jobs waiting for a worker before submissions are rejected
+            result_ttl: Seconds job state is kept after its last update
+            retry_after: Retry-After hint given to clients when the queue is full
+            client: Existing ``redis.asyncio`` client; created from ``url`` when omitted
+        """
+        if client is None:
+            if not redis_available():
+                raise RuntimeError(
+                    "The redis job backend requires the redis package (pip install redis)"
+                )
+            import redis.asyncio as redis
+
+            client = redis.from_url(url, decode_responses=True)
+
+        self._redis = client
+        self._prefix = prefix
+        self._max_queue_size = max_queue_size
+        self._result_ttl = result_ttl
+        self._retry_after = retry_after
+
+    async def enqueue(self, job: Job) -> None:
+        queued = await self._redis.eval(
+            _ENQUEUE_SCRIPT,
+            2,
+            self._queue_key,
+            self._job_key(job.id),
+            self._max_queue_size,
+            json.dumps(job.to_dict()),
+            self._result_ttl,
+            job.id,
+        )
+        if not queued:
+            raise ServiceOverloadedError("Job queue is full", retry_after=self._retry_after)
+
+    async def dequeue(self, timeout: float) -> Optional[Job]:
+        # BRPOP takes whole seconds; 0 would block forever
+        popped = await self._redis.brpop(self._queue_key, timeout=max(math.ceil(timeout), 1))
+        if popped is None:
+            return None
+
+        _, job_id = popped
+        job = await self.get(job_id)
+        if job is None:
+            logger.warning("Dropping job %s: state expired before it was run", job_id)
+        return job
+
+    async def save(self, job: Job) -> None:
+        await self._redis.set(self._job_key(job.id), json.dumps(job.to_dict()), ex=self._result_ttl)
+        if job.status.finished:
+            await self._redis.publish(self._done_channel(job.id), job.status.value)
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        data = await self._redis.get(self._job_key(job_id))
+        return Job.from_dict(json.loads(data)) if data is not None else None
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        pubsub = self._redis.pubsub()
+        channel = self._done_channel(job_id)
+        await pubsub.subscribe(channel)
+        try:
+            # Subscribe first, then check, so a completion in between is not missed
+            job = await self.get(job_id)
+            deadline = time.monotonic() + timeout
+            while job is not None and not job.status.finished:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=remaining
+                )
+                if message is not None:
+                    job = await self.get(job_id)
+            return job
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": "redis", "max_queue_size": self._max_queue_size}
+
+    @property
+    def _queue_key(self) -> str:
+        return f"{self._prefix}:queue"
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self._prefix}:job:{job_id}"
+
+    def _done_channel(self, job_id: str) -> str:
+        return f"{self._prefix}:done:{job_id}"
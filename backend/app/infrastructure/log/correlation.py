@@ -0,0 +1,37 @@
+"""Correlation ID carried through a request's context and into its log records."""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
+
+def get_correlation_id() -> Optional[str]:
+    """Correlation ID of the request being handled by the current task, if any."""
+    return _correlation_id.get()
+
+
+@contextmanager
+def correlation_scope(correlation_id: str) -> Iterator[None]:
+    """Tag the enclosed work (and tasks it creates) with ``correlation_id``."""
+    token = _correlation_id.set(correlation_id)
+    try:
+        yield
+    finally:
+        _correlation_id.reset(token)
+
+
+class CorrelationIdFilter(logging.Filter):
+    """
+    Add ``correlation_id`` to every record passing through a handler.
+
+    Attach to handlers rather than loggers: logger filters do not apply to
+    records propagated from child loggers. Records logged outside a request
+    get ``"-"``.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = _correlation_id.get() or "-"
+        return True
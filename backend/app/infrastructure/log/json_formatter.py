@@ -0,0 +1,46 @@
+"""One-line JSON log records for log shippers."""
+
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any
+
+# Attributes every LogRecord has; anything else was passed via ``extra``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+    "correlation_id",
+    "sampled",
+}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as single-line JSON objects.
+
+    Emits timestamp, level, logger, message, the correlation ID when set,
+    the formatted exception when present, and any ``extra`` fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        correlation_id = getattr(record, "correlation_id", "-")
+        if correlation_id != "-":
+            entry["correlation_id"] = correlation_id
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+
+        return json.dumps(entry, default=str, ensure_ascii=False)
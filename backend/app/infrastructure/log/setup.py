@@ -0,0 +1,118 @@
+"""Process-wide logging configuration."""
+
+import copy
+import logging
+import queue
+import sys
+import zlib
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.infrastructure.log.correlation import CorrelationIdFilter
+from app.infrastructure.log.json_formatter import JsonFormatter
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(correlation_id)s] - %(message)s"
+
+# Pass as ``extra`` to mark a high-volume line that ``SamplingFilter`` may drop
+SAMPLED = {"sampled": True}
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of records marked as sampled.
+
+    Records logged with ``extra=SAMPLED`` below WARNING are kept for
+    ``rate`` of requests; everything else always passes. The decision hashes
+    the correlation ID, so all sampled lines of one request are kept or
+    dropped together. Must run after ``CorrelationIdFilter``.
+    """
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self._threshold = rate * 2**32
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False) or record.levelno >= logging.WARNING:
+            return True
+        key = getattr(record, "correlation_id", "-")
+        if key == "-":
+            key = f"{record.thread}:{record.relativeCreated}"
+        return zlib.crc32(key.encode()) < self._threshold
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hand records to a ``QueueListener`` thread without formatting or blocking.
+
+    Only the message and exception text are rendered on the calling thread
+    (arguments may be mutated after the call returns); output formatting and
+    I/O happen on the listener thread. When the queue is full the record is
+    dropped rather than stalling the event loop.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(
+    level: str = "INFO",
+    log_format: str = "text",
+    non_blocking: bool = False,
+    sample_rate: float = 1.0,
+    queue_size: int = 10000,
+) -> Optional[QueueListener]:
+    """
+    Configure the root logger.
+
+    Args:
+        level: Root log level name
+        log_format: ``text`` for human-readable lines, ``json`` for one JSON
+            object per line
+        non_blocking: Write through a queue and a background thread so slow
+            output never blocks the event loop
+        sample_rate: Fraction of requests whose sampled lines are kept
+        queue_size: Records buffered for the background thread before
+            new ones are dropped
+
+    Returns:
+        In non-blocking mode the listener writing queued records, to be
+        started and stopped (which flushes it) with the application;
+        otherwise None
+    """
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+
+    # Filters run where the record is created: the correlation ID lives in the
+    # request's context, which the listener thread cannot see
+    front: logging.Handler = output
+    listener = None
+    if non_blocking:
+        front = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+        listener = QueueListener(front.queue, output, respect_handler_level=True)
+    front.addFilter(CorrelationIdFilter())
+    if sample_rate < 1.0:
+        front.addFilter(SamplingFilter(sample_rate))
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(front)
+    root.setLevel(getattr(logging, level.upper()))
+    return listener
@@ -0,0 +1,274 @@
+"""Minimal Prometheus-compatible metrics registry with text exposition."""
+
+import bisect
+import math
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Optional, Sequence, TypeVar, Union
+
+# Seconds; spans cache hits (milliseconds) to slow completions (a minute)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+LabelValues = tuple[str, ...]
+# A single value, or (label values, value) samples of a labelled metric
+CallbackResult = Union[float, Iterable[tuple[LabelValues, float]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._samples())
+        return lines
+
+    @abstractmethod
+    def _samples(self) -> list[str]:
+        """Sample lines of the metric in text exposition format."""
+        pass
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._bounds = sorted(float(bound) for bound in buckets)
+        # Per label set: per-bucket (non-cumulative) counts incl. +Inf, sum
+        self._series: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = ([0] * (len(self._bounds) + 1), [0.0])
+        series[0][bisect.bisect_left(self._bounds, value)] += 1
+        series[1][0] += value
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip([*self._bounds, math.inf], counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """
+    Gauge or counter whose value is read from callbacks at scrape time.
+
+    A callback either reports all samples of the metric, or is set for one
+    set of label values with ``set_callback`` and reports only that sample.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], CallbackResult],
+        labelnames: Sequence[str] = (),
+        type_name: str = "gauge",
+        labels: Optional[dict[str, str]] = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.type_name = type_name
+        self._callbacks: dict[LabelValues, Callable[[], CallbackResult]] = {}
+        self._callbacks[() if labels is None else self._key(labels)] = callback
+
+    def set_callback(self, callback: Callable[[], CallbackResult], **labels: str) -> None:
+        """Set (or replace) the callback reporting the sample of ``labels``."""
+        self._callbacks[self._key(labels)] = callback
+
+    def _samples(self) -> list[str]:
+        samples: list[tuple[LabelValues, float]] = []
+        for key, callback in self._callbacks.items():
+            result = callback()
+            if isinstance(result, (int, float)):
+                samples.append((key, float(result)))
+            else:
+                samples.extend(result)
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in samples
+        ]
+
+
+M = TypeVar("M", bound=_Metric)
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered in the Prometheus text format.
+
+    Metric constructors return the already registered metric of the same name,
+    so independent components can declare the metrics they share. Updates are
+    not locked: they are meant to happen on the event loop thread.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], CallbackResult],
+        labelnames: Sequence[str] = (),
+        type_name: str = "gauge",
+        labels: Optional[dict[str, str]] = None,
+    ) -> CallbackMetric:
+        """
+        Register (or replace) a metric read from ``callback`` at scrape time.
+
+        With ``labels``, ``callback`` reports the single sample of those label
+        values and only replaces the callback registered for the same values,
+        so each instance of a component (e.g. each upstream route) can report
+        its own sample of a shared metric.
+        """
+        if labels is None:
+            metric = CallbackMetric(name, documentation, callback, labelnames, type_name)
+            self._metrics[name] = metric
+            return metric
+
+        existing = self._metrics.get(name)
+        if isinstance(existing, CallbackMetric) and existing.labelnames == tuple(labels):
+            existing.set_callback(callback, **labels)
+            return existing
+        metric = CallbackMetric(name, documentation, callback, tuple(labels), type_name, labels)
+        self._metrics[name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(
+        self,
+        cls: type[M],
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        **kwargs: Sequence[float],
+    ) -> M:
+        existing = self._metrics.get(name)
+        if existing is None:
+            metric = cls(name, documentation, labelnames, **kwargs)
+            self._metrics[name] = metric
+            return metric
+        if not isinstance(existing, cls) or existing.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} is already registered with other type or labels")
+        return existing
@@ -1,3 +1,78 @@
 """
 Command repository concrete implementation for the application.
 """
+
+import sqlite3
+import time
+from typing import Callable, Mapping
+
+from app.application.interfaces.command_repository import ResultCommandRepository
+from app.application.interfaces.query_repository import StoredResult
+from app.infrastructure.repositories.sqlite_database import SqliteDatabase
+
+
+class SqliteResultCommandRepository(ResultCommandRepository):
+    """Writes persisted results to a SQLite database."""
+
+    def __init__(self, database: SqliteDatabase, clock: Callable[[], float] = time.time) -> None:
+        """
+        Initialize the repository.
+
+        Args:
+            database: Connection used for writes only
+            clock: Wall clock matching the results' expiry times, injectable for tests
+        """
+        self._database = database
+        self._clock = clock
+
+    async def put(self, result: StoredResult) -> None:
+        """Insert or replace a result, keeping the hits of the one it replaces."""
+        now = self._clock()
+        await self._database.run(
+            lambda connection: connection.execute(
+                "INSERT INTO results (key, payload, expires_at, hits, last_access)"
+                " VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET"
+                " payload = excluded.payload, expires_at = excluded.expires_at,"
+                " last_access = excluded.last_access",
+                (result.key, result.payload, result.expires_at, result.hits, now),
+            )
+        )
+
+    async def delete(self, key: str) -> None:
+        """Remove a result if present."""
+        await self._database.run(
+            lambda connection: connection.execute("DELETE FROM results WHERE key = ?", (key,))
+        )
+
+    async def record_hits(self, hits: Mapping[str, int]) -> None:
+        """Add to hit counts in a single transaction."""
+        now = self._clock()
+        updates = [(count, now, key) for key, count in hits.items()]
+        await self._database.run(
+            lambda connection: connection.executemany(
+                "UPDATE results SET hits = hits + ?, last_access = ? WHERE key = ?", updates
+            )
+        )
+
+    async def prune(self, max_entries: int) -> int:
+        """Remove expired results, then the least recently used beyond ``max_entries``."""
+        now = self._clock()
+
+        def prune(connection: sqlite3.Connection) -> int:
+            removed = connection.execute(
+                "DELETE FROM results WHERE expires_at <= ?", (now,)
+            ).rowcount
+            (count,) = connection.execute("SELECT COUNT(*) FROM results").fetchone()
+            if count > max_entries:
+                removed += connection.execute(
+                    "DELETE FROM results WHERE key IN"
+                    " (SELECT key FROM results ORDER BY last_access LIMIT ?)",
+                    (count - max_entries,),
+                ).rowcount
+            return removed
+
+        return await self._database.run(prune)
+
+    async def close(self) -> None:
+        """Close the database connection."""
+        await self._database.close()
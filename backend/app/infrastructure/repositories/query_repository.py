@@ -1,3 +1,52 @@
 """
 Query repository concrete implementation for the application.
 """
+
+import time
+from typing import Callable, Optional
+
+from app.application.interfaces.query_repository import ResultQueryRepository, StoredResult
+from app.infrastructure.repositories.sqlite_database import SqliteDatabase
+
+
+class SqliteResultQueryRepository(ResultQueryRepository):
+    """Reads persisted results from a SQLite database."""
+
+    def __init__(self, database: SqliteDatabase, clock: Callable[[], float] = time.time) -> None:
+        """
+        Initialize the repository.
+
+        Args:
+            database: Connection used for reads only
+            clock: Wall clock matching the results' expiry times, injectable for tests
+        """
+        self._database = database
+        self._clock = clock
+
+    async def get(self, key: str) -> Optional[StoredResult]:
+        """Look up an unexpired result."""
+        now = self._clock()
+        row = await self._database.run(
+            lambda connection: connection.execute(
+                "SELECT key, payload, expires_at, hits FROM results"
+                " WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        )
+        return StoredResult(*row) if row is not None else None
+
+    async def hottest(self, limit: int) -> list[StoredResult]:
+        """Unexpired results, most hit (then most recently used) first."""
+        now = self._clock()
+        rows = await self._database.run(
+            lambda connection: connection.execute(
+                "SELECT key, payload, expires_at, hits FROM results WHERE expires_at > ?"
+                " ORDER BY hits DESC, last_access DESC LIMIT ?",
+                (now, limit),
+            ).fetchall()
+        )
+        return [StoredResult(*row) for row in rows]
+
+    async def close(self) -> None:
+        """Close the database connection."""
+        await self._database.close()
@@ -0,0 +1,84 @@
+"""SQLite connection shared by the repositories of one side (reads or writes)."""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_hits ON results (hits);
+CREATE INDEX IF NOT EXISTS results_by_last_access ON results (last_access);
+"""
+
+
+class SqliteDatabase:
+    """
+    A SQLite connection in WAL mode, used from worker threads.
+
+    In WAL mode readers never block the writer nor each other, so the query
+    and command repositories each get their own connection to the same file.
+    Calls on one connection are serialized by a lock and run in a worker
+    thread, off the event loop; ``synchronous=NORMAL`` skips the fsync per
+    commit, which in WAL mode can only lose the last commits on power loss,
+    never corrupt the file.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0) -> None:
+        """
+        Open (and if needed create) the database.
+
+        Args:
+            path: Database file; parent directories are created
+            busy_timeout: Seconds to wait for another connection's write lock
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=busy_timeout, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    async def run(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        """
+        Run ``operation`` with the connection in a worker thread, in one transaction.
+
+        Args:
+            operation: Function of the connection; its return value is returned
+
+        Returns:
+            What ``operation`` returned
+        """
+        return await asyncio.to_thread(self._run, operation)
+
+    async def close(self) -> None:
+        """Close the connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _run(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                result = operation(self._connection)
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+            return result
@@ -1,6 +1,6 @@
 from pydantic import field_validator, model_validator
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -17,11 +17,129 @@ class Settings(BaseSettings):
     openai_model: str = "gpt-4o"
     ai_provider: str = "openai"
     ai_timeout: int = 60
+    ai_max_tokens: int = 2000  # Completion length limit per upstream call
+
+    ai_single_flight_enabled: bool = True  # Coalesce identical in-flight requests
+
+    # AI Routing Settings (spread calls over several upstreams, hedge slow calls)
+    ai_routing_enabled: bool = False
+    # Routes besides the default one. openai: "model" or "model@base_url";
+    # fake: a latency spec per route
+    ai_routes: List[str] = []
+    ai_hedge_percentile: float = 0.95  # Route latency percentile after which to hedge
+    ai_hedge_min_delay: float = 0.1  # Seconds
+    ai_hedge_max_ratio: float = 0.1  # Hedges per call at most; 0 disables hedging
+
+    # AI Provider Retry Settings
+    ai_max_retries: int = 3
+    ai_retry_base_delay: float = 0.5  # Seconds, doubled per retry before jitter
+    ai_retry_max_delay: float = 20.0  # Cap for a single backoff; Retry-After is waited in full
+    ai_retry_deadline: float = 90.0  # Total budget across all attempts
+
+    # AI Provider Rate Budget Settings (client-side smoothing; unset = unlimited)
+    ai_rate_limit_rpm: Optional[int] = None
+    ai_rate_limit_tpm: Optional[int] = None
+    ai_rate_limit_max_wait: float = 10.0  # Seconds a request may queue for budget
+
+    # AI Provider Circuit Breaker Settings
+    ai_breaker_failure_rate: float = 0.5  # Failure ratio that opens the circuit
+    ai_breaker_slow_call_seconds: float = 20.0  # Calls slower than this count as slow
+    ai_breaker_slow_call_rate: float = 0.8  # Slow-call ratio that opens the circuit
+    ai_breaker_window: int = 20  # Recent calls considered
+    ai_breaker_min_calls: int = 10  # Calls needed before rates are evaluated
+    ai_breaker_open_seconds: float = 30.0  # Fast-fail period before probing again
+    ai_breaker_half_open_calls: int = 2  # Probe calls needed to close again
+
+    # AI Provider Connection Pool Settings
+    ai_max_connections: int = 100
+    ai_max_keepalive_connections: int = 20
+    ai_keepalive_expiry: float = 30.0  # Seconds an idle connection is kept open
+    ai_http2: bool = False  # Requires the h2 package (pip install httpx[http2])
+    ai_warmup_on_startup: bool = True
+    ai_warmup_connections: int = 2
+    ai_shutdown_drain_timeout: float = 10.0  # Seconds to wait for in-flight calls
+
+    # Fake AI Provider Settings (ai_provider=fake, for load testing without network)
+    fake_latency: str = "fixed:0.05"  # fixed:<s> | lognormal:<median>,<sigma> | histogram:<path>
+    fake_tokens_per_second: float = 50.0  # Streaming rate after the first token
+    fake_error_rate_429: float = 0.0
+    fake_error_rate_5xx: float = 0.0
+    fake_timeout_rate: float = 0.0
+    fake_timeout_seconds: float = 30.0  # How long an injected timeout hangs
+    fake_seed: Optional[int] = None  # Set for reproducible latencies and faults
+    # Serve the fake over a fake HTTP transport under the OpenAI provider, so injected faults
+    # also go through its retries, circuit breaker and rate budget
+    fake_http: bool = False
+
+    # Large Snippet Explanation Settings (explain chunk by chunk, then summarize)
+    explain_chunking_enabled: bool = True
+    explain_chunk_threshold: int = 12000  # Characters from which a snippet is chunked
+    explain_chunk_max_chars: int = 6000  # Largest chunk sent in one call
+    explain_chunk_concurrency: int = 4  # Chunks of one snippet explained at a time
+    # Explain Python snippets per top-level function/class, reusing unchanged units from
+    # the result cache (requires result_cache_enabled); costs a call per unit plus a summary
+    explain_incremental_enabled: bool = False
+    explain_incremental_min_chars: int = 2000  # Smaller snippets are explained in one call
+
+    # Result Cache Settings
+    result_cache_enabled: bool = True
+    result_cache_ttl: int = 3600  # Seconds
+    result_cache_max_bytes: int = 64 * 1024 * 1024
+
+    # Persistent Result Store (SQLite in WAL mode behind the result cache, so cached results
+    # survive restarts; requires result_cache_enabled)
+    result_store_enabled: bool = True
+    result_store_path: str = "data/result_store.sqlite3"
+    result_store_max_entries: int = 100000  # Least recently used beyond this are pruned
+    result_store_warmup_entries: int = 5000  # Most hit results loaded into memory at startup
+
+    # Shared Result Cache Tier (Redis at redis_url behind the in-process cache, shared by all
+    # replicas; needs the redis package; requires result_cache_enabled)
+    result_cache_redis_enabled: bool = False
+    result_cache_redis_max_connections: int = 50
+    result_cache_lock_ttl: float = 120.0  # Seconds a replica may hold a key while computing it
+    # Longest wait for another replica's result; the request deadline cuts it shorter
+    result_cache_lock_max_wait: float = 20.0
+
+    # Near-Duplicate Reuse Settings (requests with accept_similar get the explanation of a
+    # similar past snippet; requires result_cache_enabled)
+    similar_results_enabled: bool = True
+    similar_results_min_similarity: float = 0.75  # Estimated Jaccard similarity of tokens
+    similar_results_max_entries: int = 50000  # Snippets indexed, about 1 KB each
+
+    # Admission Control Settings (bounded concurrency in front of the dispatcher)
+    admission_enabled: bool = True
+    admission_max_concurrency: int = 32  # Commands executing at once
+    admission_max_queue: int = 100  # Commands waiting; beyond this requests get 429
+    admission_max_wait: float = 10.0  # Seconds a command may wait before getting 429
+
+    # Per-command concurrency caps by action (explain | refactor | tests), e.g. {"tests": 4}
+    command_concurrency_limits: Dict[str, int] = {}
+
+    # Batch Settings
+    batch_max_items: int = 100
+    batch_max_concurrency: int = 8  # Items of one batch in flight at a time
+
+    # Job Queue Settings
+    jobs_enabled: bool = True
+    job_backend: str = "memory"  # memory | redis (shared across replicas)
+    job_workers: int = 4
+    job_queue_max_size: int = 1000  # Submissions beyond this are rejected with 429
+    job_result_ttl: int = 3600  # Seconds finished jobs are kept
+    job_max_wait: float = 30.0  # Longest long-poll a client may request
+    redis_url: str = "redis://localhost:6379/0"
+
+    # Metrics Settings
+    metrics_enabled: bool = True  # Serve Prometheus text format at /metrics
 
     # Application Settings
     max_code_length: int = 50000
     log_level: str = "INFO"
-    request_timeout: int = 30
+    log_format: str = "text"  # text | json (one object per line)
+    log_non_blocking: bool = False  # Write logs from a background thread via a queue
+    log_queue_size: int = 10000  # Records buffered for that thread; overflow is dropped
+    log_sample_rate: float = 1.0  # Fraction of requests whose per-request lines are logged
+    request_timeout: int = 30  # Seconds; deadline for upstream AI calls made by a request
 
     # CORS Configuration
     cors_origins: List[str] = [
@@ -35,13 +153,42 @@ class Settings(BaseSettings):
     @field_validator("ai_provider")
     @classmethod
     def validate_ai_provider(cls, v: str) -> str:
-        if v != "openai":
-            raise ValueError("Only 'openai' is supported as ai_provider")
+        if v not in ("openai", "fake"):
+            raise ValueError("ai_provider must be 'openai' or 'fake'")
+        return v
+
+    @field_validator("log_format")
+    @classmethod
+    def validate_log_format(cls, v: str) -> str:
+        if v not in ("text", "json"):
+            raise ValueError("log_format must be 'text' or 'json'")
+        return v
+
+    @field_validator("log_sample_rate")
+    @classmethod
+    def validate_log_sample_rate(cls, v: float) -> float:
+        if not 0.0 <= v <= 1.0:
+            raise ValueError("log_sample_rate must be between 0 and 1")
+        return v
+
+    @field_validator("job_backend")
+    @classmethod
+    def validate_job_backend(cls, v: str) -> str:
+        if v not in ("memory", "redis"):
+            raise ValueError("job_backend must be 'memory' or 'redis'")
+        return v
+
+    @field_validator("command_concurrency_limits")
+    @classmethod
+    def validate_command_concurrency_limits(cls, v: Dict[str, int]) -> Dict[str, int]:
+        unknown = set(v) - {"explain", "refactor", "tests"}
+        if unknown:
+            raise ValueError(f"Unknown actions in command_concurrency_limits: {unknown}")
         return v
 
     @model_validator(mode="after")
     def validate_openai_key(self) -> "Settings":
-        if not self.openai_api_key:
+        if self.ai_provider == "openai" and not self.openai_api_key:
             raise ValueError("openai_api_key is required")
         return self
 
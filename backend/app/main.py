@@ -1,35 +1,112 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.presentation.api.v1 import explain, refactor, tests
+from app.presentation.api.v1 import batch, explain, jobs, refactor, tests
+from app.presentation.middleware.deadline_middleware import RequestDeadlineMiddleware
 from app.presentation.middleware.logging_middleware import RequestLoggingMiddleware
+from app.presentation.middleware.metrics_middleware import MetricsMiddleware
 from app.presentation.exception_handlers import (
     domain_error_handler,
     validation_error_handler,
     ai_provider_error_handler,
+    service_overloaded_handler,
     general_exception_handler,
 )
-from app.domain.exceptions import DomainError, ValidationError, AIProviderError
+from app.domain.exceptions import (
+    DomainError,
+    ValidationError,
+    AIProviderError,
+    ServiceOverloadedError,
+)
+from app.infrastructure.log.setup import configure_logging
 from app.infrastructure.settings import settings
+from app.presentation.dependencies import (
+    get_admission_controller,
+    get_ai_provider,
+    get_job_worker_pool,
+    get_metrics_registry,
+    get_result_cache,
+    get_timing_middleware,
+)
 import logging
 from datetime import datetime, timezone
 
 
 # Setup logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper()),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+log_listener = configure_logging(
+    level=settings.log_level,
+    log_format=settings.log_format,
+    non_blocking=settings.log_non_blocking,
+    sample_rate=settings.log_sample_rate,
+    queue_size=settings.log_queue_size,
 )
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start logging and job workers, warm up the AI provider and caches; stop all on shutdown."""
+    if log_listener is not None:
+        # Records logged before startup are already queued and get written now
+        log_listener.start()
+
+    ai_provider = get_ai_provider()
+
+    if settings.ai_warmup_on_startup:
+        await ai_provider.warm_up()
+
+    # Load the results most used before the restart, so they are not paid for again
+    if settings.result_cache_enabled:
+        await get_result_cache().warm_up(settings.result_store_warmup_entries)
+
+    if settings.jobs_enabled:
+        await get_job_worker_pool().start()
+
+    yield
+
+    if settings.jobs_enabled:
+        logger.info("Shutting down, stopping job workers")
+        job_pool = get_job_worker_pool()
+        await job_pool.stop(drain_timeout=settings.ai_shutdown_drain_timeout)
+        await job_pool.backend.close()
+
+    logger.info("Shutting down, closing AI provider")
+    await ai_provider.close(drain_timeout=settings.ai_shutdown_drain_timeout)
+
+    if settings.result_cache_enabled:
+        await get_result_cache().close()
+
+    if log_listener is not None:
+        # Flushes records still queued for the output thread
+        log_listener.stop()
+
+
 app = FastAPI(
     title=settings.api_title,
     description=settings.api_description,
     version=settings.api_version,
     debug=settings.debug,
+    lifespan=lifespan,
+)
+
+# Add request deadline and disconnect cancellation middleware (innermost)
+app.add_middleware(
+    RequestDeadlineMiddleware,
+    timeout=settings.request_timeout,
+    exempt_paths=["/api/v1/batch"],
 )
 
 # Add request logging middleware
 app.add_middleware(RequestLoggingMiddleware)
 
+# Add request metrics middleware
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, registry=get_metrics_registry())
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -43,26 +120,56 @@ app.add_middleware(
 app.add_exception_handler(ValidationError, validation_error_handler)
 app.add_exception_handler(DomainError, domain_error_handler)
 app.add_exception_handler(AIProviderError, ai_provider_error_handler)
+app.add_exception_handler(ServiceOverloadedError, service_overloaded_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
 # Include routers
 app.include_router(explain.router, prefix="/api/v1", tags=["explain"])
 app.include_router(refactor.router, prefix="/api/v1", tags=["refactor"])
 app.include_router(tests.router, prefix="/api/v1", tags=["tests"])
+app.include_router(batch.router, prefix="/api/v1", tags=["batch"])
+if settings.jobs_enabled:
+    app.include_router(jobs.router, prefix="/api/v1", tags=["jobs"])
 
 
 @app.get("/health")
 async def health_check():
     """Enhanced health check endpoint."""
+    ai_provider_stats = get_ai_provider().stats()
+    circuit_states = _circuit_states(ai_provider_stats)
+
     return {
-        "status": "healthy",
+        "status": "healthy" if all(state == "closed" for state in circuit_states) else "degraded",
         "api_version": settings.api_version,
         "ai_provider": settings.ai_provider,
+        "ai_provider_stats": ai_provider_stats,
+        "admission": get_admission_controller().stats(),
+        "commands": get_timing_middleware().stats(),
         "environment": "development" if settings.debug is True else "production",
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
 
 
+def _circuit_states(provider_stats: dict[str, Any]) -> list[str]:
+    """Circuit breaker states of the AI provider, or of every route's provider when routing."""
+    routes = provider_stats.get("routing", {}).get("routes", {})
+    if routes:
+        return [state for route in routes.values() for state in _circuit_states(route["upstream"])]
+    breaker = provider_stats.get("circuit_breaker")
+    return [breaker["state"]] if breaker else []
+
+
+if settings.metrics_enabled:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> PlainTextResponse:
+        """Metrics in the Prometheus text exposition format."""
+        return PlainTextResponse(
+            get_metrics_registry().render(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
 @app.get("/ping")
 async def ping():
     """Health check endpoint."""
@@ -0,0 +1,136 @@
+import logging
+from typing import Any, AsyncIterator
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.application.batch import BatchExecutor, BatchItemOutcome
+from app.application.commands.explain_code_command import ExplainCodeCommand
+from app.application.commands.generate_tests_command import GenerateTestsCommand
+from app.application.commands.refactor_code_command import RefactorCodeCommand
+from app.domain.exceptions import (
+    AIProviderError,
+    DomainError,
+    ServiceOverloadedError,
+    ValidationError,
+)
+from app.infrastructure.settings import settings
+from app.presentation.api.v1.models import (
+    BatchItemRequest,
+    BatchItemResult,
+    BatchRequest,
+    BatchResponse,
+    ErrorResponse,
+)
+from app.presentation.dependencies import get_batch_executor
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+
+@router.post("/", response_model=BatchResponse)
+async def run_batch(
+    request: BatchRequest,
+    executor: BatchExecutor = Depends(get_batch_executor),
+) -> BatchResponse:
+    """
+    Run explain, refactor and test generation for many snippets at once.
+
+    Items are processed concurrently, up to ``batch_max_concurrency`` at a
+    time. A failing item does not fail the batch: its error is reported in
+    its own result along with the status it would have had on its own.
+
+    Args:
+        request: The batch of snippets and actions
+        executor: Batch executor dependency
+
+    Returns:
+        Per-item results and errors in request order
+    """
+    commands = _to_commands(request)
+    outcomes = await executor.run(commands)
+    results = [_to_item_result(request.items[o.index], o) for o in outcomes]
+
+    succeeded = sum(1 for outcome in outcomes if outcome.ok)
+    logger.info("Batch finished: %s/%s items succeeded", succeeded, len(outcomes))
+
+    return BatchResponse(results=results, succeeded=succeeded, failed=len(outcomes) - succeeded)
+
+
+@router.post("/stream", response_class=StreamingResponse)
+async def run_batch_stream(
+    request: BatchRequest,
+    executor: BatchExecutor = Depends(get_batch_executor),
+) -> StreamingResponse:
+    """
+    Run a batch, streaming each item's result as soon as it completes.
+
+    The response is newline-delimited JSON: one ``BatchItemResult`` object
+    per line, in completion order (use ``index`` to match items).
+
+    Args:
+        request: The batch of snippets and actions
+        executor: Batch executor dependency
+
+    Returns:
+        An ``application/x-ndjson`` stream of item results
+    """
+    commands = _to_commands(request)
+
+    async def lines() -> AsyncIterator[str]:
+        async for outcome in executor.as_completed(commands):
+            item_result = _to_item_result(request.items[outcome.index], outcome)
+            yield item_result.model_dump_json() + "\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _to_commands(request: BatchRequest) -> list[Any]:
+    if len(request.items) > settings.batch_max_items:
+        raise ValidationError(
+            f"Batch has {len(request.items)} items, at most {settings.batch_max_items} allowed"
+        )
+    return [_to_command(item) for item in request.items]
+
+
+def _to_command(item: BatchItemRequest) -> Any:
+    if item.action == "explain":
+        return ExplainCodeCommand(code=item.code, language=item.language)
+    if item.action == "refactor":
+        return RefactorCodeCommand(code=item.code, language=item.language, goal=item.goal)
+    return GenerateTestsCommand(
+        code=item.code, language=item.language, test_framework=item.test_framework
+    )
+
+
+def _to_item_result(item: BatchItemRequest, outcome: BatchItemOutcome) -> BatchItemResult:
+    if outcome.error is not None:
+        status, error = _error_response(outcome.error)
+        return BatchItemResult(index=outcome.index, action=item.action, status=status, error=error)
+
+    assert outcome.result is not None
+    return BatchItemResult(
+        index=outcome.index,
+        action=item.action,
+        status=200,
+        result=outcome.result.model_dump(mode="json"),
+    )
+
+
+def _error_response(error: Exception) -> tuple[int, ErrorResponse]:
+    """Status and body matching what the exception handlers return for single requests."""
+    if isinstance(error, ValidationError):
+        return 422, ErrorResponse(type="validation_error", message=str(error))
+    if isinstance(error, DomainError):
+        return 400, ErrorResponse(type="domain_error", message=str(error))
+    if isinstance(error, ServiceOverloadedError):
+        return 429, ErrorResponse(type="service_overloaded", message=str(error))
+    if isinstance(error, AIProviderError):
+        return 503, ErrorResponse(
+            type="ai_provider_error", message="AI service temporarily unavailable"
+        )
+    return 500, ErrorResponse(type="internal_error", message="An unexpected error occurred")
@@ -0,0 +1,33 @@
+"""Conditional request helpers (ETag / If-None-Match)."""
+
+from typing import Optional
+
+from fastapi import Response
+
+
+def make_etag(content_key: str) -> str:
+    """Build a strong ETag header value from a content key."""
+    return f'"{content_key}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an ``If-None-Match`` header against the current ETag.
+
+    Uses weak comparison as required for ``If-None-Match`` (RFC 9110): a
+    ``W/`` prefix is ignored, ``*`` matches anything and the header may list
+    several entity tags.
+    """
+    if not if_none_match:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates)
+
+
+def not_modified_response(etag: str, cache_control: str) -> Response:
+    """Build a ``304 Not Modified`` response carrying the validators."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from dataclasses import replace
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from app.application.commands.explain_code_command import ExplainCodeCommand
 from app.application.dto.explain_result_dto import ExplainResultDTO
+from app.application.content_key import ContentKeyBuilder
 from app.application.dispatch import CommandDispatcher
 from app.presentation.api.v1.models import ExplainCodeRequest
-from app.presentation.dependencies import get_command_dispatcher
+from app.presentation.dependencies import get_command_dispatcher, get_content_key_builder
+from app.presentation.api.v1.conditional import (
+    etag_matches,
+    make_etag,
+    not_modified_response,
+)
+from app.presentation.api.v1.streaming import sse_stream_response
 import logging
-import hashlib
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/explain", tags=["explain"])
@@ -15,31 +25,73 @@ router = APIRouter(prefix="/explain", tags=["explain"])
 async def explain_code(
     request: ExplainCodeRequest,
     response: Response,
+    if_none_match: Optional[str] = Header(None),
     dispatcher: CommandDispatcher = Depends(get_command_dispatcher),
-) -> ExplainResultDTO:
+    key_builder: ContentKeyBuilder = Depends(get_content_key_builder),
+) -> ExplainResultDTO | Response:
     """
     Explain a code snippet using AI.
 
     Args:
         request: The code explanation request
         response: FastAPI response object for headers
+        if_none_match: ETag(s) the client already holds
         dispatcher: Command dispatcher dependency
+        key_builder: Content key builder dependency
 
     Returns:
-        Explanation result with metadata
+        Explanation result with metadata, or 304 Not Modified when the client's
+        cached copy is current
     """
-    logger.info(f"Explaining code snippet of {len(request.code)} characters")
+    logger.info("Explaining code snippet of %s characters", len(request.code))
 
-    command = ExplainCodeCommand(code=request.code, language=request.language)
+    command = ExplainCodeCommand(
+        code=request.code, language=request.language, accept_similar=request.accept_similar
+    )
+
+    # Content key doubles as ETag (explanations are deterministic for same input), so
+    # it is known before any provider work and conditional requests short-circuit
+    key = key_builder.build(command)
+    etag = make_etag(key)
+    # Carried on the command so the result cache does not build the key again
+    command = replace(command, content_key=key)
+    cache_control = "public, max-age=3600"  # Cache for 1 hour
 
-    result = await dispatcher.dispatch(command)
+    if etag_matches(if_none_match, etag):
+        logger.info("Client copy is current, returning 304 Not Modified")
+        return not_modified_response(etag, cache_control)
 
-    # Add caching headers (explanations are deterministic for same input)
-    # Create ETag based on request content
-    etag_content = f"{request.code}{request.language or ''}"
-    etag = hashlib.md5(etag_content.encode()).hexdigest()
+    result: ExplainResultDTO = await dispatcher.dispatch(command)
 
-    response.headers["ETag"] = f'"{etag}"'
-    response.headers["Cache-Control"] = "public, max-age=3600"  # Cache for 1 hour
+    # A near-duplicate's explanation is not the representation of this snippet
+    if result.similarity is None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = cache_control
 
     return result
+
+
+@router.post("/stream", response_class=StreamingResponse)
+async def explain_code_stream(
+    request: ExplainCodeRequest,
+    dispatcher: CommandDispatcher = Depends(get_command_dispatcher),
+) -> StreamingResponse:
+    """
+    Stream an explanation of a code snippet using AI.
+
+    Tokens are forwarded as Server-Sent Events as soon as the AI provider
+    generates them: ``delta`` events carry ``{"delta": "<text>"}``, followed
+    by a final ``done`` event, or an ``error`` event if the stream fails.
+
+    Args:
+        request: The code explanation request
+        dispatcher: Command dispatcher dependency
+
+    Returns:
+        Event stream of explanation fragments
+    """
+    logger.info("Streaming explanation for code snippet of %s characters", len(request.code))
+
+    command = ExplainCodeCommand(code=request.code, language=request.language)
+
+    return await sse_stream_response(dispatcher.stream(command))
@@ -0,0 +1,91 @@
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from app.application.job_worker_pool import JobWorkerPool
+from app.application.jobs import Job
+from app.infrastructure.settings import settings
+from app.presentation.api.v1.models import ErrorResponse, JobRequest, JobResponse
+from app.presentation.dependencies import get_job_worker_pool
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.post("/", response_model=JobResponse, status_code=202)
+async def submit_job(
+    request: JobRequest,
+    response: Response,
+    pool: JobWorkerPool = Depends(get_job_worker_pool),
+) -> JobResponse:
+    """
+    Queue an explain, refactor or test generation job.
+
+    Returns immediately; poll ``GET /jobs/{id}`` (optionally with ``wait``
+    to long-poll) for the result.
+
+    Args:
+        request: The snippet and action to run
+        response: FastAPI response object for headers
+        pool: Job worker pool dependency
+
+    Returns:
+        The queued job
+    """
+    params = {"code": request.code, "language": request.language}
+    if request.action == "refactor":
+        params["goal"] = request.goal
+    elif request.action == "tests":
+        params["test_framework"] = request.test_framework
+
+    job = await pool.submit(request.action, params)
+
+    response.headers["Location"] = f"/api/v1/jobs/{job.id}"
+    return _to_response(job)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    wait: float = Query(
+        0.0,
+        ge=0,
+        le=settings.job_max_wait,
+        description="Seconds to wait for the job to finish before answering (long-poll)",
+    ),
+    pool: JobWorkerPool = Depends(get_job_worker_pool),
+) -> JobResponse:
+    """
+    Get a job's status and, once finished, its result or error.
+
+    Args:
+        job_id: Id returned on submission
+        wait: Seconds to hold the request open waiting for completion
+        pool: Job worker pool dependency
+
+    Returns:
+        The job's current state
+    """
+    job = await pool.get(job_id, wait=wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return _to_response(job)
+
+
+def _to_response(job: Job) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        action=job.action,
+        status=job.status.value,
+        result=job.result,
+        error=ErrorResponse.model_validate(job.error) if job.error else None,
+        created_at=datetime.fromtimestamp(job.created_at, timezone.utc),
+        started_at=_timestamp(job.started_at),
+        finished_at=_timestamp(job.finished_at),
+    )
+
+
+def _timestamp(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, timezone.utc) if value is not None else None
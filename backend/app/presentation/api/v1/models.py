@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from datetime import datetime
+from typing import Any, List, Literal, Optional
 
 
 class ExplainCodeRequest(BaseModel):
@@ -16,6 +17,13 @@ class ExplainCodeRequest(BaseModel):
         max_length=50,  # Reasonable limit for language names
         description="Programming language hint",
     )
+    accept_similar: bool = Field(
+        False,
+        description=(
+            "Accept the explanation of a near-identical snippet explained before; "
+            "the response's similarity field is then set"
+        ),
+    )
 
     @field_validator("code")
     @classmethod
@@ -130,3 +138,101 @@ class GenerateTestsRequest(BaseModel):
         if v and not v.strip():
             return None  # Convert empty string to None
         return v.lower() if v else None
+
+
+class BatchItemRequest(BaseModel):
+    """One snippet and action of a batch request."""
+
+    action: Literal["explain", "refactor", "tests"] = Field(
+        ..., description="Operation to run on the snippet"
+    )
+    code: str = Field(
+        ...,
+        min_length=1,
+        max_length=50000,  # Add max_length at Pydantic level
+        description="Code to process",
+    )
+    language: Optional[str] = Field(
+        None,
+        max_length=50,  # Reasonable limit for language names
+        description="Programming language hint",
+    )
+    goal: Optional[str] = Field(
+        None,
+        max_length=200,  # Reasonable limit for goal descriptions
+        description="Refactoring goal (refactor only)",
+    )
+    test_framework: Optional[str] = Field(
+        None,
+        max_length=50,  # Reasonable limit for framework names
+        description="Preferred test framework (tests only)",
+    )
+
+    @field_validator("code")
+    @classmethod
+    def validate_code_content(cls, v: str) -> str:
+        """Validate code content."""
+        if not v.strip():
+            raise ValueError("Code cannot be empty or only whitespace")
+        return v
+
+    @field_validator("language", "test_framework")
+    @classmethod
+    def validate_lowercase_hint(cls, v: Optional[str]) -> Optional[str]:
+        """Validate language and test framework hints."""
+        if v and not v.strip():
+            return None  # Convert empty string to None
+        return v.lower() if v else None
+
+    @field_validator("goal")
+    @classmethod
+    def validate_goal(cls, v: Optional[str]) -> Optional[str]:
+        """Validate refactoring goal."""
+        if v and not v.strip():
+            return None  # Convert empty string to None
+        return v
+
+
+class BatchRequest(BaseModel):
+    """Request model for a batch of snippets and actions."""
+
+    items: List[BatchItemRequest] = Field(
+        ..., min_length=1, description="Snippets and actions to process"
+    )
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of one batch item."""
+
+    index: int = Field(..., description="Position of the item in the request")
+    action: str = Field(..., description="Operation that was run")
+    status: int = Field(..., description="HTTP status the item would have had on its own")
+    result: Optional[dict[str, Any]] = Field(None, description="Result, when successful")
+    error: Optional[ErrorResponse] = Field(None, description="Error, when failed")
+
+
+class BatchResponse(BaseModel):
+    """Response model for a batch request."""
+
+    results: List[BatchItemResult] = Field(..., description="Item outcomes in request order")
+    succeeded: int = Field(..., description="Number of successful items")
+    failed: int = Field(..., description="Number of failed items")
+
+
+class JobRequest(BatchItemRequest):
+    """Request model for submitting an asynchronous job."""
+
+
+class JobResponse(BaseModel):
+    """State of an asynchronous job."""
+
+    id: str = Field(..., description="Job id")
+    action: str = Field(..., description="Operation the job runs")
+    status: Literal["queued", "running", "succeeded", "failed"] = Field(
+        ..., description="Job status"
+    )
+    result: Optional[dict[str, Any]] = Field(None, description="Result, once succeeded")
+    error: Optional[ErrorResponse] = Field(None, description="Error, once failed")
+    created_at: datetime = Field(..., description="When the job was submitted")
+    started_at: Optional[datetime] = Field(None, description="When a worker picked it up")
+    finished_at: Optional[datetime] = Field(None, description="When it finished")
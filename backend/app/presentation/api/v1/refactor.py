@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from dataclasses import replace
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from app.application.commands.refactor_code_command import RefactorCodeCommand
 from app.application.dto.refactor_result_dto import RefactorResultDTO
+from app.application.content_key import ContentKeyBuilder
 from app.application.dispatch import CommandDispatcher
 from app.presentation.api.v1.models import RefactorCodeRequest
-from app.presentation.dependencies import get_command_dispatcher
+from app.presentation.dependencies import get_command_dispatcher, get_content_key_builder
+from app.presentation.api.v1.conditional import (
+    etag_matches,
+    make_etag,
+    not_modified_response,
+)
+from app.presentation.api.v1.streaming import sse_stream_response
 import logging
-import hashlib
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/refactor", tags=["refactor"])
@@ -15,33 +25,75 @@ router = APIRouter(prefix="/refactor", tags=["refactor"])
 async def refactor_code(
     request: RefactorCodeRequest,
     response: Response,
+    if_none_match: Optional[str] = Header(None),
     dispatcher: CommandDispatcher = Depends(get_command_dispatcher),
-) -> RefactorResultDTO:
+    key_builder: ContentKeyBuilder = Depends(get_content_key_builder),
+) -> RefactorResultDTO | Response:
     """
     Suggest refactoring for a code snippet using AI.
 
     Args:
         request: The code refactoring request
         response: FastAPI response object for headers
+        if_none_match: ETag(s) the client already holds
         dispatcher: Command dispatcher dependency
+        key_builder: Content key builder dependency
 
     Returns:
-        Refactoring result with metadata
+        Refactoring result with metadata, or 304 Not Modified when the client's
+        cached copy is current
     """
-    logger.info(f"Refactoring code snippet of {len(request.code)} characters")
+    logger.info("Refactoring code snippet of %s characters", len(request.code))
 
     command = RefactorCodeCommand(
         code=request.code, language=request.language, goal=request.goal
     )
 
-    result = await dispatcher.dispatch(command)
+    # Content key doubles as ETag (refactoring suggestions are deterministic for same input), so
+    # it is known before any provider work and conditional requests short-circuit
+    key = key_builder.build(command)
+    etag = make_etag(key)
+    # Carried on the command so the result cache does not build the key again
+    command = replace(command, content_key=key)
+    cache_control = "public, max-age=1800"  # Cache for 30 minutes
+
+    if etag_matches(if_none_match, etag):
+        logger.info("Client copy is current, returning 304 Not Modified")
+        return not_modified_response(etag, cache_control)
 
-    # Add caching headers (refactoring suggestions are deterministic for same input)
-    # Create ETag based on request content
-    etag_content = f"{request.code}{request.language or ''}{request.goal or ''}"
-    etag = hashlib.md5(etag_content.encode()).hexdigest()
+    result: RefactorResultDTO = await dispatcher.dispatch(command)
 
-    response.headers["ETag"] = f'"{etag}"'
-    response.headers["Cache-Control"] = "public, max-age=1800"  # Cache for 30 minutes
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
 
     return result
+
+
+@router.post("/stream", response_class=StreamingResponse)
+async def refactor_code_stream(
+    request: RefactorCodeRequest,
+    dispatcher: CommandDispatcher = Depends(get_command_dispatcher),
+) -> StreamingResponse:
+    """
+    Stream refactoring suggestions for a code snippet using AI.
+
+    Tokens are forwarded as Server-Sent Events as soon as the AI provider
+    generates them: ``delta`` events carry ``{"delta": "<text>"}``, followed
+    by a final ``done`` event, or an ``error`` event if the stream fails.
+
+    Args:
+        request: The code refactoring request
+        dispatcher: Command dispatcher dependency
+
+    Returns:
+        Event stream of refactoring suggestions fragments
+    """
+    logger.info(
+        "Streaming refactoring suggestions for code snippet of %s characters", len(request.code)
+    )
+
+    command = RefactorCodeCommand(
+        code=request.code, language=request.language, goal=request.goal
+    )
+
+    return await sse_stream_response(dispatcher.stream(command))
@@ -0,0 +1,76 @@
+"""Server-Sent Events helpers for the streaming endpoints."""
+
+import json
+import logging
+from typing import Any, AsyncIterator, Optional
+
+from fastapi.responses import StreamingResponse
+
+from app.domain.exceptions import AIProviderError, DomainError
+from app.presentation.api.v1.models import ErrorResponse
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+}
+
+
+def format_sse_event(event: str, data: dict[str, Any]) -> str:
+    """Format a single Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def sse_stream_response(chunks: AsyncIterator[str]) -> StreamingResponse:
+    """
+    Wrap a stream of text fragments in an SSE response.
+
+    The first fragment is awaited before the response starts so that
+    validation and provider errors raised up front still go through the
+    regular exception handlers with a proper status code. Errors raised
+    after the stream has started are reported as an ``error`` event.
+
+    Args:
+        chunks: Async iterator of text fragments to forward to the client
+
+    Returns:
+        A ``text/event-stream`` response emitting ``delta`` events followed by
+        a final ``done`` (or ``error``) event
+    """
+    iterator = chunks.__aiter__()
+    first_chunk: Optional[str]
+
+    try:
+        first_chunk = await iterator.__anext__()
+    except StopAsyncIteration:
+        first_chunk = None
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            if first_chunk is None:
+                yield format_sse_event("done", {})
+                return
+
+            yield format_sse_event("delta", {"delta": first_chunk})
+            async for chunk in iterator:
+                yield format_sse_event("delta", {"delta": chunk})
+
+            yield format_sse_event("done", {})
+
+        except (DomainError, AIProviderError) as e:
+            logger.error("Stream aborted: %s", e)
+            error_type = "ai_provider_error" if isinstance(e, AIProviderError) else "domain_error"
+            message = (
+                "AI service temporarily unavailable" if isinstance(e, AIProviderError) else str(e)
+            )
+            yield format_sse_event("error", ErrorResponse(type=error_type, message=message).dict())
+        finally:
+            # Stops the dispatcher's stream early if the client went away, so its
+            # middleware releases the admission and concurrency slots it holds
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from dataclasses import replace
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from app.application.commands.generate_tests_command import GenerateTestsCommand
 from app.application.dto.test_scaffold_result_dto import TestScaffoldResultDTO
+from app.application.content_key import ContentKeyBuilder
 from app.application.dispatch import CommandDispatcher
 from app.presentation.api.v1.models import GenerateTestsRequest
-from app.presentation.dependencies import get_command_dispatcher
+from app.presentation.dependencies import get_command_dispatcher, get_content_key_builder
+from app.presentation.api.v1.conditional import (
+    etag_matches,
+    make_etag,
+    not_modified_response,
+)
+from app.presentation.api.v1.streaming import sse_stream_response
 import logging
-import hashlib
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/tests", tags=["tests"])
@@ -15,20 +25,25 @@ router = APIRouter(prefix="/tests", tags=["tests"])
 async def generate_tests(
     request: GenerateTestsRequest,
     response: Response,
+    if_none_match: Optional[str] = Header(None),
     dispatcher: CommandDispatcher = Depends(get_command_dispatcher),
-) -> TestScaffoldResultDTO:
+    key_builder: ContentKeyBuilder = Depends(get_content_key_builder),
+) -> TestScaffoldResultDTO | Response:
     """
     Generate unit test scaffold for a code snippet using AI.
 
     Args:
         request: The test generation request
         response: FastAPI response object for headers
+        if_none_match: ETag(s) the client already holds
         dispatcher: Command dispatcher dependency
+        key_builder: Content key builder dependency
 
     Returns:
-        Test scaffold result with metadata
+        Test scaffold result with metadata, or 304 Not Modified when the client's
+        cached copy is current
     """
-    logger.info(f"Generating tests for code snippet of {len(request.code)} characters")
+    logger.info("Generating tests for code snippet of %s characters", len(request.code))
 
     command = GenerateTestsCommand(
         code=request.code,
@@ -36,16 +51,51 @@ async def generate_tests(
         test_framework=request.test_framework,
     )
 
-    result = await dispatcher.dispatch(command)
+    # Content key doubles as ETag (test scaffolds are deterministic for same input), so
+    # it is known before any provider work and conditional requests short-circuit
+    key = key_builder.build(command)
+    etag = make_etag(key)
+    # Carried on the command so the result cache does not build the key again
+    command = replace(command, content_key=key)
+    cache_control = "public, max-age=1800"  # Cache for 30 minutes
 
-    # Add caching headers (test scaffolds are deterministic for same input)
-    # Create ETag based on request content
-    etag_content = (
-        f"{request.code}{request.language or ''}{request.test_framework or ''}"
-    )
-    etag = hashlib.md5(etag_content.encode()).hexdigest()
+    if etag_matches(if_none_match, etag):
+        logger.info("Client copy is current, returning 304 Not Modified")
+        return not_modified_response(etag, cache_control)
+
+    result: TestScaffoldResultDTO = await dispatcher.dispatch(command)
 
-    response.headers["ETag"] = f'"{etag}"'
-    response.headers["Cache-Control"] = "public, max-age=1800"  # Cache for 30 minutes
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
 
     return result
+
+
+@router.post("/stream", response_class=StreamingResponse)
+async def generate_tests_stream(
+    request: GenerateTestsRequest,
+    dispatcher: CommandDispatcher = Depends(get_command_dispatcher),
+) -> StreamingResponse:
+    """
+    Stream a unit test scaffold for a code snippet using AI.
+
+    Tokens are forwarded as Server-Sent Events as soon as the AI provider
+    generates them: ``delta`` events carry ``{"delta": "<text>"}``, followed
+    by a final ``done`` event, or an ``error`` event if the stream fails.
+
+    Args:
+        request: The test generation request
+        dispatcher: Command dispatcher dependency
+
+    Returns:
+        Event stream of test code fragments
+    """
+    logger.info("Streaming tests for code snippet of %s characters", len(request.code))
+
+    command = GenerateTestsCommand(
+        code=request.code,
+        language=request.language,
+        test_framework=request.test_framework,
+    )
+
+    return await sse_stream_response(dispatcher.stream(command))
@@ -1,25 +1,340 @@
 from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from fastapi import Depends
+from pydantic import BaseModel
 from app.application.interfaces.ai_provider import AIProvider
+from app.infrastructure.ai.circuit_breaker import CircuitBreaker
+from app.infrastructure.ai.connection_pool import ConnectionPoolConfig
+from app.infrastructure.ai.fake_ai_provider import FakeAIProvider
+from app.infrastructure.ai.fake_transport import FakeOpenAITransport
+from app.infrastructure.ai.latency_models import parse_latency_spec
 from app.infrastructure.ai.openai_provider import OpenAIProvider
+from app.infrastructure.ai.prompts import explain_prompts, refactor_prompts
+from app.infrastructure.ai.prompts import test_generation_prompts
+from app.infrastructure.ai.rate_limiter import RateGovernor
+from app.infrastructure.ai.retry_policy import RetryPolicy
+from app.infrastructure.ai.routing_provider import Route, RoutingAIProvider
+from app.infrastructure.ai.single_flight_provider import SingleFlightAIProvider
+from app.infrastructure.cache.memory_result_cache import MemoryResultCache
+from app.infrastructure.cache.minhash_index import MinHashIndex
+from app.infrastructure.cache.persistent_result_cache import PersistentResultCache
+from app.infrastructure.cache.redis_lock import RedisLock
+from app.infrastructure.cache.redis_result_cache import RedisResultCache, create_redis_client
+from app.infrastructure.cache.tiered_result_cache import TieredResultCache
+from app.infrastructure.jobs.memory_job_backend import MemoryJobBackend
+from app.infrastructure.jobs.redis_job_backend import RedisJobBackend
+from app.infrastructure.metrics.registry import MetricsRegistry
+from app.infrastructure.repositories.command_repository import SqliteResultCommandRepository
+from app.infrastructure.repositories.query_repository import SqliteResultQueryRepository
+from app.infrastructure.repositories.sqlite_database import SqliteDatabase
 from app.infrastructure.settings import settings
+from app.application.admission import AdmissionController, Priority
+from app.application.batch import BatchExecutor
+from app.application.content_key import ContentKeyBuilder
 from app.application.dispatch import CommandDispatcher
+from app.application.interfaces.job_backend import JobBackend
+from app.application.interfaces.result_cache import ResultCache
+from app.application.interfaces.similarity_index import SimilarityIndex
+from app.application.job_worker_pool import JobWorkerPool
+from app.application.middleware.admission_middleware import AdmissionMiddleware
+from app.application.middleware.caching_middleware import CachingMiddleware
+from app.application.chunked_explain import CachedExplanationPart, ChunkedExplainer
+from app.application.middleware.concurrency_middleware import ConcurrencyMiddleware
+from app.application.middleware.similar_result_middleware import SimilarResultMiddleware
+from app.application.middleware.timing_middleware import TimingMiddleware
 from app.application.handlers.explain_code_handler import ExplainCodeHandler
 from app.application.handlers.refactor_code_handler import RefactorCodeHandler
 from app.application.handlers.generate_tests_handler import GenerateTestsHandler
 from app.application.commands.explain_code_command import ExplainCodeCommand
 from app.application.commands.refactor_code_command import RefactorCodeCommand
 from app.application.commands.generate_tests_command import GenerateTestsCommand
+from app.application.dto.explain_result_dto import ExplainResultDTO
+from app.application.dto.refactor_result_dto import RefactorResultDTO
+from app.application.dto.test_scaffold_result_dto import TestScaffoldResultDTO
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+# Result types kept outside the process (result store, shared cache tier)
+_CACHED_RESULT_TYPES: list[type[BaseModel]] = [
+    ExplainResultDTO,
+    RefactorResultDTO,
+    TestScaffoldResultDTO,
+    CachedExplanationPart,
+]
+
+
+def _stat_reader(stats: Callable[[], dict[str, Any]], stat: str) -> Callable[[], float]:
+    """Metric callback reading one statistic of a component at scrape time."""
+    return lambda: float(stats()[stat])
+
+
+@lru_cache()
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the registry behind the /metrics endpoint."""
+    return MetricsRegistry()
 
 
 @lru_cache()
 def get_ai_provider() -> AIProvider:
     """Get AI provider based on settings."""
-    if not settings.openai_api_key:
+    if settings.ai_provider == "fake":
+        provider = _create_fake_provider()
+    else:
+        provider = _create_openai_provider()
+
+    # Spread calls over several upstreams and hedge slow ones
+    if settings.ai_routing_enabled:
+        provider = _create_routing_provider(provider)
+
+    # Share upstream calls between identical concurrent requests
+    if settings.ai_single_flight_enabled:
+        provider = SingleFlightAIProvider(provider)
+
+    return provider
+
+
+def _create_routing_provider(default: AIProvider) -> AIProvider:
+    default_name = settings.openai_model if settings.ai_provider == "openai" else "fake"
+    routes = [Route(name=default_name, provider=default)]
+    for index, spec in enumerate(settings.ai_routes, start=1):
+        if settings.ai_provider == "fake":
+            provider = _create_fake_provider(latency=spec, seed_offset=index, route=spec)
+        else:
+            model, _, base_url = spec.partition("@")
+            provider = _create_openai_provider(model=model, base_url=base_url or None, route=spec)
+        routes.append(Route(name=spec, provider=provider))
+
+    return RoutingAIProvider(
+        routes,
+        hedge_percentile=settings.ai_hedge_percentile,
+        min_hedge_delay=settings.ai_hedge_min_delay,
+        max_hedge_ratio=settings.ai_hedge_max_ratio,
+    )
+
+
+def _create_fake_provider(
+    latency: Optional[str] = None, seed_offset: int = 0, route: str = "fake"
+) -> AIProvider:
+    fake_settings: dict[str, Any] = dict(
+        latency=parse_latency_spec(latency or settings.fake_latency),
+        tokens_per_second=settings.fake_tokens_per_second,
+        error_rate_429=settings.fake_error_rate_429,
+        error_rate_5xx=settings.fake_error_rate_5xx,
+        timeout_rate=settings.fake_timeout_rate,
+        timeout_seconds=settings.fake_timeout_seconds,
+        seed=settings.fake_seed + seed_offset if settings.fake_seed is not None else None,
+    )
+    if settings.fake_http:
+        # Injected faults go through the OpenAI provider's retries, breaker and rate budget
+        return _create_openai_provider(route=route, transport=FakeOpenAITransport(**fake_settings))
+    return FakeAIProvider(**fake_settings)
+
+
+def _create_openai_provider(
+    model: Optional[str] = None,
+    base_url: Optional[str] = None,
+    route: Optional[str] = None,
+    transport: Optional[FakeOpenAITransport] = None,
+) -> AIProvider:
+    # The fake transport accepts any key
+    api_key = "fake" if transport is not None else settings.openai_api_key
+    if not api_key:
         raise ValueError("OpenAI API key not configured")
     return OpenAIProvider(
-        api_key=settings.openai_api_key,
-        model=settings.openai_model,
+        api_key=api_key,
+        model=model or settings.openai_model,
         timeout=settings.ai_timeout,
+        max_retries=settings.ai_max_retries,
+        retry_policy=RetryPolicy(
+            max_retries=settings.ai_max_retries,
+            base_delay=settings.ai_retry_base_delay,
+            max_delay=settings.ai_retry_max_delay,
+            deadline=settings.ai_retry_deadline,
+        ),
+        pool_config=ConnectionPoolConfig(
+            max_connections=settings.ai_max_connections,
+            max_keepalive_connections=settings.ai_max_keepalive_connections,
+            keepalive_expiry=settings.ai_keepalive_expiry,
+            http2=settings.ai_http2,
+        ),
+        warmup_connections=settings.ai_warmup_connections,
+        rate_governor=RateGovernor(
+            requests_per_minute=settings.ai_rate_limit_rpm,
+            tokens_per_minute=settings.ai_rate_limit_tpm,
+            max_wait=settings.ai_rate_limit_max_wait,
+        ),
+        circuit_breaker=CircuitBreaker(
+            failure_rate_threshold=settings.ai_breaker_failure_rate,
+            slow_call_duration=settings.ai_breaker_slow_call_seconds,
+            slow_call_rate_threshold=settings.ai_breaker_slow_call_rate,
+            window_size=settings.ai_breaker_window,
+            minimum_calls=settings.ai_breaker_min_calls,
+            open_duration=settings.ai_breaker_open_seconds,
+            half_open_max_calls=settings.ai_breaker_half_open_calls,
+        ),
+        metrics=get_metrics_registry(),
+        base_url=base_url,
+        max_tokens=settings.ai_max_tokens,
+        route=route,
+        transport=transport,
+    )
+
+
+@lru_cache()
+def get_content_key_builder() -> ContentKeyBuilder:
+    """Get the content key builder for the configured model and prompt versions."""
+    return ContentKeyBuilder(
+        namespace=(
+            settings.openai_model if settings.ai_provider == "openai" else settings.ai_provider
+        ),
+        command_versions={
+            ExplainCodeCommand: explain_prompts.PROMPT_VERSION,
+            RefactorCodeCommand: refactor_prompts.PROMPT_VERSION,
+            GenerateTestsCommand: test_generation_prompts.PROMPT_VERSION,
+        },
+        # A refactoring returns the code itself, comments and layout included,
+        # so it must not be served for a reformatted copy
+        canonical_commands=[ExplainCodeCommand, GenerateTestsCommand],
+    )
+
+
+@lru_cache()
+def get_redis_client() -> "Redis":
+    """Get the pooled Redis client of the shared result cache tier."""
+    return create_redis_client(
+        settings.redis_url, max_connections=settings.result_cache_redis_max_connections
+    )
+
+
+@lru_cache()
+def get_result_cache() -> ResultCache:
+    """Get the result cache, persisted and backed by the shared Redis tier when enabled."""
+    cache: ResultCache = MemoryResultCache(
+        max_bytes=settings.result_cache_max_bytes,
+        default_ttl=settings.result_cache_ttl,
+    )
+    if settings.result_store_enabled:
+        cache = PersistentResultCache(
+            cache,
+            # Separate connections, so reads never wait behind writes
+            SqliteResultQueryRepository(SqliteDatabase(settings.result_store_path)),
+            SqliteResultCommandRepository(SqliteDatabase(settings.result_store_path)),
+            value_types=_CACHED_RESULT_TYPES,
+            default_ttl=settings.result_cache_ttl,
+            max_entries=settings.result_store_max_entries,
+        )
+    if settings.result_cache_redis_enabled:
+        cache = TieredResultCache(
+            cache,
+            RedisResultCache(
+                get_redis_client(), _CACHED_RESULT_TYPES, default_ttl=settings.result_cache_ttl
+            ),
+            get_redis_client(),
+        )
+
+    metrics = get_metrics_registry()
+    cache_metrics = [
+        ("hits", "counter", "Result cache lookups that found an entry"),
+        ("misses", "counter", "Result cache lookups that found nothing"),
+        ("hit_ratio", "gauge", "Share of result cache lookups that hit"),
+        ("bytes", "gauge", "Approximate memory held by result cache entries"),
+    ]
+    if settings.result_store_enabled:
+        cache_metrics.append(
+            ("store_errors", "counter", "Failed result store operations of the result cache")
+        )
+    if settings.result_cache_redis_enabled:
+        cache_metrics += [
+            ("l2_hits", "counter", "Result cache lookups served by the shared Redis tier"),
+            ("l2_errors", "counter", "Failed Redis operations of the result cache"),
+        ]
+    for stat, metric_type, description in cache_metrics:
+        suffix = "_total" if metric_type == "counter" else ""
+        metrics.callback(
+            f"result_cache_{stat}{suffix}",
+            description,
+            _stat_reader(cache.stats, stat),
+            type_name=metric_type,
+        )
+    return cache
+
+
+@lru_cache()
+def get_similarity_index() -> SimilarityIndex:
+    """Get the index of explained snippets used for near-duplicate reuse."""
+    index = MinHashIndex(max_entries=settings.similar_results_max_entries)
+
+    metrics = get_metrics_registry()
+    for stat, metric_type, description in (
+        ("entries", "gauge", "Snippets in the similarity index"),
+        ("lookups", "counter", "Similarity index lookups"),
+        ("matches", "counter", "Similarity index lookups that found a similar snippet"),
+    ):
+        suffix = "_total" if metric_type == "counter" else ""
+        metrics.callback(
+            f"similarity_index_{stat}{suffix}",
+            description,
+            _stat_reader(index.stats, stat),
+            type_name=metric_type,
+        )
+    return index
+
+
+@lru_cache()
+def get_caching_middleware() -> CachingMiddleware:
+    """Get the middleware serving repeated commands from the result cache."""
+    lock = None
+    # Replicas sharing the cache compute each result once
+    if settings.result_cache_redis_enabled:
+        lock = RedisLock(
+            get_redis_client(),
+            ttl=settings.result_cache_lock_ttl,
+            max_wait=settings.result_cache_lock_max_wait,
+        )
+    return CachingMiddleware(get_result_cache(), get_content_key_builder(), lock=lock)
+
+
+@lru_cache()
+def get_admission_controller() -> AdmissionController:
+    """Get the admission controller shared by all commands."""
+    controller = AdmissionController(
+        max_concurrency=settings.admission_max_concurrency,
+        max_queue=settings.admission_max_queue,
+        max_wait=settings.admission_max_wait,
+    )
+
+    metrics = get_metrics_registry()
+    metrics.callback(
+        "admission_running",
+        "Commands holding an admission slot",
+        lambda: float(controller.stats()["running"]),
+    )
+    metrics.callback(
+        "admission_queue_depth",
+        "Commands waiting for an admission slot, by priority",
+        lambda: [
+            ((priority,), float(depth))
+            for priority, depth in controller.stats()["queue_depth_by_priority"].items()
+        ],
+        labelnames=["priority"],
+    )
+    return controller
+
+
+@lru_cache()
+def get_timing_middleware() -> TimingMiddleware:
+    """Get the middleware timing every dispatched command."""
+    duration = get_metrics_registry().histogram(
+        "command_duration_seconds",
+        "Command execution latency through the dispatcher",
+        ["command", "outcome"],
+    )
+    return TimingMiddleware(
+        observer=lambda command, seconds, failed: duration.observe(
+            seconds, command=command, outcome="error" if failed else "success"
+        )
     )
 
 
@@ -30,7 +345,22 @@ def get_command_dispatcher() -> CommandDispatcher:
 
     # Register handlers
     ai_provider = get_ai_provider()
-    explain_handler = ExplainCodeHandler(ai_provider)
+    chunked_explainer = None
+    incremental = settings.explain_incremental_enabled and settings.result_cache_enabled
+    if settings.explain_chunking_enabled or incremental:
+        chunked_explainer = ChunkedExplainer(
+            ai_provider,
+            threshold_chars=(
+                settings.explain_chunk_threshold if settings.explain_chunking_enabled else None
+            ),
+            max_chunk_chars=settings.explain_chunk_max_chars,
+            max_concurrency=settings.explain_chunk_concurrency,
+            cache=get_result_cache() if settings.result_cache_enabled else None,
+            key_builder=get_content_key_builder(),
+            incremental=incremental,
+            incremental_min_chars=settings.explain_incremental_min_chars,
+        )
+    explain_handler = ExplainCodeHandler(ai_provider, chunked_explainer)
     refactor_handler = RefactorCodeHandler(ai_provider)
     generate_tests_handler = GenerateTestsHandler(ai_provider)
 
@@ -38,4 +368,90 @@ def get_command_dispatcher() -> CommandDispatcher:
     dispatcher.register(RefactorCodeCommand, refactor_handler)
     dispatcher.register(GenerateTestsCommand, generate_tests_handler)
 
+    # Outermost, so cache hits and queueing are part of the measured time
+    dispatcher.add_middleware(get_timing_middleware())
+
+    # Serve near-duplicates to requests opting in; outside the cache, so approximate
+    # results are never stored under the exact key
+    if settings.result_cache_enabled and settings.similar_results_enabled:
+        dispatcher.add_middleware(
+            SimilarResultMiddleware(
+                get_result_cache(),
+                get_similarity_index(),
+                get_content_key_builder(),
+                min_similarity=settings.similar_results_min_similarity,
+            )
+        )
+
+    # Serve repeated commands from the result cache
+    if settings.result_cache_enabled:
+        dispatcher.add_middleware(get_caching_middleware())
+
+    # Cap individual command types before they take a shared admission slot
+    if settings.command_concurrency_limits:
+        command_types = {
+            "explain": ExplainCodeCommand,
+            "refactor": RefactorCodeCommand,
+            "tests": GenerateTestsCommand,
+        }
+        dispatcher.add_middleware(
+            ConcurrencyMiddleware(
+                {
+                    command_types[action]: limit
+                    for action, limit in settings.command_concurrency_limits.items()
+                }
+            )
+        )
+
+    # Bound concurrent provider work; inside the cache so hits are never queued
+    if settings.admission_enabled:
+        dispatcher.add_middleware(
+            AdmissionMiddleware(
+                get_admission_controller(),
+                command_priorities={
+                    ExplainCodeCommand: Priority.INTERACTIVE,
+                    RefactorCodeCommand: Priority.NORMAL,
+                    GenerateTestsCommand: Priority.BACKGROUND,
+                },
+            )
+        )
+
     return dispatcher
+
+
+def get_batch_executor(
+    dispatcher: CommandDispatcher = Depends(get_command_dispatcher),
+) -> BatchExecutor:
+    """Get a batch executor over the command dispatcher."""
+    prefetch = None
+    # Fetch a batch's results from the shared tier in one round trip
+    if settings.result_cache_enabled and settings.result_cache_redis_enabled:
+        prefetch = get_caching_middleware().prefetch
+    return BatchExecutor(
+        dispatcher,
+        max_concurrency=settings.batch_max_concurrency,
+        prefetch=prefetch,
+        # Batch routes have no request deadline; each item gets the full timeout
+        item_timeout=settings.request_timeout,
+    )
+
+
+@lru_cache()
+def get_job_backend() -> JobBackend:
+    """Get the job queue backend based on settings."""
+    if settings.job_backend == "redis":
+        return RedisJobBackend(
+            url=settings.redis_url,
+            max_queue_size=settings.job_queue_max_size,
+            result_ttl=settings.job_result_ttl,
+        )
+    return MemoryJobBackend(
+        max_queue_size=settings.job_queue_max_size,
+        result_ttl=settings.job_result_ttl,
+    )
+
+
+@lru_cache()
+def get_job_worker_pool() -> JobWorkerPool:
+    """Get the job worker pool (started with the application)."""
+    return JobWorkerPool(get_job_backend(), get_command_dispatcher(), workers=settings.job_workers)
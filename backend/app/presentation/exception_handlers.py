@@ -5,16 +5,18 @@ from app.domain.exceptions import (
     ValidationError,
     AIProviderError,
     CodeTooLargeError,
+    ServiceOverloadedError,
 )
 from app.presentation.api.v1.models import ErrorResponse
 import logging
+import math
 
 logger = logging.getLogger(__name__)
 
 
 async def domain_error_handler(request: Request, exc: DomainError) -> JSONResponse:
     """Handle domain layer errors."""
-    logger.warning(f"Domain error: {exc}")
+    logger.warning("Domain error: %s", exc)
 
     error_response = ErrorResponse(type="domain_error", message=str(exc))
 
@@ -25,7 +27,7 @@ async def validation_error_handler(
     request: Request, exc: ValidationError
 ) -> JSONResponse:
     """Handle validation errors."""
-    logger.warning(f"Validation error: {exc}")
+    logger.warning("Validation error: %s", exc)
 
     details = None
     if isinstance(exc, CodeTooLargeError):
@@ -42,18 +44,39 @@ async def ai_provider_error_handler(
     request: Request, exc: AIProviderError
 ) -> JSONResponse:
     """Handle AI provider errors."""
-    logger.error(f"AI provider error: {exc}")
+    logger.error("AI provider error: %s", exc)
 
     error_response = ErrorResponse(
         type="ai_provider_error", message="AI service temporarily unavailable"
     )
 
-    return JSONResponse(status_code=503, content=error_response.dict())
+    # Tell clients when to come back if we know it, instead of letting them retry blindly
+    headers = None
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is not None:
+        headers = {"Retry-After": str(max(math.ceil(retry_after), 1))}
+
+    return JSONResponse(status_code=503, content=error_response.dict(), headers=headers)
+
+
+async def service_overloaded_handler(
+    request: Request, exc: ServiceOverloadedError
+) -> JSONResponse:
+    """Handle load shedding with a fast 429 telling clients when to retry."""
+    logger.warning("Service overloaded: %s", exc)
+
+    error_response = ErrorResponse(type="service_overloaded", message=str(exc))
+
+    headers = None
+    if exc.retry_after is not None:
+        headers = {"Retry-After": str(max(math.ceil(exc.retry_after), 1))}
+
+    return JSONResponse(status_code=429, content=error_response.dict(), headers=headers)
 
 
 async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     """Handle unexpected errors."""
-    logger.error(f"Unexpected error: {exc}", exc_info=True)
+    logger.error("Unexpected error: %s", exc, exc_info=True)
 
     error_response = ErrorResponse(
         type="internal_error", message="An unexpected error occurred"
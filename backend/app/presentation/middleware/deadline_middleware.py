@@ -0,0 +1,116 @@
+"""Request deadline and client disconnect middleware."""
+
+import asyncio
+import logging
+from contextlib import nullcontext
+from typing import ContextManager, Optional, Sequence
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.application.deadline import deadline_scope
+
+logger = logging.getLogger(__name__)
+
+# Status recorded for requests abandoned by the client (nginx convention)
+CLIENT_CLOSED_REQUEST = 499
+
+
+class RequestDeadlineMiddleware:
+    """
+    Give each request a deadline and cancel it when the client goes away.
+
+    The deadline is set in a context variable that the AI provider reads to
+    clip its upstream timeouts and retries, so no upstream call outlives the
+    request that asked for it.
+
+    Once the request body has been read, this middleware is the only reader
+    of the client connection: it waits for ``http.disconnect`` in the
+    background and, if it arrives before the response is complete, cancels
+    the request's work, upstream calls included. The application still sees
+    the disconnect on ``receive`` (streaming responses listen for it).
+    A plain ASGI middleware, so it adds no body wrapping of its own.
+
+    Requests under ``exempt_paths`` get no deadline, only disconnect
+    cancellation, for routes that scope deadlines of their own (a batch
+    gives each item the timeout instead of sharing one across all items).
+    """
+
+    def __init__(self, app: ASGIApp, timeout: float, exempt_paths: Sequence[str] = ()) -> None:
+        self.app = app
+        self._timeout = timeout
+        self._exempt_paths = tuple(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        disconnected = asyncio.Event()
+        response_started = False
+        response_complete = False
+        watcher: Optional[asyncio.Task[None]] = None
+
+        async def watch_disconnect() -> None:
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+            if not response_complete:
+                app_task.cancel()
+
+        async def receive_wrapper() -> Message:
+            nonlocal watcher
+            if watcher is not None:
+                # The body is fully read; the watcher owns the connection now
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected.set()
+            elif not message.get("more_body", False):
+                watcher = asyncio.create_task(watch_disconnect())
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started, response_complete
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        async def run_app() -> None:
+            await self.app(scope, receive_wrapper, send_wrapper)
+
+        scope_deadline: ContextManager[None] = (
+            nullcontext()
+            if scope["path"].startswith(self._exempt_paths)
+            else deadline_scope(self._timeout)
+        )
+        # The task copies the current context, deadline included
+        with scope_deadline:
+            app_task = asyncio.create_task(run_app())
+        try:
+            await app_task
+        except asyncio.CancelledError:
+            if not disconnected.is_set():
+                raise
+            logger.info("Client disconnected, cancelled %s %s", scope["method"], scope["path"])
+            if not response_started:
+                await _report_client_closed(send)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            if not app_task.done():
+                # This middleware itself was cancelled (e.g. server shutdown)
+                app_task.cancel()
+
+
+async def _report_client_closed(send: Send) -> None:
+    # Nobody receives this response; it lets the outer logging and metrics
+    # middleware record the request as abandoned rather than as a server error
+    try:
+        await send({"type": "http.response.start", "status": CLIENT_CLOSED_REQUEST, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+    except Exception as e:
+        logger.debug("Could not record the abandoned request: %s", e)
@@ -1,59 +1,86 @@
 """Request logging and correlation middleware."""
 
+import logging
+import re
 import time
 import uuid
-import logging
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.log.correlation import correlation_scope
+from app.infrastructure.log.setup import SAMPLED
 
 logger = logging.getLogger(__name__)
 
+CORRELATION_HEADER = "X-Correlation-ID"
+
+# Incoming IDs end up in logs and response headers, so only accept plain tokens
+_VALID_CORRELATION_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+class RequestLoggingMiddleware:
+    """
+    Log each request and tag everything it does with a correlation ID.
+
+    A plain ASGI middleware rather than ``BaseHTTPMiddleware``: no extra task
+    or body stream wrapping per request, and streamed responses pass straight
+    through. The correlation ID is taken from an incoming ``X-Correlation-ID``
+    header when valid, otherwise generated. It is set in a context variable
+    for the lifetime of the request, so every log record emitted while
+    handling it (handlers, dispatcher, AI provider) can carry it, and is
+    echoed in the response header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        correlation_id = _incoming_correlation_id(scope) or uuid.uuid4().hex
+        # Kept on request.state for handlers that read it from there
+        scope.setdefault("state", {})["correlation_id"] = correlation_id
+
+        started = time.perf_counter()
+        status = 500
+        response_bytes = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)[CORRELATION_HEADER] = correlation_id
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        with correlation_scope(correlation_id):
+            logger.info("Request started: %s %s", scope["method"], scope["path"], extra=SAMPLED)
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                duration_ms = (time.perf_counter() - started) * 1000
+                # Server errors are never sampled away
+                logger.log(
+                    logging.WARNING if status >= 500 else logging.INFO,
+                    "Request completed: %s %s %s in %.1fms (%s bytes)",
+                    scope["method"],
+                    scope["path"],
+                    status,
+                    duration_ms,
+                    response_bytes,
+                    extra=SAMPLED,
+                )
+
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging requests and adding correlation IDs."""
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request with logging and correlation ID."""
-        # Generate correlation ID
-        correlation_id = str(uuid.uuid4())
-
-        # Add to request state for use in handlers
-        request.state.correlation_id = correlation_id
-
-        # Start timing
-        start_time = time.time()
-
-        # Log request
-        logger.info(
-            "Request started",
-            extra={
-                "correlation_id": correlation_id,
-                "method": request.method,
-                "url": str(request.url),
-                "user_agent": request.headers.get("user-agent", ""),
-                "content_length": request.headers.get("content-length", 0),
-            },
-        )
-
-        # Process request
-        response = await call_next(request)
-
-        # Calculate duration
-        duration_ms = int((time.time() - start_time) * 1000)
-
-        # Add correlation ID to response headers
-        response.headers["X-Correlation-ID"] = correlation_id
-
-        # Log response
-        logger.info(
-            "Request completed",
-            extra={
-                "correlation_id": correlation_id,
-                "status_code": response.status_code,
-                "duration_ms": duration_ms,
-                "response_size": response.headers.get("content-length", 0),
-            },
-        )
-
-        return response
+def _incoming_correlation_id(scope: Scope) -> Optional[str]:
+    header = CORRELATION_HEADER.lower().encode("latin-1")
+    for name, value in scope["headers"]:
+        if name == header:
+            candidate = value.decode("latin-1")
+            return candidate if _VALID_CORRELATION_ID.match(candidate) else None
+    return None
@@ -0,0 +1,67 @@
+"""HTTP request metrics middleware."""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.metrics.registry import MetricsRegistry
+
+
+class MetricsMiddleware:
+    """
+    Record request counts, latencies and in-flight requests per route.
+
+    A plain ASGI middleware rather than ``BaseHTTPMiddleware``, so streamed
+    responses pass through untouched. Requests are labelled by route template
+    (``/api/v1/jobs/{job_id}``) rather than raw path to keep label
+    cardinality bounded; latency runs until the response body is complete.
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry) -> None:
+        self.app = app
+        self._requests = registry.counter(
+            "http_requests_total",
+            "HTTP requests handled",
+            ["method", "route", "status"],
+        )
+        self._duration = registry.histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency until the response body is complete",
+            ["method", "route", "status"],
+        )
+        self._in_flight = registry.gauge(
+            "http_requests_in_flight", "HTTP requests currently being handled"
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self._in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._in_flight.dec()
+            labels = {
+                "method": scope["method"],
+                "route": _route_template(scope),
+                "status": str(status),
+            }
+            self._requests.inc(**labels)
+            self._duration.observe(time.perf_counter() - started, **labels)
+
+
+def _route_template(scope: Scope) -> str:
+    # Set by the router once a route matched
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
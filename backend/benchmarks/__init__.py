@@ -0,0 +1 @@
+"""Load-testing and latency benchmarks for the API, run with ``python -m benchmarks.load_test``."""
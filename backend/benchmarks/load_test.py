@@ -0,0 +1,343 @@
+"""
+Load test for the explain, refactor and tests endpoints.
+
+By default the app runs in-process behind ``httpx.ASGITransport`` with the
+fake AI provider, so results reflect the server's own overhead. Use
+``--spawn-server`` to benchmark a real uvicorn process (CPU/RSS are then
+measured for the server alone), or ``--url`` for an already running one.
+
+Examples:
+    python -m benchmarks.load_test -c 32 -n 2000 --output baseline.json
+    python -m benchmarks.load_test --spawn-server --fake-latency lognormal:0.8,0.5
+    python -m benchmarks.load_test --compare baseline.json --output current.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+import httpx
+
+from benchmarks.report import Sample, build_report, compare_reports, format_report
+
+ENDPOINTS = {
+    "explain": "/api/v1/explain/",
+    "refactor": "/api/v1/refactor/",
+    "tests": "/api/v1/tests/",
+}
+
+WARMUP_OFFSET = 1_000_000
+
+
+def make_payload(endpoint: str, index: int, snippets: int, code_lines: int) -> dict[str, Any]:
+    """
+    Request body for the ``index``-th request.
+
+    With ``snippets`` > 0 requests cycle through that many distinct snippets,
+    so repeated content can exercise the result cache; 0 makes every request unique.
+    """
+    variant = index % snippets if snippets else index
+    body = "\n".join(f"    total += x * {variant} + {line}" for line in range(code_lines))
+    payload: dict[str, Any] = {
+        "code": f"def compute_{variant}(x):\n    total = 0\n{body}\n    return total\n",
+        "language": "python",
+    }
+    if endpoint == "refactor":
+        payload["goal"] = "readability"
+    elif endpoint == "tests":
+        payload["test_framework"] = "pytest"
+    return payload
+
+
+class ProcessSampler:
+    """CPU time and memory of a process, read from ``/proc`` or ``getrusage``."""
+
+    def __init__(self, pid: Optional[int] = None) -> None:
+        self._pid = pid
+        self._start_cpu = 0.0
+
+    def start(self) -> None:
+        self._start_cpu = self._cpu_seconds()
+
+    def stop(self, requests: int) -> dict[str, Any]:
+        cpu = self._cpu_seconds() - self._start_cpu
+        rss_mb, peak_rss_mb = self._memory_mb()
+        return {
+            "scope": "server" if self._pid else "client+server (in-process)",
+            "cpu_seconds": cpu,
+            "cpu_ms_per_request": cpu * 1000 / requests if requests else 0.0,
+            "rss_mb": rss_mb,
+            "peak_rss_mb": peak_rss_mb,
+        }
+
+    def _cpu_seconds(self) -> float:
+        if self._pid is None:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            return usage.ru_utime + usage.ru_stime
+
+        # utime and stime are fields 14 and 15, after the parenthesised command name
+        fields = Path(f"/proc/{self._pid}/stat").read_text().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    def _memory_mb(self) -> tuple[Optional[float], Optional[float]]:
+        status = Path(f"/proc/{self._pid or 'self'}/status")
+        if status.exists():
+            values = {}
+            for line in status.read_text().splitlines():
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "VmHWM"):
+                    values[key] = int(value.split()[0]) / 1024
+            return values.get("VmRSS"), values.get("VmHWM")
+
+        if self._pid is None:
+            # ru_maxrss is in kilobytes on Linux but bytes on macOS
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return None, peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+        return None, None
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    endpoints: Sequence[str],
+    concurrency: int,
+    requests: int,
+    duration: Optional[float] = None,
+    snippets: int = 0,
+    code_lines: int = 20,
+    offset: int = 0,
+) -> tuple[list[Sample], float]:
+    """
+    Drive the endpoints with ``concurrency`` closed-loop workers.
+
+    Requests rotate over ``endpoints``. The run stops after ``requests``
+    requests, or after ``duration`` seconds when given.
+
+    Returns:
+        The collected samples and the wall-clock duration of the run
+    """
+    samples: list[Sample] = []
+    next_index = 0
+    started = time.perf_counter()
+
+    def claim() -> Optional[int]:
+        nonlocal next_index
+        if duration is not None:
+            if time.perf_counter() - started >= duration:
+                return None
+        elif next_index >= requests:
+            return None
+        next_index += 1
+        return next_index - 1
+
+    async def worker() -> None:
+        while (index := claim()) is not None:
+            endpoint = endpoints[index % len(endpoints)]
+            payload = make_payload(endpoint, offset + index, snippets, code_lines)
+            request_started = time.perf_counter()
+            status: Optional[int] = None
+            error: Optional[str] = None
+            try:
+                response = await client.post(ENDPOINTS[endpoint], json=payload)
+                status = response.status_code
+            except httpx.HTTPError as e:
+                error = type(e).__name__
+            samples.append(
+                Sample(
+                    endpoint=endpoint,
+                    started=request_started - started,
+                    latency=time.perf_counter() - request_started,
+                    status=status,
+                    error=error,
+                )
+            )
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _spawn_server(env: dict[str, str]) -> tuple[subprocess.Popen[bytes], str]:
+    port = _free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            if httpx.get(f"{url}/ping").status_code == 200:
+                return server, url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+
+    server.terminate()
+    raise RuntimeError("Server did not become ready within 30 seconds")
+
+
+async def _benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    if args.fake_latency:
+        os.environ["FAKE_LATENCY"] = args.fake_latency
+    # The benchmark measures the server, not the upstream API
+    os.environ.setdefault("AI_PROVIDER", "fake")
+
+    server: Optional[subprocess.Popen[bytes]] = None
+    server_pid = args.server_pid
+    limits = httpx.Limits(max_connections=args.concurrency)
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout)
+    elif args.spawn_server:
+        server, url = _spawn_server(dict(os.environ))
+        server_pid = server.pid
+        client = httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout)
+    else:
+        from app.main import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://benchmark",
+            timeout=args.timeout,
+        )
+
+    endpoints = args.endpoints.split(",")
+    try:
+        async with client:
+            if args.warmup:
+                # Offset keeps unique warm-up snippets from pre-filling the cache
+                await run_load(
+                    client,
+                    endpoints,
+                    args.concurrency,
+                    args.warmup,
+                    snippets=args.snippets,
+                    code_lines=args.code_lines,
+                    offset=WARMUP_OFFSET,
+                )
+
+            sampler = ProcessSampler(server_pid)
+            sampler.start()
+            samples, elapsed = await run_load(
+                client,
+                endpoints,
+                args.concurrency,
+                args.requests,
+                duration=args.duration,
+                snippets=args.snippets,
+                code_lines=args.code_lines,
+            )
+            resources = sampler.stop(len(samples))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    config = {
+        "label": args.label,
+        "target": args.url or ("spawned server" if args.spawn_server else "in-process"),
+        "ai_provider": os.environ.get("AI_PROVIDER"),
+        "fake_latency": os.environ.get("FAKE_LATENCY"),
+        "endpoints": endpoints,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "duration": args.duration,
+        "snippets": args.snippets,
+        "code_lines": args.code_lines,
+    }
+    return build_report(samples, elapsed, config, resources)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Benchmark a running server at this base URL")
+    target.add_argument(
+        "--spawn-server", action="store_true", help="Start a uvicorn server to benchmark"
+    )
+    parser.add_argument("--server-pid", type=int, help="PID of the --url server, for CPU/RSS")
+    parser.add_argument("--endpoints", default="explain,refactor,tests")
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("-n", "--requests", type=int, default=600)
+    parser.add_argument("--duration", type=float, help="Run for this many seconds instead")
+    parser.add_argument("--warmup", type=int, default=30, help="Unmeasured warm-up requests")
+    parser.add_argument(
+        "--snippets",
+        type=int,
+        default=0,
+        help="Cycle through this many distinct snippets (0 = every request unique)",
+    )
+    parser.add_argument("--code-lines", type=int, default=20, help="Lines per snippet")
+    parser.add_argument("--fake-latency", help="FAKE_LATENCY spec for the fake provider")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--label", default="", help="Free-form label stored in the report")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON report to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Allowed relative regression before --compare fails (default 0.10)",
+    )
+
+    args = parser.parse_args(argv)
+    unknown = set(args.endpoints.split(",")) - ENDPOINTS.keys()
+    if unknown:
+        parser.error(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    # Per-request client logging would dominate the benchmark's own CPU time
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    report = asyncio.run(_benchmark(args))
+
+    print(format_report(report))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.output}")
+
+    if args.compare:
+        regressions = compare_reports(json.loads(args.compare.read_text()), report, args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions against baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
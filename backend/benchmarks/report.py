@@ -0,0 +1,148 @@
+"""Aggregation of benchmark samples into comparable, machine-readable reports."""
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+# Lower is better for these, higher is better for throughput
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+@dataclass(frozen=True)
+class Sample:
+    """Outcome of a single benchmark request."""
+
+    endpoint: str
+    started: float
+    latency: float
+    status: Optional[int]
+    error: Optional[str] = None
+
+    @property
+    def failed(self) -> bool:
+        """Whether the request errored or returned a non-2xx/304 status."""
+        return self.error is not None or self.status is None or self.status >= 400
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for an empty sequence)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(samples: Sequence[Sample], elapsed: float) -> dict[str, Any]:
+    """Throughput, latency percentiles and error breakdown for a set of samples."""
+    latencies = [sample.latency * 1000 for sample in samples]
+    failures = [sample for sample in samples if sample.failed]
+    statuses = Counter(str(sample.status) for sample in samples if sample.status is not None)
+    errors = Counter(sample.error for sample in samples if sample.error is not None)
+
+    return {
+        "requests": len(samples),
+        "failures": len(failures),
+        "error_rate": len(failures) / len(samples) if samples else 0.0,
+        "throughput_rps": len(samples) / elapsed if elapsed > 0 else 0.0,
+        "mean_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": max(latencies, default=0.0),
+        "status_codes": dict(statuses),
+        "errors": dict(errors),
+    }
+
+
+def build_report(
+    samples: Sequence[Sample],
+    elapsed: float,
+    config: dict[str, Any],
+    resources: dict[str, Any],
+) -> dict[str, Any]:
+    """Full report with overall and per-endpoint summaries."""
+    endpoints = sorted({sample.endpoint for sample in samples})
+    return {
+        "config": config,
+        "elapsed_seconds": elapsed,
+        "overall": summarize(samples, elapsed),
+        "endpoints": {
+            endpoint: summarize(
+                [sample for sample in samples if sample.endpoint == endpoint], elapsed
+            )
+            for endpoint in endpoints
+        },
+        "resources": resources,
+    }
+
+
+def compare_reports(
+    baseline: dict[str, Any], current: dict[str, Any], tolerance: float = 0.10
+) -> list[str]:
+    """
+    List regressions of ``current`` against ``baseline``.
+
+    A regression is a latency percentile or CPU time per request growing, or
+    throughput shrinking, by more than ``tolerance`` (a fraction), or the
+    error rate increasing at all.
+
+    Returns:
+        Human-readable regression descriptions; empty when there are none
+    """
+    regressions: list[str] = []
+    sections = {"overall": (baseline["overall"], current["overall"])}
+    for endpoint, summary in current.get("endpoints", {}).items():
+        if endpoint in baseline.get("endpoints", {}):
+            sections[endpoint] = (baseline["endpoints"][endpoint], summary)
+
+    for name, (before, after) in sections.items():
+        for metric in LATENCY_METRICS:
+            if _grew(before[metric], after[metric], tolerance):
+                regressions.append(f"{name}: {metric} {before[metric]:.1f} -> {after[metric]:.1f}")
+        if after["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput_rps {before['throughput_rps']:.1f} -> "
+                f"{after['throughput_rps']:.1f}"
+            )
+        if after["error_rate"] > before["error_rate"]:
+            regressions.append(
+                f"{name}: error_rate {before['error_rate']:.2%} -> {after['error_rate']:.2%}"
+            )
+
+    before_cpu = baseline.get("resources", {}).get("cpu_ms_per_request")
+    after_cpu = current.get("resources", {}).get("cpu_ms_per_request")
+    if before_cpu and after_cpu and _grew(before_cpu, after_cpu, tolerance):
+        regressions.append(f"resources: cpu_ms_per_request {before_cpu:.2f} -> {after_cpu:.2f}")
+
+    return regressions
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Render a report as a plain-text table."""
+    lines = [
+        f"{'endpoint':<12}{'reqs':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'p99 ms':>10}{'errors':>9}"
+    ]
+    rows = [*report["endpoints"].items(), ("overall", report["overall"])]
+    for name, summary in rows:
+        lines.append(
+            f"{name:<12}{summary['requests']:>8}{summary['throughput_rps']:>10.1f}"
+            f"{summary['p50_ms']:>10.1f}{summary['p95_ms']:>10.1f}{summary['p99_ms']:>10.1f}"
+            f"{summary['error_rate']:>9.1%}"
+        )
+
+    resources = report["resources"]
+    if resources:
+        lines.append(
+            f"server cpu: {resources.get('cpu_seconds', 0):.2f}s "
+            f"({resources.get('cpu_ms_per_request', 0):.2f} ms/request), "
+            f"peak rss: {resources.get('peak_rss_mb', 0):.1f} MB "
+            f"[{resources.get('scope', 'unknown')}]"
+        )
+    return "\n".join(lines)
+
+
+def _grew(before: float, after: float, tolerance: float) -> bool:
+    return before > 0 and after > before * (1 + tolerance)
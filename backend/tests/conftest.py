@@ -0,0 +1,81 @@
+from typing import AsyncIterator, Iterator, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.commands.explain_code_command import ExplainCodeCommand
+from app.application.commands.generate_tests_command import GenerateTestsCommand
+from app.application.commands.refactor_code_command import RefactorCodeCommand
+from app.application.dispatch import CommandDispatcher
+from app.application.handlers.explain_code_handler import ExplainCodeHandler
+from app.application.handlers.generate_tests_handler import GenerateTestsHandler
+from app.application.handlers.refactor_code_handler import RefactorCodeHandler
+from app.application.interfaces.ai_provider import AIProvider
+from app.domain.value_objects.code_explanation import CodeExplanation
+from app.domain.value_objects.code_refactor import CodeRefactor
+from app.domain.value_objects.code_snippet import CodeSnippet
+from app.domain.value_objects.test_scaffold import TestScaffold as Scaffold
+from app.main import app
+from app.presentation.dependencies import get_command_dispatcher
+
+
+class StubProvider(AIProvider):
+    """Provider that streams explanations natively and falls back for the rest."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def explain_code(self, code_snippet: CodeSnippet) -> CodeExplanation:
+        self.calls += 1
+        return CodeExplanation(snippet=code_snippet, explanation="full", provider="stub")
+
+    async def stream_explain_code(self, code_snippet: CodeSnippet) -> AsyncIterator[str]:
+        for token in ["Hello", " ", "world"]:
+            yield token
+
+    async def refactor_code(
+        self, code_snippet: CodeSnippet, goal: Optional[str] = None
+    ) -> CodeRefactor:
+        return CodeRefactor(
+            original_snippet=code_snippet,
+            refactored_code="x = 1",
+            explanation="refactored",
+            improvements=["simpler"],
+            provider="stub",
+        )
+
+    async def generate_tests(
+        self, code_snippet: CodeSnippet, test_framework: Optional[str] = None
+    ) -> Scaffold:
+        return Scaffold(
+            original_snippet=code_snippet,
+            test_code="def test_x(): pass",
+            test_framework="pytest",
+            test_cases=["test_x"],
+            setup_instructions=None,
+            provider="stub",
+        )
+
+    @property
+    def provider_name(self) -> str:
+        return "stub"
+
+
+def stub_dispatcher(provider: AIProvider) -> CommandDispatcher:
+    dispatcher = CommandDispatcher()
+    dispatcher.register(ExplainCodeCommand, ExplainCodeHandler(provider))
+    dispatcher.register(RefactorCodeCommand, RefactorCodeHandler(provider))
+    dispatcher.register(GenerateTestsCommand, GenerateTestsHandler(provider))
+    return dispatcher
+
+
+@pytest.fixture
+def stub_provider() -> StubProvider:
+    return StubProvider()
+
+
+@pytest.fixture
+def client(stub_provider: StubProvider) -> Iterator[TestClient]:
+    app.dependency_overrides[get_command_dispatcher] = lambda: stub_dispatcher(stub_provider)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
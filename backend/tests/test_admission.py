@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from app.application.admission import AdmissionController, Priority
+from app.domain.exceptions import ServiceOverloadedError
+from app.main import app
+from app.presentation.dependencies import get_command_dispatcher
+
+
+async def hold(controller, priority, release, order, name):
+    async with controller.admit(priority):
+        order.append(name)
+        await release.wait()
+
+
+def test_waiters_are_served_by_priority_then_arrival():
+    async def run():
+        controller = AdmissionController(max_concurrency=1, max_queue=10)
+        release = asyncio.Event()
+        order: list[str] = []
+
+        tasks = [asyncio.create_task(hold(controller, Priority.NORMAL, release, order, "first"))]
+        await asyncio.sleep(0)
+        for name, priority in [
+            ("tests", Priority.BACKGROUND),
+            ("refactor", Priority.NORMAL),
+            ("explain", Priority.INTERACTIVE),
+        ]:
+            tasks.append(asyncio.create_task(hold(controller, priority, release, order, name)))
+        await asyncio.sleep(0)
+        assert controller.stats()["queue_depth"] == 3
+
+        release.set()
+        await asyncio.gather(*tasks)
+        return order, controller.stats()
+
+    order, stats = asyncio.run(run())
+
+    assert order == ["first", "explain", "refactor", "tests"]
+    assert stats["running"] == 0 and stats["admitted_total"] == 4
+
+
+def test_full_queue_rejects_or_displaces_lower_priority():
+    async def run():
+        controller = AdmissionController(max_concurrency=1, max_queue=1)
+        release = asyncio.Event()
+        order: list[str] = []
+
+        running = asyncio.create_task(hold(controller, Priority.NORMAL, release, order, "a"))
+        await asyncio.sleep(0)
+        background = asyncio.create_task(hold(controller, Priority.BACKGROUND, release, order, "b"))
+        await asyncio.sleep(0)
+
+        # Same or lower priority than every waiter: rejected immediately
+        with pytest.raises(ServiceOverloadedError) as rejected:
+            async with controller.admit(Priority.BACKGROUND):
+                pass
+        assert rejected.value.retry_after > 0
+
+        # Higher priority: takes the background waiter's place
+        interactive = asyncio.create_task(
+            hold(controller, Priority.INTERACTIVE, release, order, "c")
+        )
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(running, background, interactive, return_exceptions=True)
+        return results, order, controller.stats()
+
+    results, order, stats = asyncio.run(run())
+
+    assert isinstance(results[1], ServiceOverloadedError)
+    assert order == ["a", "c"]
+    assert stats["rejected_total"] == 1 and stats["displaced_total"] == 1
+
+
+def test_waiters_time_out_instead_of_queueing_forever():
+    async def run():
+        controller = AdmissionController(max_concurrency=1, max_queue=5, max_wait=0.01)
+        release = asyncio.Event()
+        running = asyncio.create_task(hold(controller, Priority.NORMAL, release, [], "a"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServiceOverloadedError):
+            async with controller.admit(Priority.INTERACTIVE):
+                pass
+
+        release.set()
+        await running
+        return controller.stats()
+
+    stats = asyncio.run(run())
+
+    assert stats["timed_out_total"] == 1 and stats["queue_depth"] == 0
+
+
+def test_overload_maps_to_429_with_retry_after(client):
+    class OverloadedDispatcher:
+        async def dispatch(self, command):
+            raise ServiceOverloadedError("Server is at capacity", retry_after=2.5)
+
+    app.dependency_overrides[get_command_dispatcher] = lambda: OverloadedDispatcher()
+
+    r = client.post("/api/v1/explain/", json={"code": "x = 1"})
+
+    assert r.status_code == 429
+    assert r.headers["retry-after"] == "3"
+    assert r.json()["type"] == "service_overloaded"
@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+from app.application.batch import BatchExecutor
+from app.application.commands.explain_code_command import ExplainCodeCommand
+from app.application.deadline import remaining_time
+from tests.conftest import stub_dispatcher
+
+
+def test_batch_returns_per_item_results_in_request_order(client):
+    r = client.post(
+        "/api/v1/batch/",
+        json={
+            "items": [
+                {"action": "explain", "code": "x = 1", "language": "python"},
+                {"action": "refactor", "code": "y = 2", "goal": "clarity"},
+                {"action": "tests", "code": "def f(): pass", "test_framework": "pytest"},
+            ]
+        },
+    )
+
+    body = r.json()
+    assert r.status_code == 200
+    assert [item["index"] for item in body["results"]] == [0, 1, 2]
+    assert body["results"][1]["result"]["refactored_code"] == "x = 1"
+    assert body["succeeded"] == 3 and body["failed"] == 0
+
+
+def test_batch_stream_emits_ndjson_per_item(client):
+    items = [{"action": "explain", "code": f"x = {i}"} for i in range(3)]
+
+    r = client.post("/api/v1/batch/stream", json={"items": items})
+
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == [0, 1, 2]
+    assert all(line["status"] == 200 for line in lines)
+
+
+def test_executor_caps_concurrency_and_isolates_failures(stub_provider):
+    dispatcher = stub_dispatcher(stub_provider)
+    active = peak = 0
+    original = dispatcher.dispatch
+
+    async def tracking_dispatch(command):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if command.code == "boom":
+            raise RuntimeError("boom")
+        return await original(command)
+
+    dispatcher.dispatch = tracking_dispatch
+    commands = [ExplainCodeCommand(code="boom" if i == 3 else f"x = {i}") for i in range(10)]
+
+    outcomes = asyncio.run(BatchExecutor(dispatcher, max_concurrency=3).run(commands))
+
+    assert peak == 3
+    assert [o.index for o in outcomes] == list(range(10))
+    assert not outcomes[3].ok and all(o.ok for i, o in enumerate(outcomes) if i != 3)
+
+
+def test_executor_gives_each_item_its_own_deadline(stub_provider):
+    dispatcher = stub_dispatcher(stub_provider)
+    remaining = []
+
+    async def tracking_dispatch(command):
+        remaining.append(remaining_time())
+        await asyncio.sleep(0.05)
+
+    dispatcher.dispatch = tracking_dispatch
+    commands = [ExplainCodeCommand(code=f"x = {i}") for i in range(3)]
+
+    asyncio.run(BatchExecutor(dispatcher, max_concurrency=1, item_timeout=1).run(commands))
+
+    # Run one after the other, yet each item starts with the full timeout
+    assert all(0.95 < left <= 1 for left in remaining)
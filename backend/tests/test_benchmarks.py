@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+
+from app.main import app
+from app.presentation.dependencies import get_command_dispatcher
+from benchmarks.load_test import run_load
+from benchmarks.report import Sample, build_report, compare_reports, percentile
+from tests.conftest import stub_dispatcher
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 95) == 0.0
+
+
+def test_compare_flags_latency_throughput_and_error_regressions():
+    def report(latency: float, status: int) -> dict:
+        samples = [Sample("explain", 0.0, latency, status) for _ in range(10)]
+        return build_report(samples, elapsed=latency * 10, config={}, resources={})
+
+    baseline = report(0.1, 200)
+
+    assert compare_reports(baseline, report(0.105, 200)) == []
+    regressions = compare_reports(baseline, report(0.2, 500))
+    assert any("p95_ms" in r for r in regressions)
+    assert any("throughput_rps" in r for r in regressions)
+    assert any("error_rate" in r for r in regressions)
+
+
+def test_run_load_in_process_rotates_endpoints(stub_provider):
+    app.dependency_overrides[get_command_dispatcher] = lambda: stub_dispatcher(stub_provider)
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+        ) as client:
+            return await run_load(client, ["explain", "refactor", "tests"], 4, 12)
+
+    try:
+        samples, elapsed = asyncio.run(run())
+    finally:
+        app.dependency_overrides.clear()
+
+    assert len(samples) == 12 and elapsed > 0
+    assert {s.endpoint for s in samples} == {"explain", "refactor", "tests"}
+    assert all(s.status == 200 for s in samples)
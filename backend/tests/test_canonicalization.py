@@ -0,0 +1,69 @@
+import pytest
+
+from app.application.commands.explain_code_command import ExplainCodeCommand
+from app.application.commands.refactor_code_command import RefactorCodeCommand
+from app.application.content_key import ContentKeyBuilder
+from app.domain.services.code_canonicalization_service import CodeCanonicalizationService
+
+fingerprint = CodeCanonicalizationService.fingerprint
+
+
+def test_python_fingerprint_ignores_formatting_and_comments():
+    original = "def add(a, b):\n    return a + b\n"
+    reformatted = "# Adds numbers\ndef add( a,b ):\n\treturn (a +\n            b)  # sum\n\n\n"
+
+    assert fingerprint(original, "python") == fingerprint(reformatted, "python")
+    assert fingerprint(original, "python") != fingerprint(original.replace("+", "-"), "python")
+    # Without a hint, code that parses as Python is treated as Python
+    assert fingerprint(original, None) == fingerprint(reformatted, None)
+
+
+@pytest.mark.parametrize("code", ["a+" * 20000 + "a", "-" * 40000 + "1"], ids=["sum", "negation"])
+def test_fingerprint_of_deeply_nested_python_falls_back_to_tokens(code):
+    # Too deep for the parser (RecursionError / MemoryError), yet under max_code_length
+    assert CodeCanonicalizationService.python_ast_dump(code) is None
+    assert fingerprint(code, "python") == fingerprint(code + "  # deep\n", "python")
+    assert fingerprint(code, None) != fingerprint(code[:-1] + "b", None)
+
+
+@pytest.mark.parametrize(
+    "language, first, second",
+    [
+        (
+            "javascript",
+            "function add(a, b) {\n  return a + b; // sum\n}\n",
+            "function add(a,b){\r\n\treturn a+b; /* sum */\r\n}",
+        ),
+        ("sql", "SELECT a -- first\nFROM t", "SELECT a\n  FROM   t"),
+        ("yaml", "a:\n  b: 1  # one\n", "a:\n    b:   1\n\n"),
+        ("python", "def broken(:\n  pass  # c\n", "def broken(:\n    pass\n"),
+    ],
+)
+def test_token_fingerprint_ignores_formatting_and_comments(language, first, second):
+    assert fingerprint(first, language) == fingerprint(second, language)
+
+
+@pytest.mark.parametrize(
+    "language, first, second",
+    [
+        ("c", 'puts("a  b");', 'puts("a b");'),  # Strings are kept verbatim
+        ("c", "x = a - -b;", "x = a--b;"),
+        ("yaml", "a:\n  - x\n", "a:\n  -x\n"),
+        ("yaml", "a:\n  b: 1\n", "a:\nb: 1\n"),  # Nesting depth counts
+        (None, "x = 1 // 2", "x = 1"),  # Unknown syntax keeps everything
+    ],
+)
+def test_token_fingerprint_keeps_meaningful_differences(language, first, second):
+    assert fingerprint(first, language) != fingerprint(second, language)
+
+
+def test_content_key_uses_fingerprint_for_canonical_commands_only():
+    builder = ContentKeyBuilder(canonical_commands=[ExplainCodeCommand])
+    code, reformatted = "x = 1  # one\n", "x=1\n"
+
+    assert builder.build(ExplainCodeCommand(code=code, language="Python")) == builder.build(
+        ExplainCodeCommand(code=reformatted, language="python")
+    )
+    assert builder.build(RefactorCodeCommand(code=code)) != builder.build(
+        RefactorCodeCommand(code=reformatted)
+    )
@@ -0,0 +1,234 @@
+import asyncio
+
+import pytest
+
+from app.application.chunked_explain import ChunkedExplainer
+from app.application.commands.explain_code_command import ExplainCodeCommand
+from app.application.content_key import ContentKeyBuilder
+from app.application.handlers.explain_code_handler import ExplainCodeHandler
+from app.domain.exceptions import AIProviderError
+from app.domain.services.code_chunking_service import CodeChunkingService
+from app.domain.value_objects.code_explanation import CodeExplanation
+from app.domain.value_objects.code_snippet import CodeSnippet
+from app.infrastructure.ai.fake_ai_provider import FakeAIProvider
+from app.infrastructure.ai.latency_models import FixedLatency
+from app.infrastructure.cache.memory_result_cache import MemoryResultCache
+from tests.conftest import StubProvider
+
+PYTHON_MODULE = """import os
+
+# Helper for paths
+def first(path):
+    return os.path.basename(path)
+
+
+@decorated
+class Second:
+    def method(self):
+        return 1
+
+CONSTANT = 3
+OTHER = 4
+
+async def third():
+    pass
+"""
+
+JS_MODULE = """const x = 1;
+
+function first() {
+  if (x) {
+
+    return 1;
+  }
+}
+
+class Second {
+  run() {}
+}
+"""
+
+
+def test_python_units_follow_top_level_definitions():
+    units = CodeChunkingService.split_units(PYTHON_MODULE, "python")
+
+    assert [unit.names for unit in units] == [(), ("first",), ("Second",), (), ("third",)]
+    assert "".join(unit.content for unit in units) == PYTHON_MODULE
+    # Comments and decorators belong to the definition below them
+    assert units[1].content.startswith("\n# Helper")
+    assert "@decorated" in units[2].content
+    assert (units[3].start_line, units[3].end_line) == (12, 14)
+
+
+def test_other_languages_split_at_unindented_lines_outside_braces():
+    units = CodeChunkingService.split_units(JS_MODULE, "javascript")
+
+    assert [unit.names for unit in units] == [(), ("first",), ("Second",)]
+    assert "".join(unit.content for unit in units) == JS_MODULE
+
+
+def test_invalid_python_falls_back_to_heuristic():
+    code = "def broken(:\n    pass\n\ndef fine():\n    pass\n"
+
+    units = CodeChunkingService.split_units(code, "python")
+
+    assert [unit.names for unit in units] == [("broken",), ("fine",)]
+
+
+@pytest.mark.parametrize("nested", ["a+" * 20000 + "a", "-" * 40000 + "1"])
+def test_too_deeply_nested_python_falls_back_to_heuristic(nested):
+    code = f"def f():\n    pass\n\nx = {nested}\n"
+
+    units = CodeChunkingService.split_units(code, "python")
+
+    assert [unit.names for unit in units] == [("f",), ()]
+
+
+def test_split_packs_small_units_and_cuts_large_ones():
+    functions = [f"def f{i}():\n    return {i}\n\n" for i in range(10)]
+    big = "def big():\n" + "".join(f"    x{i} = {i}\n" for i in range(100))
+    code = "".join(functions) + big
+
+    chunks = CodeChunkingService.split(code, "python", max_chunk_chars=200)
+
+    assert "".join(chunk.content for chunk in chunks) == code
+    assert all(len(chunk.content) <= 200 for chunk in chunks)
+    assert len(chunks[0].names) > 1  # Several small functions share a chunk
+    assert chunks[-1].names == ("big",)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.start_line == previous.end_line + 1
+
+
+class RecordingProvider(StubProvider):
+    def __init__(self, delay: float = 0.0, fail_on: str | None = None) -> None:
+        super().__init__()
+        self.delay = delay
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.summarized = []
+
+    async def explain_code(self, code_snippet: CodeSnippet) -> CodeExplanation:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_on and self.fail_on in code_snippet.content:
+                raise AIProviderError("upstream failed")
+        finally:
+            self.in_flight -= 1
+        name = code_snippet.content.split("(")[0].split()[-1]
+        return CodeExplanation(
+            snippet=code_snippet, explanation=f"explains {name}", provider="stub"
+        )
+
+    async def summarize_explanations(self, code_snippet, sections):
+        self.summarized.append([text for _, text in sections])
+        return CodeExplanation(snippet=code_snippet, explanation="## Overview", provider="stub")
+
+
+def _module(functions: int) -> str:
+    return "".join(f"def f{i}():\n    return {i}\n\n\n" for i in range(functions))
+
+
+def test_chunks_are_explained_concurrently_then_summarized():
+    provider = RecordingProvider(delay=0.01)
+    explainer = ChunkedExplainer(
+        provider, threshold_chars=10, max_chunk_chars=30, max_concurrency=3
+    )
+
+    result = asyncio.run(explainer.explain(CodeSnippet(content=_module(8), language="python")))
+
+    assert provider.calls == 8
+    assert provider.max_in_flight == 3
+    assert provider.summarized == [[f"explains f{i}" for i in range(8)]]
+    assert result.explanation.startswith("## Overview")
+    assert "### Lines 1-2 (`f0`)\n\nexplains f0" in result.explanation
+    assert result.explanation.index("explains f2") < result.explanation.index("explains f7")
+
+
+def test_failed_chunk_fails_the_explanation():
+    provider = RecordingProvider(fail_on="f3")
+    explainer = ChunkedExplainer(provider, threshold_chars=10, max_chunk_chars=30)
+
+    with pytest.raises(AIProviderError):
+        asyncio.run(explainer.explain(CodeSnippet(content=_module(6), language="python")))
+    assert provider.summarized == []
+
+
+def test_handler_chunks_only_large_snippets():
+    provider = RecordingProvider()
+    explainer = ChunkedExplainer(provider, threshold_chars=100, max_chunk_chars=30)
+    handler = ExplainCodeHandler(provider, explainer)
+
+    small = asyncio.run(handler.handle(ExplainCodeCommand(code="def f():\n    pass\n")))
+    large = asyncio.run(handler.handle(ExplainCodeCommand(code=_module(8), language="python")))
+
+    assert small.explanation == "explains f"
+    assert large.explanation.startswith("## Overview")
+    assert large.character_count == len(_module(8))
+    assert len(provider.summarized) == 1
+
+
+def test_fake_provider_result_is_marked_placeholder():
+    provider = FakeAIProvider(latency=FixedLatency(0.0), seed=1)
+    explainer = ChunkedExplainer(provider, threshold_chars=10, max_chunk_chars=30)
+
+    result = asyncio.run(explainer.explain(CodeSnippet(content=_module(3), language="python")))
+
+    assert result.is_placeholder
+    assert result.provider == "fake"
+    assert result.explanation.count("### Lines") == 3
+
+
+def _incremental_explainer(provider: RecordingProvider, min_chars: int = 0) -> ChunkedExplainer:
+    return ChunkedExplainer(
+        provider,
+        threshold_chars=None,
+        cache=MemoryResultCache(),
+        key_builder=ContentKeyBuilder(namespace="test"),
+        incremental=True,
+        incremental_min_chars=min_chars,
+    )
+
+
+def test_incremental_mode_only_explains_changed_units():
+    provider = RecordingProvider()
+    explainer = _incremental_explainer(provider)
+    original = _module(4)
+    edited = original.replace("return 2", "return 2 + 2")
+
+    asyncio.run(explainer.explain(CodeSnippet(content=original, language="python")))
+    result = asyncio.run(explainer.explain(CodeSnippet(content=edited, language="python")))
+
+    assert provider.calls == 4 + 1
+    assert len(provider.summarized) == 2
+    assert result.explanation.count("### Lines") == 4
+
+
+def test_incremental_mode_ignores_formatting_and_comments():
+    provider = RecordingProvider()
+    explainer = _incremental_explainer(provider)
+    reformatted = "# Module comment\n" + _module(3).replace("return", "return  ") + "\n\n"
+
+    asyncio.run(explainer.explain(CodeSnippet(content=_module(3), language="python")))
+    asyncio.run(explainer.explain(CodeSnippet(content=reformatted, language="python")))
+
+    assert provider.calls == 3
+    assert len(provider.summarized) == 1  # The summary was reused too
+
+
+def test_incremental_mode_applies_to_python_only():
+    explainer = _incremental_explainer(RecordingProvider())
+
+    assert explainer.applies_to(CodeSnippet(content=_module(2), language="python"))
+    assert not explainer.applies_to(CodeSnippet(content=_module(2), language="javascript"))
+
+
+def test_incremental_mode_explains_small_snippets_in_one_call():
+    provider = RecordingProvider()
+    explainer = _incremental_explainer(provider, min_chars=len(_module(4)))
+
+    assert not explainer.applies_to(CodeSnippet(content=_module(3), language="python"))
+    assert explainer.applies_to(CodeSnippet(content=_module(4), language="python"))
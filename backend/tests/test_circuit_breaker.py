@@ -0,0 +1,66 @@
+import pytest
+
+from app.domain.exceptions import AIProviderUnavailableError
+from app.infrastructure.ai.circuit_breaker import CircuitBreaker, CircuitState
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_rate_threshold=0.5,
+        slow_call_duration=5.0,
+        slow_call_rate_threshold=0.8,
+        window_size=4,
+        minimum_calls=4,
+        open_duration=30.0,
+        half_open_max_calls=1,
+        clock=clock,
+    )
+
+
+def test_opens_on_failure_rate_and_fails_fast():
+    breaker = _breaker(FakeClock())
+    for failed in (False, True, False, True):
+        breaker.before_call()
+        breaker.record_failure(1.0) if failed else breaker.record_success(1.0)
+
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(AIProviderUnavailableError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.retry_after == 30.0
+
+
+def test_opens_on_slow_call_rate():
+    breaker = _breaker(FakeClock())
+    for _ in range(4):
+        breaker.record_success(6.0)
+
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_half_open_probe_closes_or_reopens_circuit():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure(1.0)
+
+    clock.now = 30.0
+    assert breaker.state == CircuitState.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(AIProviderUnavailableError):
+        breaker.before_call()  # only one probe at a time
+    breaker.record_failure(1.0)
+    assert breaker.state == CircuitState.OPEN
+
+    clock.now = 60.0
+    breaker.before_call()
+    breaker.record_success(1.0)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.stats()["opened_total"] == 2
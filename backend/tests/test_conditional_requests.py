@@ -0,0 +1,33 @@
+def test_explain_sets_etag_and_answers_if_none_match_with_304(client, stub_provider):
+    first = client.post("/api/v1/explain/", json={"code": "x = 1", "language": "python"})
+    etag = first.headers["ETag"]
+
+    second = client.post(
+        "/api/v1/explain/",
+        json={"code": "x = 1", "language": "python"},
+        headers={"If-None-Match": f'W/"other", W/{etag}'},
+    )
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+    assert second.content == b""
+    assert stub_provider.calls == 1
+
+
+def test_etag_does_not_collide_across_field_boundaries(client):
+    ab_c = client.post("/api/v1/refactor/", json={"code": "ab", "language": "c"})
+    a_bc = client.post("/api/v1/refactor/", json={"code": "a", "language": "bc"})
+
+    assert ab_c.headers["ETag"] != a_bc.headers["ETag"]
+
+
+def test_reformatted_snippet_shares_etag(client):
+    first = client.post("/api/v1/explain/", json={"code": "x = 1", "language": "python"})
+    second = client.post(
+        "/api/v1/explain/",
+        json={"code": "# set x\nx  =  1\n\n", "language": "python"},
+        headers={"If-None-Match": first.headers["ETag"]},
+    )
+
+    assert second.status_code == 304
@@ -0,0 +1,133 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.application.deadline import deadline_scope, remaining_time
+from app.domain.exceptions import AIProviderTimeoutError
+from app.domain.value_objects.code_snippet import CodeSnippet
+from app.infrastructure.ai.openai_provider import OpenAIProvider
+from app.presentation.middleware.deadline_middleware import RequestDeadlineMiddleware
+
+COMPLETION = {"choices": [{"message": {"content": "An explanation"}}]}
+SCOPE = {"type": "http", "method": "POST", "path": "/api/v1/explain/", "headers": []}
+
+
+def test_nested_deadline_scope_only_shortens():
+    assert remaining_time() is None
+    with deadline_scope(10):
+        with deadline_scope(60):
+            assert 9 < remaining_time() <= 10
+        with deadline_scope(1):
+            assert remaining_time() <= 1
+    assert remaining_time() is None
+
+
+def test_provider_clips_upstream_timeout_to_request_deadline():
+    timeouts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, json=COMPLETION)
+
+    provider = OpenAIProvider(api_key="sk-test", timeout=30)
+    provider._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def explain():
+        with deadline_scope(5):
+            return await provider.explain_code(CodeSnippet(content="x = 1"))
+
+    asyncio.run(explain())
+
+    assert 4 < timeouts[0] <= 5
+
+
+def test_provider_fails_fast_once_deadline_has_passed():
+    provider = OpenAIProvider(api_key="sk-test")
+    provider._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json=COMPLETION))
+    )
+
+    async def explain():
+        with deadline_scope(0):
+            return await provider.explain_code(CodeSnippet(content="x = 1"))
+
+    with pytest.raises(AIProviderTimeoutError):
+        asyncio.run(explain())
+
+
+def test_client_disconnect_cancels_request_and_records_499():
+    cancelled = asyncio.Event()
+    sent = []
+
+    async def app(scope, receive, send):
+        await receive()
+        try:
+            await asyncio.sleep(10)  # Upstream call in progress
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def run():
+        messages = [{"type": "http.request", "body": b"{}", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            await asyncio.sleep(0.01)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        middleware = RequestDeadlineMiddleware(app, timeout=30)
+        await asyncio.wait_for(middleware(dict(SCOPE), receive, send), timeout=1)
+
+    asyncio.run(run())
+
+    assert cancelled.is_set()
+    assert sent[0]["status"] == 499
+
+
+def test_exempt_paths_get_no_deadline():
+    deadlines = []
+
+    async def app(scope, receive, send):
+        deadlines.append(remaining_time())
+
+    async def run():
+        middleware = RequestDeadlineMiddleware(app, timeout=30, exempt_paths=["/api/v1/batch"])
+        for path in ("/api/v1/batch/stream", "/api/v1/explain/"):
+            await middleware(dict(SCOPE, path=path), None, None)
+
+    asyncio.run(run())
+
+    assert deadlines[0] is None
+    assert 29 < deadlines[1] <= 30
+
+
+def test_completed_request_is_not_cancelled_by_late_disconnect():
+    sent = []
+
+    async def app(scope, receive, send):
+        await receive()
+        assert remaining_time() is not None
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def run():
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        await RequestDeadlineMiddleware(app, timeout=30)(dict(SCOPE), receive, send)
+
+    asyncio.run(run())
+
+    assert [m.get("status") for m in sent] == [200, None]
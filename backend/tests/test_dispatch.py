@@ -0,0 +1,104 @@
+import asyncio
+
+from app.application.admission import AdmissionController
+from app.application.commands.explain_code_command import ExplainCodeCommand
+from app.application.commands.generate_tests_command import GenerateTestsCommand
+from app.application.dispatch import LoggingMiddleware, Middleware, create_dispatcher
+from app.application.middleware.admission_middleware import AdmissionMiddleware
+from app.application.middleware.concurrency_middleware import ConcurrencyMiddleware
+from app.application.middleware.timing_middleware import TimingMiddleware
+from app.domain.exceptions import ServiceOverloadedError
+from tests.conftest import stub_dispatcher
+
+
+class RecordingMiddleware(Middleware):
+    def __init__(self, name, log, only=None):
+        self.name, self.log, self.only = name, log, only
+
+    def applies_to(self, command_type):
+        return self.only is None or command_type is self.only
+
+    async def execute(self, command, next_handler):
+        self.log.append(self.name)
+        return await next_handler(command)
+
+
+def test_chain_is_composed_in_order_and_skips_inapplicable_middleware(stub_provider):
+    log: list[str] = []
+    dispatcher = stub_dispatcher(stub_provider)
+    dispatcher.add_middleware(RecordingMiddleware("outer", log))
+    dispatcher.add_middleware(RecordingMiddleware("tests-only", log, only=GenerateTestsCommand))
+    dispatcher.add_middleware(RecordingMiddleware("inner", log))
+
+    asyncio.run(dispatcher.dispatch(ExplainCodeCommand(code="x = 1")))
+    assert log == ["outer", "inner"]
+
+    log.clear()
+    asyncio.run(dispatcher.dispatch(GenerateTestsCommand(code="def f(): pass")))
+    assert log == ["outer", "tests-only", "inner"]
+
+
+def test_create_dispatcher_wires_logging_middleware():
+    dispatcher = create_dispatcher()
+
+    assert isinstance(dispatcher._middlewares[0], LoggingMiddleware)
+
+
+def test_timing_and_concurrency_middleware(stub_provider):
+    dispatcher = stub_dispatcher(stub_provider)
+    timing = TimingMiddleware()
+    concurrency = ConcurrencyMiddleware({ExplainCodeCommand: 2})
+    dispatcher.add_middleware(timing)
+    dispatcher.add_middleware(concurrency)
+
+    peak = 0
+    original = stub_provider.explain_code
+
+    async def slow_explain(snippet):
+        nonlocal peak
+        peak = max(peak, concurrency.stats()["ExplainCodeCommand"]["in_flight"])
+        await asyncio.sleep(0.01)
+        return await original(snippet)
+
+    stub_provider.explain_code = slow_explain
+
+    async def run():
+        await asyncio.gather(
+            *(dispatcher.dispatch(ExplainCodeCommand(code=f"x = {i}")) for i in range(6))
+        )
+
+    asyncio.run(run())
+
+    stats = timing.stats()["ExplainCodeCommand"]
+    assert peak == 2
+    assert stats["count"] == 6 and stats["errors"] == 0
+    assert stats["p50_ms"] >= 10
+
+
+def test_streams_go_through_middleware_and_hold_slots_until_they_end(stub_provider):
+    dispatcher = stub_dispatcher(stub_provider)
+    timing = TimingMiddleware()
+    controller = AdmissionController(max_concurrency=1, max_queue=0)
+    dispatcher.add_middleware(timing)
+    dispatcher.add_middleware(AdmissionMiddleware(controller))
+
+    async def scenario():
+        stream = dispatcher.stream(ExplainCodeCommand(code="x = 1"))
+        await stream.__anext__()
+        try:
+            await dispatcher.dispatch(ExplainCodeCommand(code="x = 2"))
+        except ServiceOverloadedError:
+            rejected_while_streaming = True
+        else:
+            rejected_while_streaming = False
+        chunks = [chunk async for chunk in stream]
+        await dispatcher.dispatch(ExplainCodeCommand(code="x = 3"))
+        return rejected_while_streaming, chunks
+
+    rejected_while_streaming, chunks = asyncio.run(scenario())
+
+    assert rejected_while_streaming
+    assert chunks
+    # The stream, the rejected dispatch and the one after the stream ended
+    assert timing.stats()["ExplainCodeCommand"]["count"] == 3
+    assert timing.stats()["ExplainCodeCommand"]["errors"] == 1
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import random
+
+import httpx
+import pytest
+
+from app.domain.exceptions import AIProviderError, AIProviderRateLimitError
+from app.domain.value_objects.code_snippet import CodeSnippet
+from app.infrastructure.ai.fake_ai_provider import FakeAIProvider
+from app.infrastructure.ai.fake_transport import PLACEHOLDER_CONTENT, FakeOpenAITransport
+from app.infrastructure.ai.latency_models import (
+    FixedLatency,
+    HistogramLatency,
+    LogNormalLatency,
+    parse_latency_spec,
+)
+from app.infrastructure.ai.openai_provider import OpenAIProvider
+from app.infrastructure.ai.retry_policy import RetryPolicy
+
+
+class RecordingSleep:
+    def __init__(self) -> None:
+        self.delays: list[float] = []
+
+    async def __call__(self, delay: float) -> None:
+        self.delays.append(delay)
+
+
+SNIPPET = CodeSnippet(content="print('hi')", language="python")
+
+
+def test_streams_after_time_to_first_token_at_token_rate():
+    sleep = RecordingSleep()
+    provider = FakeAIProvider(latency=FixedLatency(0.2), tokens_per_second=10, sleep=sleep)
+
+    async def run():
+        return [chunk async for chunk in provider.stream_explain_code(SNIPPET)]
+
+    chunks = asyncio.run(run())
+
+    assert "".join(chunks) == asyncio.run(provider.explain_code(SNIPPET)).explanation
+    assert sleep.delays[0] == 0.2
+    assert sleep.delays[1 : len(chunks)] == [pytest.approx(0.1)] * (len(chunks) - 1)
+
+
+def test_same_seed_replays_latencies_and_faults():
+    def outcomes(seed: int) -> list[object]:
+        sleep = RecordingSleep()
+        provider = FakeAIProvider(
+            latency=LogNormalLatency(1.0, 0.5),
+            error_rate_429=0.2,
+            error_rate_5xx=0.2,
+            seed=seed,
+            sleep=sleep,
+        )
+
+        async def run():
+            results: list[object] = []
+            for _ in range(50):
+                try:
+                    await provider.explain_code(SNIPPET)
+                    results.append("ok")
+                except AIProviderError as e:
+                    results.append(type(e).__name__)
+            return results
+
+        return [*asyncio.run(run()), *sleep.delays]
+
+    first = outcomes(seed=7)
+    assert first == outcomes(seed=7)
+    assert "AIProviderRateLimitError" in first and "AIProviderError" in first
+
+
+def test_all_calls_fail_when_fault_rate_is_one():
+    provider = FakeAIProvider(error_rate_429=1.0, sleep=RecordingSleep())
+
+    with pytest.raises(AIProviderRateLimitError):
+        asyncio.run(provider.refactor_code(SNIPPET))
+
+    assert provider.stats()["fake"]["injected_faults"]["429"] == 1
+
+
+def test_histogram_latency_from_file_and_spec(tmp_path):
+    path = tmp_path / "latency.json"
+    path.write_text(json.dumps({"buckets": [[0.5, 0], [2.0, 10]]}))
+
+    model = parse_latency_spec(f"histogram:{path}")
+
+    assert isinstance(model, HistogramLatency)
+    rng = random.Random(1)
+    assert all(0.5 <= model.sample(rng) <= 2.0 for _ in range(100))
+    with pytest.raises(ValueError):
+        parse_latency_spec("uniform:1,2")
+
+
+def _openai_over(transport: FakeOpenAITransport, max_retries: int = 3) -> OpenAIProvider:
+    return OpenAIProvider(
+        api_key="fake",
+        retry_policy=RetryPolicy(max_retries=max_retries, sleep=RecordingSleep()),
+        transport=transport,
+    )
+
+
+def test_transport_faults_go_through_the_openai_provider_retries():
+    transport = FakeOpenAITransport(error_rate_429=1.0, sleep=RecordingSleep())
+    provider = _openai_over(transport, max_retries=2)
+
+    with pytest.raises(AIProviderRateLimitError):
+        asyncio.run(provider.explain_code(SNIPPET))
+
+    assert transport.stats() == {
+        "calls": 3,
+        "injected_faults": {"429": 3, "5xx": 0, "timeout": 0},
+    }
+
+
+def test_transport_streams_completions_with_usage():
+    transport = FakeOpenAITransport(latency=FixedLatency(0.0), tokens_per_second=0)
+    provider = _openai_over(transport)
+
+    async def run():
+        chunks = [chunk async for chunk in provider.stream_refactor_code(SNIPPET)]
+        return chunks, await provider.refactor_code(SNIPPET)
+
+    chunks, refactor = asyncio.run(run())
+
+    assert "".join(chunks) == PLACEHOLDER_CONTENT
+    assert refactor.refactored_code == "def placeholder():\n    return None"
+
+
+def test_transport_timeout_is_bounded_by_the_read_timeout():
+    sleep = RecordingSleep()
+    transport = FakeOpenAITransport(timeout_rate=1.0, timeout_seconds=30.0, sleep=sleep)
+    request = httpx.Request(
+        "POST",
+        "http://fake/chat/completions",
+        extensions={"timeout": httpx.Timeout(5.0).as_dict()},
+    )
+
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(transport.handle_async_request(request))
+    assert sleep.delays == [5.0]
@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.application.job_worker_pool import JobWorkerPool
+from app.application.jobs import JobStatus
+from app.domain.exceptions import ServiceOverloadedError
+from app.infrastructure.jobs.memory_job_backend import MemoryJobBackend
+from app.main import app
+from app.presentation.dependencies import get_job_worker_pool
+from tests.conftest import stub_dispatcher
+
+
+def test_submit_then_long_poll_for_result(stub_provider):
+    pool = JobWorkerPool(MemoryJobBackend(), stub_dispatcher(stub_provider), workers=2)
+    app.dependency_overrides[get_job_worker_pool] = lambda: pool
+
+    async def run():
+        await pool.start()
+        try:
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                submitted = await client.post(
+                    "/api/v1/jobs/", json={"action": "explain", "code": "x = 1"}
+                )
+                polled = await client.get(submitted.headers["location"], params={"wait": 5})
+                missing = await client.get("/api/v1/jobs/unknown")
+                return submitted, polled, missing
+        finally:
+            await pool.stop(drain_timeout=1)
+
+    try:
+        submitted, polled, missing = asyncio.run(run())
+    finally:
+        app.dependency_overrides.clear()
+
+    assert submitted.status_code == 202
+    assert submitted.json()["status"] == "queued"
+    assert polled.json()["status"] == "succeeded"
+    assert polled.json()["result"]["explanation"] == "full"
+    assert missing.status_code == 404
+
+
+def test_failed_job_reports_error_without_internal_details(stub_provider):
+    dispatcher = stub_dispatcher(stub_provider)
+
+    async def failing_dispatch(command):
+        raise RuntimeError("database password is hunter2")
+
+    dispatcher.dispatch = failing_dispatch
+    pool = JobWorkerPool(MemoryJobBackend(), dispatcher, workers=1)
+
+    async def run():
+        await pool.start()
+        job = await pool.submit("tests", {"code": "def f(): pass"})
+        finished = await pool.get(job.id, wait=5)
+        await pool.stop()
+        return finished
+
+    job = asyncio.run(run())
+
+    assert job.status == JobStatus.FAILED
+    assert job.error == {"type": "internal_error", "message": "An unexpected error occurred"}
+
+
+def test_full_queue_sheds_load():
+    backend = MemoryJobBackend(max_queue_size=1)
+    pool = JobWorkerPool(backend, dispatcher=None, workers=0)
+
+    async def run():
+        await pool.submit("explain", {"code": "a"})
+        await pool.submit("explain", {"code": "b"})
+
+    with pytest.raises(ServiceOverloadedError):
+        asyncio.run(run())
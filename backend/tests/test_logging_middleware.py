@@ -0,0 +1,49 @@
+import logging
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.infrastructure.log.correlation import CorrelationIdFilter, get_correlation_id
+
+
+@pytest.fixture
+def correlated_caplog(caplog: pytest.LogCaptureFixture) -> Iterator[pytest.LogCaptureFixture]:
+    correlation_filter = CorrelationIdFilter()
+    caplog.set_level(logging.INFO)
+    caplog.handler.addFilter(correlation_filter)
+    yield caplog
+    caplog.handler.removeFilter(correlation_filter)
+
+
+def test_generates_correlation_id_and_tags_request_logs(
+    client: TestClient, correlated_caplog: pytest.LogCaptureFixture
+):
+    response = client.post("/api/v1/explain/", json={"code": "x = 1", "language": "python"})
+
+    correlation_id = response.headers["X-Correlation-ID"]
+    assert correlation_id
+    request_records = [r for r in correlated_caplog.records if r.name.startswith("app.")]
+    assert len(request_records) >= 2
+    assert {r.correlation_id for r in request_records} == {correlation_id}
+    assert get_correlation_id() is None
+
+
+def test_honours_incoming_correlation_id(client: TestClient):
+    response = client.get("/ping", headers={"X-Correlation-ID": "trace-123"})
+
+    assert response.headers["X-Correlation-ID"] == "trace-123"
+
+
+def test_replaces_invalid_incoming_correlation_id(client: TestClient):
+    response = client.get("/ping", headers={"X-Correlation-ID": "bad id <script>"})
+
+    assert response.headers["X-Correlation-ID"] != "bad id <script>"
+
+
+def test_streaming_response_passes_through(client: TestClient):
+    response = client.post("/api/v1/explain/stream", json={"code": "x = 1", "language": "python"})
+
+    assert response.status_code == 200
+    assert "X-Correlation-ID" in response.headers
+    assert "Hello" in response.text
@@ -0,0 +1,69 @@
+import json
+import logging
+import queue
+import sys
+
+from app.infrastructure.log.correlation import CorrelationIdFilter, correlation_scope
+from app.infrastructure.log.json_formatter import JsonFormatter
+from app.infrastructure.log.setup import SAMPLED, NonBlockingQueueHandler, SamplingFilter
+
+
+def _record(msg: str, *args, level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_correlation_id_and_extras():
+    record = _record("Took %.1fms", 12.34, correlation_id="abc", route="/x")
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "Took 12.3ms"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "app.test"
+    assert entry["correlation_id"] == "abc"
+    assert entry["route"] == "/x"
+
+
+def test_json_formatter_renders_exceptions():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord(
+            "app.test", logging.ERROR, __file__, 1, "failed", None, sys.exc_info()
+        )
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert "ValueError: boom" in entry["exception"]
+    assert "correlation_id" not in entry
+
+
+def test_sampling_keeps_or_drops_whole_requests():
+    sampling = SamplingFilter(rate=0.5)
+    correlation = CorrelationIdFilter()
+    kept = 0
+    for n in range(200):
+        with correlation_scope(f"request-{n}"):
+            records = [_record("started", **SAMPLED), _record("completed", **SAMPLED)]
+            decisions = {correlation.filter(r) and sampling.filter(r) for r in records}
+        assert len(decisions) == 1
+        kept += decisions.pop()
+
+    assert 50 < kept < 150
+    assert sampling.filter(_record("unsampled"))
+    assert SamplingFilter(rate=0.0).filter(_record("failed", level=logging.WARNING, **SAMPLED))
+
+
+def test_queue_handler_renders_message_and_drops_on_overflow():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    params = {"n": 1}
+
+    handler.handle(_record("params %s", params))
+    params["n"] = 2
+    handler.handle(_record("overflow"))
+
+    queued = handler.queue.get_nowait()
+    assert queued.getMessage() == "params {'n': 1}"
+    assert handler.dropped == 1
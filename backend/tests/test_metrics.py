@@ -0,0 +1,97 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.domain.value_objects.code_snippet import CodeSnippet
+from app.infrastructure.ai.openai_provider import OpenAIProvider
+from app.infrastructure.metrics.registry import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ["route"], buckets=[0.5, 1])
+    histogram.observe(0.25, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(3, route="/a")
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.5"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.75' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+
+
+def test_registry_shares_metrics_by_name_and_checks_labels():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ["status"])
+
+    assert registry.counter("requests_total", "Requests", ["status"]) is counter
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", "Requests", ["status"])
+    with pytest.raises(ValueError):
+        counter.inc(route="/a")
+
+
+def test_metrics_endpoint_reports_requests_and_commands(client: TestClient):
+    client.post("/api/v1/explain/", json={"code": "x = 1", "language": "python"})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'http_requests_total{method="POST",route="/api/v1/explain/",status="200"}' in response.text
+    )
+    assert 'http_request_duration_seconds_bucket{method="POST"' in response.text
+    assert "http_requests_in_flight" in response.text
+
+
+def test_openai_provider_records_usage_and_upstream_latency():
+    registry = MetricsRegistry()
+    body = (
+        'data: {"choices": [{"delta": {"content": "Hi"}}]}\n\n'
+        'data: {"choices": [], "usage": {"prompt_tokens": 12, "completion_tokens": 3}}\n\n'
+        "data: [DONE]\n\n"
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert b'"include_usage": true' in request.content
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    provider = OpenAIProvider(api_key="sk-test", metrics=registry)
+    provider._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def consume() -> list[str]:
+        return [chunk async for chunk in provider.stream_explain_code(CodeSnippet(content="x"))]
+
+    assert asyncio.run(consume()) == ["Hi"]
+
+    lines = registry.render().splitlines()
+    assert 'ai_tokens_total{model="gpt-4o-mini",type="prompt"} 12' in lines
+    assert 'ai_tokens_total{model="gpt-4o-mini",type="completion"} 3' in lines
+    assert (
+        "ai_upstream_request_duration_seconds_count"
+        '{provider="openai",route="gpt-4o-mini",outcome="200"} 1' in lines
+    )
+    assert 'ai_time_to_first_token_seconds_count{provider="openai",route="gpt-4o-mini"} 1' in lines
+
+
+def test_openai_providers_report_in_flight_requests_per_route():
+    registry = MetricsRegistry()
+    OpenAIProvider(api_key="sk-test", model="gpt-4o", metrics=registry)
+    OpenAIProvider(
+        api_key="sk-test",
+        model="gpt-4o",
+        base_url="http://replica",
+        route="gpt-4o@http://replica",
+        metrics=registry,
+    )
+
+    lines = registry.render().splitlines()
+    assert 'ai_upstream_requests_in_flight{route="gpt-4o"} 0' in lines
+    assert 'ai_upstream_requests_in_flight{route="gpt-4o@http://replica"} 0' in lines
@@ -0,0 +1,187 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.domain.exceptions import (
+    AIProviderError,
+    AIProviderQuotaError,
+    AIProviderRateLimitError,
+)
+from app.domain.value_objects.code_snippet import CodeSnippet
+from app.infrastructure.ai.openai_provider import OpenAIProvider
+from app.infrastructure.ai.rate_limiter import RateGovernor
+from app.infrastructure.ai.retry_policy import RetryPolicy, parse_duration, parse_retry_after
+
+COMPLETION = {"choices": [{"message": {"content": "An explanation"}}]}
+
+
+def _provider(handler, retry_policy: RetryPolicy | None = None) -> OpenAIProvider:
+    provider = OpenAIProvider(api_key="sk-test", retry_policy=retry_policy)
+    provider._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return provider
+
+
+async def _collect(stream) -> list[str]:
+    return [chunk async for chunk in stream]
+
+
+def test_stream_explain_code_yields_content_deltas():
+    body = (
+        'data: {"choices": [{"delta": {"role": "assistant"}}]}\n\n'
+        'data: {"choices": [{"delta": {"content": "Hel"}}]}\n\n'
+        'data: {"choices": [{"delta": {"content": "lo"}}]}\n\n'
+        "data: [DONE]\n\n"
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert b'"stream": true' in request.content
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    provider = _provider(handler)
+    chunks = asyncio.run(_collect(provider.stream_explain_code(CodeSnippet(content="x = 1"))))
+
+    assert chunks == ["Hel", "lo"]
+
+
+def test_stream_reconciles_reserved_tokens_with_reported_usage():
+    body = (
+        'data: {"choices": [{"delta": {"content": "Hi"}}]}\n\n'
+        'data: {"choices": [], "usage": {"prompt_tokens": 40, "completion_tokens": 10, '
+        '"total_tokens": 50}}\n\n'
+        "data: [DONE]\n\n"
+    )
+    governor = RateGovernor(tokens_per_minute=10000, clock=lambda: 0.0)
+    provider = OpenAIProvider(api_key="sk-test", rate_governor=governor)
+    provider._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(
+                200, text=body, headers={"content-type": "text/event-stream"}
+            )
+        )
+    )
+
+    chunks = asyncio.run(_collect(provider.stream_explain_code(CodeSnippet(content="x = 1"))))
+
+    assert chunks == ["Hi"]
+    # Only the reported usage stays charged, not the max_tokens-based estimate
+    assert governor.stats()["tokens_available"] == 10000 - 50
+
+
+class RecordingSleep:
+    def __init__(self) -> None:
+        self.delays: list[float] = []
+
+    async def __call__(self, delay: float) -> None:
+        self.delays.append(delay)
+
+
+def test_retries_rate_limit_honouring_retry_after():
+    responses = [
+        httpx.Response(429, headers={"retry-after": "2"}, json={"error": {}}),
+        httpx.Response(503),
+        httpx.Response(200, json=COMPLETION),
+    ]
+    sleep = RecordingSleep()
+    policy = RetryPolicy(max_retries=3, base_delay=1.0, sleep=sleep)
+    provider = _provider(lambda request: responses.pop(0), policy)
+
+    result = asyncio.run(provider.explain_code(CodeSnippet(content="x = 1")))
+
+    assert result.explanation == "An explanation"
+    assert sleep.delays[0] == 2.0
+    assert 0 <= sleep.delays[1] <= 2.0  # full jitter on the second backoff
+
+
+def test_does_not_retry_non_idempotent_failures():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(429, json={"error": {"code": "insufficient_quota"}})
+
+    provider = _provider(handler, RetryPolicy(sleep=RecordingSleep()))
+
+    with pytest.raises(AIProviderQuotaError):
+        asyncio.run(provider.generate_tests(CodeSnippet(content="x = 1")))
+    assert len(calls) == 1
+
+
+def test_gives_up_when_wait_would_exceed_deadline():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503, headers={"retry-after": "10"})
+
+    policy = RetryPolicy(max_retries=5, deadline=5.0, sleep=RecordingSleep())
+    provider = _provider(handler, policy)
+
+    with pytest.raises(AIProviderError):
+        asyncio.run(provider.explain_code(CodeSnippet(content="x = 1")))
+    assert len(calls) == 1
+
+
+def test_waits_out_long_retry_after_that_fits_the_deadline():
+    responses = [
+        httpx.Response(429, headers={"retry-after": "30"}, json={"error": {}}),
+        httpx.Response(200, json=COMPLETION),
+    ]
+    sleep = RecordingSleep()
+    policy = RetryPolicy(max_delay=20.0, deadline=90.0, sleep=sleep)
+    provider = _provider(lambda request: responses.pop(0), policy)
+
+    asyncio.run(provider.explain_code(CodeSnippet(content="x = 1")))
+
+    assert sleep.delays == [30.0]
+
+
+def test_surfaces_rate_limit_with_retry_after_beyond_the_deadline():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(429, headers={"retry-after": "120"}, json={"error": {}})
+
+    provider = _provider(handler, RetryPolicy(deadline=90.0, sleep=RecordingSleep()))
+
+    with pytest.raises(AIProviderRateLimitError) as raised:
+        asyncio.run(provider.explain_code(CodeSnippet(content="x = 1")))
+    assert raised.value.retry_after == 120.0
+    assert len(calls) == 1
+
+
+def test_parse_rate_limit_reset_headers():
+    assert parse_duration("6m0s") == 360.0
+    assert parse_duration("120ms") == pytest.approx(0.12)
+    assert parse_duration("soon") is None
+    headers = httpx.Headers(
+        {"x-ratelimit-reset-requests": "1s", "x-ratelimit-reset-tokens": "1.5s"}
+    )
+    assert parse_retry_after(headers) == 1.5
+
+
+def test_warm_up_opens_connections_and_pool_stats_track_requests():
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        if request.url.path.endswith("/models"):
+            return httpx.Response(200, json={"data": []})
+        return httpx.Response(200, json=COMPLETION)
+
+    provider = OpenAIProvider(api_key="sk-test", warmup_connections=2)
+    provider._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def run():
+        await provider.warm_up()
+        await provider.explain_code(CodeSnippet(content="x = 1"))
+        await provider.close(drain_timeout=1.0)
+
+    asyncio.run(run())
+
+    assert paths == ["/v1/models", "/v1/models", "/v1/chat/completions"]
+    pool = provider.stats()["connection_pool"]
+    assert pool["requests_total"] == 1
+    assert pool["in_flight"] == 0
+    assert pool["peak_in_flight"] == 1
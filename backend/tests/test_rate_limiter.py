@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from app.domain.exceptions import AIProviderRateLimitError
+from app.infrastructure.ai.rate_limiter import RateGovernor
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def clock(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+def test_requests_queue_until_request_budget_refills():
+    time = FakeTime()
+    governor = RateGovernor(requests_per_minute=60, clock=time.clock, sleep=time.sleep)
+
+    async def run():
+        for _ in range(62):
+            await governor.acquire(tokens=10)
+
+    asyncio.run(run())
+
+    assert time.sleeps == pytest.approx([1.0, 1.0])
+    assert governor.stats()["delayed_total"] == 2
+
+
+def test_rejects_when_token_budget_exceeds_max_wait():
+    time = FakeTime()
+    governor = RateGovernor(tokens_per_minute=600, max_wait=5.0, clock=time.clock, sleep=time.sleep)
+
+    asyncio.run(governor.acquire(tokens=600))
+    with pytest.raises(AIProviderRateLimitError) as excinfo:
+        asyncio.run(governor.acquire(tokens=100))
+
+    assert excinfo.value.retry_after == pytest.approx(10.0)
+    assert time.sleeps == []
+
+
+def test_reconcile_refunds_overestimated_tokens():
+    time = FakeTime()
+    governor = RateGovernor(tokens_per_minute=1000, clock=time.clock, sleep=time.sleep)
+
+    reserved = asyncio.run(governor.acquire(tokens=RateGovernor.estimate_tokens(400, 500)))
+    governor.reconcile(reserved, actual_tokens=150)
+
+    assert reserved == 600
+    assert governor.stats()["tokens_available"] == pytest.approx(850)
@@ -0,0 +1,118 @@
+import asyncio
+from dataclasses import replace
+
+from app.application.commands.explain_code_command import ExplainCodeCommand
+from app.application.commands.refactor_code_command import RefactorCodeCommand
+from app.application.content_key import ContentKeyBuilder
+from app.application.dispatch import CommandDispatcher, Handler
+from app.application.dto.explain_result_dto import ExplainResultDTO
+from app.application.middleware.caching_middleware import CachingMiddleware
+from app.infrastructure.cache.memory_result_cache import MemoryResultCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingHandler(Handler[ExplainCodeCommand, str]):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def handle(self, command: ExplainCodeCommand) -> str:
+        self.calls += 1
+        return f"explained {command.code}"
+
+
+def test_memory_cache_expires_entries_after_ttl():
+    clock = FakeClock()
+    cache = MemoryResultCache(default_ttl=10, clock=clock)
+    asyncio.run(cache.set("k", "value"))
+
+    clock.now = 9.9
+    assert asyncio.run(cache.get("k")) == "value"
+    clock.now = 10.0
+    assert asyncio.run(cache.get("k")) is None
+
+
+def test_memory_cache_evicts_least_recently_used_to_fit_byte_budget():
+    cache = MemoryResultCache(max_bytes=10)
+    asyncio.run(cache.set("a", "aaaa"))
+    asyncio.run(cache.set("b", "bbbb"))
+    asyncio.run(cache.get("a"))  # "b" is now least recently used
+    asyncio.run(cache.set("c", "cccc"))
+
+    assert asyncio.run(cache.get("b")) is None
+    assert asyncio.run(cache.get("a")) == "aaaa"
+    assert cache.stats()["bytes"] == 8
+    asyncio.run(cache.set("huge", "x" * 11))
+    assert asyncio.run(cache.get("huge")) is None
+
+
+def test_caching_middleware_serves_repeated_commands_from_cache():
+    handler = CountingHandler()
+    dispatcher = CommandDispatcher()
+    dispatcher.register(ExplainCodeCommand, handler)
+    dispatcher.add_middleware(CachingMiddleware(MemoryResultCache(), ContentKeyBuilder()))
+
+    first = asyncio.run(dispatcher.dispatch(ExplainCodeCommand(code="x = 1\n")))
+    second = asyncio.run(dispatcher.dispatch(ExplainCodeCommand(code="x = 1  \r\n\n")))
+
+    assert first == second == "explained x = 1\n"
+    assert handler.calls == 1
+
+
+class ExplainHandler(Handler[ExplainCodeCommand, ExplainResultDTO]):
+    async def handle(self, command: ExplainCodeCommand) -> ExplainResultDTO:
+        return ExplainResultDTO(
+            explanation="explained",
+            line_count=command.code.count("\n") + 1,
+            character_count=len(command.code),
+            provider="stub",
+        )
+
+
+def test_cache_hit_for_reformatted_code_describes_the_request_code():
+    dispatcher = CommandDispatcher()
+    dispatcher.register(ExplainCodeCommand, ExplainHandler())
+    dispatcher.add_middleware(CachingMiddleware(MemoryResultCache(), ContentKeyBuilder()))
+
+    asyncio.run(dispatcher.dispatch(ExplainCodeCommand(code="x = 1", language="python")))
+    reformatted = "# set x\nx = 1  # one\n"
+    hit = asyncio.run(dispatcher.dispatch(ExplainCodeCommand(code=reformatted, language="python")))
+
+    assert hit.explanation == "explained"
+    assert (hit.line_count, hit.character_count) == (3, len(reformatted))
+
+
+def test_content_key_is_unambiguous_and_versioned():
+    builder = ContentKeyBuilder(namespace="gpt-4o")
+
+    assert builder.build(ExplainCodeCommand(code="ab", language="c")) != builder.build(
+        ExplainCodeCommand(code="a", language="bc")
+    )
+    assert builder.build(ExplainCodeCommand(code="x", language="Python ")) == builder.build(
+        ExplainCodeCommand(code="x", language="python")
+    )
+    assert builder.build(RefactorCodeCommand(code="x")) != builder.build(
+        ExplainCodeCommand(code="x")
+    )
+    versioned = ContentKeyBuilder(
+        namespace="gpt-4o", command_versions={ExplainCodeCommand: "2.0.0"}
+    )
+    assert versioned.build(ExplainCodeCommand(code="x")) != builder.build(
+        ExplainCodeCommand(code="x")
+    )
+
+
+def test_precomputed_content_key_is_reused_and_not_hashed():
+    builder = ContentKeyBuilder(namespace="gpt-4o")
+    command = ExplainCodeCommand(code="x = 1")
+    key = builder.build(command)
+    keyed = replace(command, content_key=key)
+
+    assert builder.build(keyed) == key
+    assert keyed == command
@@ -0,0 +1,160 @@
+import asyncio
+import sqlite3
+import zlib
+
+from app.application.dto.explain_result_dto import ExplainResultDTO
+from app.infrastructure.cache.memory_result_cache import MemoryResultCache
+from app.infrastructure.cache.persistent_result_cache import PersistentResultCache
+from app.infrastructure.repositories.command_repository import SqliteResultCommandRepository
+from app.infrastructure.repositories.query_repository import SqliteResultQueryRepository
+from app.infrastructure.repositories.sqlite_database import SqliteDatabase
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def open_cache(
+    path: str, clock: FakeClock, memory: MemoryResultCache | None = None, **kwargs
+) -> PersistentResultCache:
+    return PersistentResultCache(
+        memory or MemoryResultCache(),
+        SqliteResultQueryRepository(SqliteDatabase(path), clock=clock),
+        SqliteResultCommandRepository(SqliteDatabase(path), clock=clock),
+        value_types=[ExplainResultDTO],
+        clock=clock,
+        **kwargs,
+    )
+
+
+def result(text: str) -> ExplainResultDTO:
+    return ExplainResultDTO(explanation=text, line_count=1, character_count=5, provider="stub")
+
+
+def test_results_survive_a_restart_compressed(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    clock = FakeClock()
+
+    async def scenario():
+        cache = open_cache(path, clock)
+        await cache.set("key", result("explained " * 100))
+        await cache.close()
+
+        restarted = open_cache(path, clock)
+        value = await restarted.get("key")
+        stats = restarted.stats()
+        await restarted.close()
+        return value, stats
+
+    value, stats = asyncio.run(scenario())
+
+    assert value == result("explained " * 100)
+    assert stats["store_hits"] == 1 and stats["hits"] == 1
+
+    with sqlite3.connect(path) as connection:
+        (journal_mode,) = connection.execute("PRAGMA journal_mode").fetchone()
+        (payload,) = connection.execute("SELECT payload FROM results").fetchone()
+    assert journal_mode == "wal"
+    assert len(payload) < len(value.model_dump_json())
+    assert zlib.decompress(payload).startswith(b"ExplainResultDTO\n")
+
+
+def test_warm_up_loads_most_hit_results(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    clock = FakeClock()
+
+    async def scenario():
+        cache = open_cache(path, clock)
+        for key in ("cold", "warm", "hot"):
+            await cache.set(key, result(key))
+        for key, hits in (("warm", 2), ("hot", 5)):
+            for _ in range(hits):
+                await cache.get(key)
+        await cache.close()
+
+        memory = MemoryResultCache()
+        restarted = open_cache(path, clock, memory)
+        loaded = await restarted.warm_up(limit=2)
+        values = {key: await memory.get(key) for key in ("cold", "warm", "hot")}
+        await restarted.close()
+        return loaded, values
+
+    loaded, values = asyncio.run(scenario())
+
+    assert loaded == 2
+    assert values["hot"] == result("hot")
+    assert values["warm"] == result("warm")
+    assert values["cold"] is None
+
+
+def test_expired_and_excess_results_are_pruned(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    clock = FakeClock()
+
+    async def scenario():
+        cache = open_cache(path, clock, max_entries=2)
+        await cache.set("short", result("short"), ttl=10)
+        for key in ("a", "b", "c"):
+            clock.now += 1
+            await cache.set(key, result(key), ttl=3600)
+        await cache.close()
+
+        clock.now += 60
+        restarted = open_cache(path, clock, max_entries=2)
+        expired = await restarted.get("short")
+        await restarted.warm_up(limit=10)
+        await restarted.close()
+        return expired
+
+    assert asyncio.run(scenario()) is None
+
+    with sqlite3.connect(path) as connection:
+        keys = {key for (key,) in connection.execute("SELECT key FROM results")}
+    # Expired first, then the least recently used beyond max_entries
+    assert keys == {"b", "c"}
+
+
+def test_unregistered_types_are_cached_in_memory_only(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    clock = FakeClock()
+
+    async def scenario():
+        cache = open_cache(path, clock)
+        await cache.set("plain", "just a string")
+        in_memory = await cache.get("plain")
+        await cache.close()
+
+        restarted = open_cache(path, clock)
+        after_restart = await restarted.get("plain")
+        await restarted.close()
+        return in_memory, after_restart
+
+    assert asyncio.run(scenario()) == ("just a string", None)
+
+
+def test_store_failures_degrade_to_memory(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    clock = FakeClock()
+
+    async def scenario():
+        cache = open_cache(path, clock)
+        with sqlite3.connect(path) as connection:
+            connection.execute("DROP TABLE results")
+
+        await cache.set("key", result("in memory"))
+        values = (await cache.get("key"), await cache.get("missing"))
+        await cache.delete("key")
+        loaded = await cache.warm_up(10)
+        stats = cache.stats()
+        await cache.close()
+        return values, loaded, stats
+
+    values, loaded, stats = asyncio.run(scenario())
+
+    assert values == (result("in memory"), None)
+    assert loaded == 0
+    assert stats["store_errors"] == 4  # Write, lookup of "missing", delete, warm-up
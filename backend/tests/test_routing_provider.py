@@ -0,0 +1,133 @@
+import asyncio
+import random
+
+import pytest
+
+from app import main
+from app.domain.exceptions import AIProviderError
+from app.domain.value_objects.code_snippet import CodeSnippet
+from app.infrastructure.ai.fake_ai_provider import FakeAIProvider
+from app.infrastructure.ai.latency_models import FixedLatency
+from app.infrastructure.ai.routing_provider import Route, RoutingAIProvider
+from tests.conftest import StubProvider
+
+SNIPPET = CodeSnippet(content="x = 1")
+
+
+class ScriptedProvider(StubProvider):
+    """Stub provider answering after scripted delays, or failing."""
+
+    def __init__(self, delays: list[float], fail: bool = False) -> None:
+        super().__init__()
+        self.delays = delays
+        self.fail = fail
+        self.attempts = 0
+        self.cancelled = 0
+
+    async def explain_code(self, code_snippet: CodeSnippet):
+        delay = self.delays[min(self.attempts, len(self.delays) - 1)]
+        self.attempts += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise AIProviderError("upstream failed")
+        return await super().explain_code(code_snippet)
+
+
+def _router(*routes: Route, **kwargs) -> RoutingAIProvider:
+    kwargs.setdefault("min_samples", 5)
+    kwargs.setdefault("min_hedge_delay", 0.0)
+    return RoutingAIProvider(routes, rng=random.Random(1), **kwargs)
+
+
+def test_hedges_slow_call_and_cancels_the_loser():
+    # Warm-up calls are fast; the sixth stalls and gets hedged
+    slow = ScriptedProvider([0.001] * 5 + [5.0, 0.001])
+    router = _router(Route("only", slow), max_hedge_ratio=1.0)
+
+    async def run():
+        for _ in range(5):
+            await router.explain_code(SNIPPET)
+        return await asyncio.wait_for(router.explain_code(SNIPPET), timeout=1)
+
+    result = asyncio.run(run())
+
+    assert result.explanation == "full"
+    assert slow.cancelled == 1
+    assert router.stats()["routing"]["hedges"] == 1
+
+
+def test_hedge_ratio_caps_extra_requests():
+    slow = ScriptedProvider([0.001] * 5 + [0.05])
+    router = _router(Route("only", slow), max_hedge_ratio=0.0)
+
+    async def run():
+        for _ in range(10):
+            await router.explain_code(SNIPPET)
+
+    asyncio.run(run())
+
+    assert slow.attempts == 10
+    assert router.stats()["routing"]["hedges"] == 0
+
+
+def test_fails_over_to_another_route():
+    broken = ScriptedProvider([0.0], fail=True)
+    healthy = ScriptedProvider([0.0])
+    router = _router(Route("broken", broken, weight=1000), Route("healthy", healthy))
+
+    result = asyncio.run(router.explain_code(SNIPPET))
+
+    assert result.explanation == "full"
+    assert broken.attempts == 1 and healthy.attempts == 1
+
+
+def test_raises_when_every_route_fails():
+    router = _router(
+        Route("a", ScriptedProvider([0.0], fail=True)),
+        Route("b", ScriptedProvider([0.0], fail=True)),
+    )
+
+    with pytest.raises(AIProviderError):
+        asyncio.run(router.explain_code(SNIPPET))
+
+
+def test_traffic_shifts_away_from_failing_and_slow_routes():
+    router = _router(
+        Route("failing", FakeAIProvider(error_rate_5xx=1.0)),
+        Route("slow", FakeAIProvider(latency=FixedLatency(0.02))),
+        Route("fast", FakeAIProvider()),
+        max_hedge_ratio=0.0,
+    )
+
+    async def run():
+        for _ in range(60):
+            await router.explain_code(SNIPPET)
+
+    asyncio.run(run())
+
+    shares = {name: route["share"] for name, route in router.stats()["routing"]["routes"].items()}
+    assert shares["fast"] > shares["slow"] > shares["failing"]
+
+
+def test_health_is_degraded_when_any_route_circuit_is_open(client, monkeypatch):
+    def upstream(state: str) -> dict:
+        return {"upstream": {"circuit_breaker": {"state": state}}}
+
+    class Routed(StubProvider):
+        def __init__(self, states: list[str]) -> None:
+            super().__init__()
+            self.states = states
+
+        def stats(self) -> dict:
+            routes = {f"route-{i}": upstream(state) for i, state in enumerate(self.states)}
+            return {"routing": {"routes": routes}}
+
+    monkeypatch.setattr(main, "get_ai_provider", lambda: Routed(["closed", "closed"]))
+    assert client.get("/health").json()["status"] == "healthy"
+
+    monkeypatch.setattr(main, "get_ai_provider", lambda: Routed(["closed", "open"]))
+    assert client.get("/health").json()["status"] == "degraded"
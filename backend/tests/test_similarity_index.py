@@ -0,0 +1,140 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.application.commands.explain_code_command import ExplainCodeCommand
+from app.application.content_key import ContentKeyBuilder
+from app.application.dispatch import CommandDispatcher
+from app.application.handlers.explain_code_handler import ExplainCodeHandler
+from app.application.middleware.caching_middleware import CachingMiddleware
+from app.application.middleware.similar_result_middleware import SimilarResultMiddleware
+from app.infrastructure.cache.memory_result_cache import MemoryResultCache
+from app.infrastructure.cache.minhash_index import MinHashIndex
+from app.main import app
+from app.presentation.dependencies import get_command_dispatcher
+from tests.conftest import StubProvider
+
+ORIGINAL = """def compute_total(items, tax_rate):
+    total = 0
+    for item in items:
+        price = item.price * item.quantity
+        if item.discount:
+            price -= price * item.discount
+        total += price
+    return total * (1 + tax_rate)
+"""
+RENAMED = ORIGINAL.replace("total", "acc").replace("item", "entry")
+UNRELATED = """class Stack:
+    def __init__(self):
+        self._items = []
+
+    def push(self, value):
+        self._items.append(value)
+
+    def pop(self):
+        return self._items.pop()
+"""
+
+
+def similar_dispatcher(provider: StubProvider) -> CommandDispatcher:
+    cache = MemoryResultCache()
+    key_builder = ContentKeyBuilder()
+    dispatcher = CommandDispatcher()
+    dispatcher.register(ExplainCodeCommand, ExplainCodeHandler(provider))
+    dispatcher.add_middleware(
+        SimilarResultMiddleware(cache, MinHashIndex(), key_builder, min_similarity=0.7)
+    )
+    dispatcher.add_middleware(CachingMiddleware(cache, key_builder))
+    return dispatcher
+
+
+def test_index_finds_copy_with_renamed_identifiers():
+    index = MinHashIndex()
+    index.add("original", ORIGINAL, "python")
+
+    match = index.find(RENAMED, "python", min_similarity=0.7)
+
+    assert match is not None
+    assert match.key == "original"
+    assert 0.7 <= match.similarity < 1
+    assert index.find(UNRELATED, "python", min_similarity=0.5) is None
+
+
+def test_index_evicts_least_recently_used_beyond_max_entries():
+    index = MinHashIndex(max_entries=2)
+    index.add("original", ORIGINAL, "python")
+    index.add("unrelated", UNRELATED, "python")
+
+    # A match counts as a use, so the unrelated snippet is evicted next
+    assert index.find(RENAMED, "python", min_similarity=0.7) is not None
+    index.add("renamed", RENAMED, "python")
+
+    assert index.stats()["entries"] == 2
+    assert index.stats()["evictions"] == 1
+    assert index.find(UNRELATED, "python", min_similarity=0.9) is None
+
+    index.remove("original")
+    index.remove("renamed")
+    assert index.stats()["entries"] == 0
+    assert index.find(ORIGINAL, "python", min_similarity=0.1) is None
+
+
+def test_similar_results_are_reused_only_when_accepted():
+    provider = StubProvider()
+    dispatcher = similar_dispatcher(provider)
+
+    async def scenario():
+        first = await dispatcher.dispatch(ExplainCodeCommand(code=ORIGINAL, language="python"))
+        declined = await dispatcher.dispatch(ExplainCodeCommand(code=RENAMED, language="python"))
+        accepted = await dispatcher.dispatch(
+            ExplainCodeCommand(code=RENAMED + "\n\n", language="python", accept_similar=True)
+        )
+        return first, declined, accepted
+
+    first, declined, accepted = asyncio.run(scenario())
+
+    assert provider.calls == 2
+    assert first.similarity is None
+    assert declined.similarity is None
+    # The renamed copy was explained itself above, so it is reused exactly
+    assert accepted.similarity is None
+
+
+def test_accepted_similar_result_carries_similarity_and_is_not_cached():
+    provider = StubProvider()
+    dispatcher = similar_dispatcher(provider)
+
+    async def scenario():
+        await dispatcher.dispatch(ExplainCodeCommand(code=ORIGINAL, language="python"))
+        reused = await dispatcher.dispatch(
+            ExplainCodeCommand(code=RENAMED, language="python", accept_similar=True)
+        )
+        exact = await dispatcher.dispatch(ExplainCodeCommand(code=RENAMED, language="python"))
+        return reused, exact
+
+    reused, exact = asyncio.run(scenario())
+
+    assert 0.7 <= reused.similarity < 1
+    assert reused.character_count == len(RENAMED)
+    # The approximate result was not stored under the renamed copy's own key
+    assert exact.similarity is None
+    assert provider.calls == 2
+
+
+def test_explain_endpoint_omits_etag_for_similar_results(stub_provider):
+    dispatcher = similar_dispatcher(stub_provider)
+    app.dependency_overrides[get_command_dispatcher] = lambda: dispatcher
+    try:
+        client = TestClient(app)
+        first = client.post("/api/v1/explain", json={"code": ORIGINAL, "language": "python"})
+        similar = client.post(
+            "/api/v1/explain",
+            json={"code": RENAMED, "language": "python", "accept_similar": True},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.headers.get("ETag")
+    assert similar.status_code == 200
+    assert similar.json()["similarity"] >= 0.7
+    assert "ETag" not in similar.headers
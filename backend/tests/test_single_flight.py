@@ -0,0 +1,86 @@
+import asyncio
+
+from app.application.deadline import deadline_scope, remaining_time
+from app.application.single_flight import SingleFlight
+from app.domain.value_objects.code_snippet import CodeSnippet
+from app.infrastructure.ai.single_flight_provider import SingleFlightAIProvider
+
+
+def test_identical_concurrent_requests_share_one_upstream_call(stub_provider):
+    provider = SingleFlightAIProvider(stub_provider)
+    snippet = CodeSnippet(content="x = 1", language="python")
+
+    async def run():
+        return await asyncio.gather(*(provider.explain_code(snippet) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert stub_provider.calls == 1
+    assert {r.explanation for r in results} == {"full"}
+    assert provider.single_flight.stats()["coalesced"] == 4
+
+
+def test_cancelled_waiter_does_not_cancel_shared_call():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def slow_call():
+        calls.append(1)
+        await release.wait()
+        return "done"
+
+    async def run():
+        first = asyncio.create_task(flight.do("k", slow_call))
+        second = asyncio.create_task(flight.do("k", slow_call))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return await second, first.cancelled()
+
+    result, first_cancelled = asyncio.run(run())
+
+    assert result == "done"
+    assert first_cancelled
+    assert len(calls) == 1
+
+
+def test_shared_call_is_cancelled_when_every_waiter_leaves():
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def slow_call():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def run():
+        waiter = asyncio.create_task(flight.do("k", slow_call))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        return flight.in_flight()
+
+    assert asyncio.run(run()) == 0
+
+
+def test_shared_call_does_not_inherit_the_first_callers_deadline():
+    flight = SingleFlight()
+    seen = []
+
+    async def call():
+        seen.append(remaining_time())
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def run():
+        with deadline_scope(0.001):
+            first = asyncio.create_task(flight.do("k", call))
+        second = asyncio.create_task(flight.do("k", call))
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(run()) == ["done", "done"]
+    assert seen == [None]
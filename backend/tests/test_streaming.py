@@ -0,0 +1,25 @@
+def test_explain_stream_emits_delta_events_then_done(client):
+    r = client.post("/api/v1/explain/stream", json={"code": "print(1)"})
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    assert r.text == (
+        'event: delta\ndata: {"delta": "Hello"}\n\n'
+        'event: delta\ndata: {"delta": " "}\n\n'
+        'event: delta\ndata: {"delta": "world"}\n\n'
+        "event: done\ndata: {}\n\n"
+    )
+
+
+def test_tests_stream_falls_back_to_single_chunk(client):
+    r = client.post("/api/v1/tests/stream", json={"code": "def f(): pass"})
+
+    assert r.status_code == 200
+    assert 'data: {"delta": "def test_x(): pass"}' in r.text
+    assert r.text.endswith("event: done\ndata: {}\n\n")
+
+
+def test_stream_validation_error_returns_status_before_streaming(client):
+    r = client.post("/api/v1/refactor/stream", json={"code": "   "})
+
+    assert r.status_code == 422
@@ -0,0 +1,369 @@
+import asyncio
+import time
+import zlib
+from typing import Any, Optional
+
+from app.application.batch import BatchExecutor
+from app.application.commands.explain_code_command import ExplainCodeCommand
+from app.application.content_key import ContentKeyBuilder
+from app.application.deadline import deadline_scope
+from app.application.dispatch import CommandDispatcher, Handler
+from app.application.dto.explain_result_dto import ExplainResultDTO
+from app.application.middleware.caching_middleware import CachingMiddleware
+from app.infrastructure.cache.memory_result_cache import MemoryResultCache
+from app.infrastructure.cache.redis_lock import RedisLock
+from app.infrastructure.cache.redis_result_cache import RedisResultCache
+from app.infrastructure.cache.tiered_result_cache import TieredResultCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedisServer:
+    """In-memory stand-in for the Redis commands the cache uses, shared by clients."""
+
+    def __init__(self, clock: FakeClock) -> None:
+        self.clock = clock
+        self.data: dict[str, tuple[bytes, Optional[float]]] = {}
+        self.subscribers: dict[str, list[asyncio.Queue]] = {}
+        self.round_trips = 0
+        self.down = False
+
+    def live(self, key: str) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None or (entry[1] is not None and entry[1] <= self.clock()):
+            self.data.pop(key, None)
+            return None
+        return entry[0]
+
+
+class FakePipeline:
+    def __init__(self, client: "FakeRedis") -> None:
+        self._client = client
+        self._commands: list[tuple[str, tuple]] = []
+
+    def get(self, key: str) -> "FakePipeline":
+        self._commands.append(("_get", (key,)))
+        return self
+
+    def pttl(self, key: str) -> "FakePipeline":
+        self._commands.append(("_pttl", (key,)))
+        return self
+
+    async def execute(self) -> list[Any]:
+        self._client.round_trip()
+        return [getattr(self._client, name)(*args) for name, args in self._commands]
+
+
+class FakePubSub:
+    def __init__(self, server: FakeRedisServer) -> None:
+        self._server = server
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._channels: list[str] = []
+
+    async def subscribe(self, channel: str) -> None:
+        self._server.subscribers.setdefault(channel, []).append(self._queue)
+        self._channels.append(channel)
+
+    async def listen(self):
+        while True:
+            yield await self._queue.get()
+
+    async def aclose(self) -> None:
+        for channel in self._channels:
+            self._server.subscribers[channel].remove(self._queue)
+
+
+class FakeRedis:
+    """Client of a FakeRedisServer, like one replica's ``redis.asyncio`` client."""
+
+    def __init__(self, server: FakeRedisServer) -> None:
+        self.server = server
+
+    def round_trip(self) -> None:
+        if self.server.down:
+            raise ConnectionError("Redis is down")
+        self.server.round_trips += 1
+
+    async def get(self, key: str) -> Optional[bytes]:
+        self.round_trip()
+        return self._get(key)
+
+    async def set(
+        self, key: str, value: Any, px: Optional[int] = None, nx: bool = False
+    ) -> Optional[bool]:
+        self.round_trip()
+        if nx and self.server.live(key) is not None:
+            return None
+        value = value.encode() if isinstance(value, str) else value
+        expires_at = self.server.clock() + px / 1000 if px is not None else None
+        self.server.data[key] = (value, expires_at)
+        return True
+
+    async def delete(self, key: str) -> int:
+        self.round_trip()
+        return int(self.server.data.pop(key, None) is not None)
+
+    async def eval(self, script: str, numkeys: int, key: str, token: str) -> int:
+        # Only the lock release script: delete if the token matches
+        self.round_trip()
+        if self.server.live(key) == token.encode():
+            del self.server.data[key]
+            return 1
+        return 0
+
+    async def publish(self, channel: str, message: str) -> int:
+        self.round_trip()
+        queues = self.server.subscribers.get(channel, [])
+        for queue in queues:
+            queue.put_nowait({"type": "message", "channel": channel, "data": message.encode()})
+        return len(queues)
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self.server)
+
+    async def aclose(self) -> None:
+        pass
+
+    def _get(self, key: str) -> Optional[bytes]:
+        return self.server.live(key)
+
+    def _pttl(self, key: str) -> int:
+        if self.server.live(key) is None:
+            return -2
+        expires_at = self.server.data[key][1]
+        return -1 if expires_at is None else int((expires_at - self.server.clock()) * 1000)
+
+
+def replica(server: FakeRedisServer, clock: FakeClock) -> TieredResultCache:
+    client = FakeRedis(server)
+    return TieredResultCache(
+        MemoryResultCache(clock=clock),
+        RedisResultCache(client, [ExplainResultDTO]),
+        client,
+    )
+
+
+def result(text: str) -> ExplainResultDTO:
+    return ExplainResultDTO(explanation=text, line_count=1, character_count=5, provider="stub")
+
+
+async def settle() -> None:
+    """Let invalidation listeners subscribe and process messages."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_replicas_share_results_through_l2_with_consistent_ttl():
+    clock = FakeClock()
+    server = FakeRedisServer(clock)
+
+    async def scenario():
+        a, b = replica(server, clock), replica(server, clock)
+        await a.set("key", result("shared"), ttl=100)
+
+        clock.now += 60
+        first = await b.get("key")
+        round_trips = server.round_trips
+        second = await b.get("key")
+        served_from_l1 = server.round_trips == round_trips
+
+        # L1 got the 40s left in L2, not a fresh TTL
+        clock.now += 41
+        expired = await b.get("key")
+        stats = b.stats()
+        await a.close()
+        await b.close()
+        return first, second, served_from_l1, expired, stats
+
+    first, second, served_from_l1, expired, stats = asyncio.run(scenario())
+
+    assert first == second == result("shared")
+    assert served_from_l1
+    assert expired is None
+    assert stats["l2_hits"] == 1 and stats["hits"] == 2
+
+
+def test_values_are_stored_compressed():
+    clock = FakeClock()
+    server = FakeRedisServer(clock)
+
+    async def scenario():
+        cache = replica(server, clock)
+        await cache.set("key", result("explained " * 100))
+        await cache.set("plain", "not a registered result type")
+        await cache.close()
+
+    asyncio.run(scenario())
+
+    payload, _ = server.data["results:key"]
+    assert len(payload) < len(result("explained " * 100).model_dump_json())
+    assert zlib.decompress(payload).startswith(b"ExplainResultDTO\n")
+    assert "results:plain" not in server.data
+
+
+def test_delete_invalidates_other_replicas_l1():
+    clock = FakeClock()
+    server = FakeRedisServer(clock)
+
+    async def scenario():
+        a, b = replica(server, clock), replica(server, clock)
+        await a.set("key", result("shared"))
+        assert await b.get("key") == result("shared")
+        await settle()
+
+        await a.delete("key")
+        await settle()
+        after_delete = await b.get("key")
+        stats = b.stats()
+        await a.close()
+        await b.close()
+        return after_delete, stats
+
+    after_delete, stats = asyncio.run(scenario())
+
+    assert after_delete is None
+    assert stats["invalidations"] == 1
+
+
+def test_get_many_fetches_l1_misses_in_one_round_trip():
+    clock = FakeClock()
+    server = FakeRedisServer(clock)
+
+    async def scenario():
+        a, b = replica(server, clock), replica(server, clock)
+        for key in ("one", "two"):
+            await a.set(key, result(key))
+        await b.set("local", result("local"))
+
+        round_trips = server.round_trips
+        values = await b.get_many(["one", "local", "missing", "two"])
+        used = server.round_trips - round_trips
+        await a.close()
+        await b.close()
+        return values, used
+
+    values, used = asyncio.run(scenario())
+
+    assert values == [result("one"), result("local"), None, result("two")]
+    assert used == 1
+
+
+def test_redis_outage_degrades_to_l1():
+    clock = FakeClock()
+    server = FakeRedisServer(clock)
+
+    async def scenario():
+        cache = replica(server, clock)
+        server.down = True
+        await cache.set("key", result("local"))
+        values = (await cache.get("key"), await cache.get("other"))
+        token = await RedisLock(FakeRedis(server)).acquire("key")
+        stats = cache.stats()
+        await cache.close()
+        return values, token, stats
+
+    values, token, stats = asyncio.run(scenario())
+
+    assert values == (result("local"), None)
+    assert token is None
+    assert stats["l2_errors"] == 2
+
+
+def test_lock_wait_ends_at_the_request_deadline():
+    clock = FakeClock()
+    server = FakeRedisServer(clock)
+
+    async def scenario():
+        lock = RedisLock(FakeRedis(server), max_wait=60, poll_interval=0.01)
+        assert await lock.acquire("key") is not None
+        started = time.monotonic()
+        with deadline_scope(0.1):
+            token = await lock.acquire("key")
+        return token, time.monotonic() - started
+
+    token, waited = asyncio.run(scenario())
+
+    assert token is None
+    assert waited < 0.5
+
+
+class SlowHandler(Handler[ExplainCodeCommand, ExplainResultDTO]):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def handle(self, command: ExplainCodeCommand) -> ExplainResultDTO:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return result(f"explained {command.code}")
+
+
+def replica_dispatcher(
+    server: FakeRedisServer, clock: FakeClock, handler: SlowHandler
+) -> tuple[CommandDispatcher, CachingMiddleware, TieredResultCache]:
+    cache = replica(server, clock)
+    middleware = CachingMiddleware(
+        cache, ContentKeyBuilder(), lock=RedisLock(FakeRedis(server), poll_interval=0.01)
+    )
+    dispatcher = CommandDispatcher()
+    dispatcher.register(ExplainCodeCommand, handler)
+    dispatcher.add_middleware(middleware)
+    return dispatcher, middleware, cache
+
+
+def test_lock_lets_one_replica_compute_a_result():
+    clock = FakeClock()
+    server = FakeRedisServer(clock)
+    handler = SlowHandler()
+
+    async def scenario():
+        a, _, a_cache = replica_dispatcher(server, clock, handler)
+        b, _, b_cache = replica_dispatcher(server, clock, handler)
+        command = ExplainCodeCommand(code="x = 1")
+        results = await asyncio.gather(a.dispatch(command), b.dispatch(command))
+        await a_cache.close()
+        await b_cache.close()
+        return results
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second == result("explained x = 1")
+    assert handler.calls == 1
+    assert not [key for key in server.data if key.startswith("locks:")]
+
+
+def test_batch_prefetches_cached_results_in_one_round_trip():
+    clock = FakeClock()
+    server = FakeRedisServer(clock)
+    handler = SlowHandler()
+
+    async def scenario():
+        a, _, a_cache = replica_dispatcher(server, clock, handler)
+        b, b_middleware, b_cache = replica_dispatcher(server, clock, handler)
+        commands = [ExplainCodeCommand(code=f"x = {i}") for i in range(5)]
+        for command in commands:
+            await a.dispatch(command)
+
+        round_trips = server.round_trips
+        executor = BatchExecutor(b, prefetch=b_middleware.prefetch)
+        outcomes = await executor.run(commands)
+        used = server.round_trips - round_trips
+        await a_cache.close()
+        await b_cache.close()
+        return outcomes, used
+
+    outcomes, used = asyncio.run(scenario())
+
+    assert [outcome.result for outcome in outcomes] == [
+        result(f"explained x = {i}") for i in range(5)
+    ]
+    assert handler.calls == 5
+    assert used == 1